@@ -5,6 +5,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import time
 import threading
 import numpy as np
+from src.analysis.telemetryAnalysis import damping_ratio, dominant_frequency
 from src.hardware.imu import IMU  # Your hardware interface
 import smbus2 as smbus
 
@@ -131,21 +132,14 @@ class InertiaGUI:
         angles = np.array(self.angles)
         times = np.array(self.times)
 
-        # Simple peak detection without scipy
-        peaks = []
-        for i in range(1, len(angles) - 1):
-            if angles[i - 1] < angles[i] > angles[i + 1] and angles[i] > 2.0:
-                peaks.append(i)
-
-        if len(peaks) < 2:
-            self.period_var.set("Estimated Period: Too few peaks")
+        # Swinging pendulum: strongest oscillation in the spectrum and its decay
+        frequency, _amplitude = dominant_frequency(times, angles)
+        if not frequency > 0:
+            self.period_var.set("Estimated Period: No oscillation found")
             return
+        zeta = damping_ratio(times, angles)
 
-        peak_times = times[peaks]
-        periods = [peak_times[i+1] - peak_times[i] for i in range(len(peak_times)-1)]
-        avg_period = sum(periods) / len(periods)
-
-        self.period_var.set(f"Estimated Period: {avg_period:.3f} s")
+        self.period_var.set(f"Estimated Period: {1.0 / frequency:.3f} s (damping ratio {zeta:.3f})")
 
     def set_zero_offset(self):
         self.angle_offset = self.imu.read_pitch()
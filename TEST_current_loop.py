@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Inner current loop test with simulated ADC readings (no hardware needed)
+
+Ticks CurrentLoop by hand against a simple motor model, current = gain *
+motor command, written to the simulated ADCs after every tick. Checks that
+feedforward plus PI settle on the current setpoint, that the integrator
+does not wind up while the command saturates, that hold() keeps set_torque()
+off the motors until release() (also with the loop thread running), and that
+an overcurrent reading stops the motors through the control loop.
+"""
+
+import time
+
+from src.config.configManager import global_config
+from src.pid.currentLoop import CurrentLoop
+from src.simulation.simulatedHardware import SimulatedRobot
+
+DT = 0.005
+
+
+def create_current_loop():
+    robot = SimulatedRobot()
+    motor_left, motor_right = robot.create_motors()
+    motor_left.start()
+    motor_right.start()
+    current_loop = CurrentLoop(motor_left, motor_right, robot.create_current_sensor())
+    return robot, current_loop
+
+
+def run_motor_model(robot, current_loop, ticks, amps_per_command):
+    """Tick the loop with both motors drawing amps_per_command * their command"""
+    for _ in range(ticks):
+        current_loop.tick()
+        robot.bus.set_current(True, amps_per_command * current_loop.output_left)
+        robot.bus.set_current(False, amps_per_command * current_loop.output_right)
+
+
+def pwm_writes(robot):
+    return robot.driver_left.pwm.writes + robot.driver_right.pwm.writes
+
+
+def main():
+    results = []
+    amps_at_full_torque = global_config.current_loop_amps_at_full_torque
+    resolution = global_config.current_sensor_amps_per_count
+
+    # 1. Feedforward alone misses the setpoint on a weaker motor; the PI part closes the gap
+    robot, current_loop = create_current_loop()
+    current_loop.release()
+    current_loop.set_torque(0.4, -0.4)
+    setpoint = 0.4 * amps_at_full_torque
+    run_motor_model(robot, current_loop, 1, amps_per_command=1.5)
+    first_command = current_loop.output_left  # Feedforward + P on the full error, no integral yet
+    feedforward = first_command - current_loop.pi_left.kp * setpoint
+    run_motor_model(robot, current_loop, 2000, amps_per_command=1.5)
+    sensor = current_loop.current_sensor
+    passed = (abs(feedforward - 0.4) < 1e-9 and abs(sensor.raw_current_left - setpoint) <= 2 * resolution
+              and abs(sensor.raw_current_right + setpoint) <= 2 * resolution)
+    print(f"1. Setpoint {setpoint:.2f} A: feedforward command {feedforward:.2f}, settled at "
+          f"{sensor.raw_current_left:.2f} / {sensor.raw_current_right:.2f} A {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. A setpoint the motor cannot reach saturates the command without winding up the integrator
+    current_loop.pi_left.reset()
+    current_loop.set_torque(0.8, 0.0)
+    run_motor_model(robot, current_loop, 2000, amps_per_command=0.5)
+    saturated = current_loop.output_left == current_loop.pi_left.output_limit
+    integral = current_loop.pi_left.integral
+    current_loop.set_torque(0.2, 0.0)  # Reachable again: the command must leave the limit at once
+    run_motor_model(robot, current_loop, 3, amps_per_command=0.5)
+    passed = saturated and abs(integral) < 1.0 and current_loop.output_left < current_loop.pi_left.output_limit
+    print(f"2. Saturated for 2000 ticks: integral {integral:.3f}, command back to "
+          f"{current_loop.output_left:.2f} within 3 ticks {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. hold() keeps setpoints off the motors until release()
+    current_loop.hold()
+    writes = pwm_writes(robot)
+    current_loop.set_torque(0.5, 0.5)
+    run_motor_model(robot, current_loop, 10, amps_per_command=1.5)
+    held = pwm_writes(robot) == writes and current_loop.torque_left == 0.5
+    current_loop.release()
+    run_motor_model(robot, current_loop, 1, amps_per_command=1.5)
+    released = pwm_writes(robot) == writes + 2 and robot.driver_left.get_command() > 0.0
+    passed = held and released
+    print(f"3. No motor writes while held, written again after release() {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. With the loop thread running, nothing is written after hold() and the caller's motor stop
+    current_loop.start()
+    time.sleep(0.05)
+    current_loop.hold()
+    current_loop.motor_left.stop()
+    current_loop.motor_right.stop()
+    writes = pwm_writes(robot)
+    time.sleep(0.05)
+    current_loop.stop()
+    passed = pwm_writes(robot) == writes and robot.driver_left.get_command() == 0.0
+    print(f"4. Loop thread: no write after hold() and the motor stop {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 5. An overcurrent reading stops the motors through the control loop's safety check
+    robot = SimulatedRobot()
+    control_loop = robot.create_control_loop(rate=1 / DT)
+    current_loop = CurrentLoop(control_loop.motor_left, control_loop.motor_right, control_loop.current_sensor)
+    control_loop.current_loop = current_loop
+    control_loop.start_motors()
+    for _ in range(20):
+        control_loop.tick(robot.get_time())
+        current_loop.tick()
+        robot.step(DT)
+    running = not current_loop.holding and robot.driver_left.enable.value == 1
+    robot.bus.set_current(True, 1.5 * global_config.current_limit)
+    for _ in range(20):
+        current_loop.tick()
+    control_loop.tick(robot.get_time())
+    writes = pwm_writes(robot)
+    current_loop.set_torque(0.5, 0.5)
+    current_loop.tick()
+    passed = (running and control_loop.current_sensor.overcurrent and current_loop.holding
+              and control_loop.wait_until_correct_angle and pwm_writes(robot) == writes
+              and robot.driver_left.enable.value == 0 and robot.driver_right.enable.value == 0)
+    print(f"5. Overcurrent at {control_loop.current_sensor.current_left:.2f} A: motors stopped, current loop held "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+I2C bus manager test against a fake smbus (no hardware needed)
+
+Checks I2CBusManager directly: a high-priority request waiting for the bus
+is served before low-priority ones queued earlier, read_batch() is one
+i2c_rdwr() transaction, and transient and fatal errnos are counted
+separately in the per-device statistics.
+"""
+
+import ctypes
+import errno
+import os
+import threading
+import time
+
+from smbus2.smbus2 import I2C_M_RD
+
+from src.hardware.i2cBus import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, I2CBusManager
+
+IMU = 0x28
+ADC_LEFT = 0x4D
+ADC_RIGHT = 0x4E
+LOGGER = 0x50
+
+
+class FakeSMBus:
+    """smbus2 stand-in: records the transactions, can block one until released and fail with given errnos"""
+
+    def __init__(self):
+        self.calls = []            # (method, address)
+        self.rdwr_messages = []    # Messages of every i2c_rdwr() call
+        self.block = None          # Event the next transaction waits for
+        self.failures = []         # errnos the next transactions fail with
+        self.fd = -1
+
+    def _call(self, method, address):
+        self.calls.append((method, address))
+        block, self.block = self.block, None
+        if block is not None:
+            block.wait()
+        if self.failures:
+            error_number = self.failures.pop(0)
+            raise OSError(error_number, os.strerror(error_number))
+
+    def read_byte_data(self, address, register):
+        self._call("read_byte_data", address)
+        return register
+
+    def i2c_rdwr(self, *messages):
+        self._call("i2c_rdwr", messages[0].addr)
+        self.rdwr_messages.append(messages)
+        for message in messages:
+            if message.flags & I2C_M_RD:
+                ctypes.memmove(message.buf, bytes([message.addr] * message.len), message.len)
+
+    def close(self):
+        pass
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def main():
+    results = []
+
+    # 1. While the bus is busy, a high-priority request overtakes low-priority ones queued before it
+    fake = FakeSMBus()
+    manager = I2CBusManager(bus=fake)
+    manager.register_device(IMU, "imu", PRIORITY_HIGH)
+    manager.register_device(ADC_LEFT, "current_left", PRIORITY_NORMAL)
+    manager.register_device(LOGGER, "logger", PRIORITY_LOW)
+    release = threading.Event()
+    fake.block = release
+    holder = threading.Thread(target=manager.read_byte_data, args=(ADC_LEFT, 0))
+    holder.start()
+    wait_for(lambda: fake.calls)
+    waiting = []
+    for address in (LOGGER, ADC_LEFT, IMU):  # Lowest priority queued first
+        thread = threading.Thread(target=manager.read_byte_data, args=(address, 0))
+        thread.start()
+        waiting.append(thread)
+        wait_for(lambda: len(manager._queue) == len(waiting))
+    release.set()
+    for thread in [holder] + waiting:
+        thread.join()
+    order = [address for _method, address in fake.calls[1:]]
+    imu_wait = manager.get_stats()["imu"]["max_wait_ms"]
+    passed = order == [IMU, ADC_LEFT, LOGGER] and imu_wait > 0
+    print(f"1. Served after the busy transaction: {', '.join(f'0x{a:02X}' for a in order)} "
+          f"(IMU waited {imu_wait:.2f} ms) {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. A batch is one i2c_rdwr() with a register write only where a register is given
+    fake = FakeSMBus()
+    manager = I2CBusManager(bus=fake)
+    manager.register_device(IMU, "imu", PRIORITY_HIGH)
+    manager.register_device(ADC_LEFT, "current_left", PRIORITY_NORMAL)
+    manager.register_device(ADC_RIGHT, "current_right", PRIORITY_NORMAL)
+    data = manager.read_batch(((ADC_LEFT, None, 2), (ADC_RIGHT, None, 2), (IMU, 0x1E, 2)))
+    stats = manager.get_stats()
+    passed = (fake.calls == [("i2c_rdwr", ADC_LEFT)] and len(fake.rdwr_messages[0]) == 4
+              and data == [bytes([ADC_LEFT] * 2), bytes([ADC_RIGHT] * 2), bytes([IMU] * 2)]
+              and all(stats[name]["transactions"] == 1 for name in ("imu", "current_left", "current_right")))
+    print(f"2. Batch of 3 reads: {len(fake.calls)} transaction, {len(fake.rdwr_messages[0])} messages "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. Transient and fatal errnos are counted separately, also for batches
+    fake.failures = [errno.EREMOTEIO, errno.ETIMEDOUT, errno.ENODEV]
+    raised = []
+    for _ in range(3):
+        try:
+            manager.read_byte_data(IMU, 0)
+        except OSError as e:
+            raised.append(e.errno)
+    manager.read_byte_data(IMU, 0)
+    fake.failures = [errno.EIO]
+    try:
+        manager.read_batch(((ADC_LEFT, None, 2), (ADC_RIGHT, None, 2)))
+    except OSError as e:
+        raised.append(e.errno)
+    stats = manager.get_stats()
+    imu, adc = stats["imu"], stats["current_left"]
+    passed = (raised == [errno.EREMOTEIO, errno.ETIMEDOUT, errno.ENODEV, errno.EIO]
+              and (imu["transactions"], imu["errors"], imu["transient_errors"], imu["fatal_errors"]) == (5, 3, 2, 1)
+              and (adc["errors"], adc["transient_errors"], adc["fatal_errors"]) == (1, 1, 0)
+              and "transient=2 fatal=1" in manager.format_stats())
+    print(f"3. IMU: {imu['errors']} errors ({imu['transient_errors']} transient, {imu['fatal_errors']} fatal) "
+          f"in {imu['transactions']} transactions, failed batch counted per device {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+I2C error handling test on simulated hardware (no hardware needed)
+
+Injects bus errors into the simulated IMU and checks that transient errors
+are retried within the tick, short outages are bridged by predicting from
+the last good sample, a persistent failure stops the motors until the IMU
+reads again, and an exception in the loop thread stops the motors.
+"""
+
+import errno
+
+from src.config.configManager import global_config
+from src.hardware.i2cBus import is_transient_i2c_error
+from src.hardware.imu import IMU_ADDR
+from src.log.logManager import LogManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+DT = 0.005
+
+
+def create_balancing_loop():
+    robot = SimulatedRobot()
+    log_manager = LogManager()
+    control_loop = robot.create_control_loop(log_manager=log_manager, rate=1 / DT)
+    control_loop.start_motors()
+    run_ticks(robot, control_loop, 200)
+    return robot, control_loop, log_manager
+
+
+def run_ticks(robot, control_loop, count, on_tick=None):
+    for _ in range(count):
+        control_loop.tick(robot.get_time())
+        if on_tick is not None:
+            on_tick()
+        robot.step(DT)
+
+
+def main():
+    results = []
+    failure_limit = global_config.imu_max_consecutive_failures
+
+    # 1. Classification by errno
+    transient = [is_transient_i2c_error(OSError(e, "")) for e in (errno.EREMOTEIO, errno.EIO, errno.ETIMEDOUT)]
+    fatal = [is_transient_i2c_error(OSError(e, "")) for e in (errno.ENODEV, errno.ENXIO, errno.EBADF)]
+    passed = all(transient) and not any(fatal)
+    print(f"1. EREMOTEIO/EIO/ETIMEDOUT transient, ENODEV/ENXIO/EBADF fatal {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. A single NACK is retried within the same tick
+    robot, control_loop, _log = create_balancing_loop()
+    imu = control_loop.imu
+    robot.bus.inject_errors(IMU_ADDR, 1)
+    run_ticks(robot, control_loop, 10)
+    passed = imu.retries == 1 and imu.failed_reads == 0 and not control_loop.imu_fallback
+    print(f"2. One transient error: {imu.retries} retry, {imu.failed_reads} failed reads {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. A short outage is bridged with the predicted angle, flagged with the sample age
+    robot, control_loop, _log = create_balancing_loop()
+    imu = control_loop.imu
+    ages = []
+    robot.bus.inject_errors(IMU_ADDR, (global_config.imu_read_retries + 1) * (failure_limit // 2))
+    run_ticks(robot, control_loop, 50, on_tick=lambda: ages.append(control_loop.imu_sample_age))
+    passed = (imu.max_consecutive_failures == failure_limit // 2 and max(ages) > 0
+              and not control_loop.imu_fallback and not control_loop.wait_until_correct_angle)
+    print(f"3. Outage of {imu.max_consecutive_failures} reads: oldest sample used {max(ages) * 1000:.0f} ms, "
+          f"motors kept running {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3b. The sample age does not depend on the freshness tracker
+    global_config.imu_skip_stale_samples = False
+    try:
+        robot, control_loop, _log = create_balancing_loop()
+    finally:
+        global_config.imu_skip_stale_samples = True
+    ages = []
+    robot.bus.inject_errors(IMU_ADDR, (global_config.imu_read_retries + 1) * (failure_limit // 2))
+    run_ticks(robot, control_loop, 50, on_tick=lambda: ages.append(control_loop.imu_sample_age))
+    outage = (failure_limit // 2) * DT
+    passed = 0 < max(ages) <= outage + 1e-9 and not control_loop.imu_fallback
+    print(f"   Without stale-sample skipping: oldest sample used {max(ages) * 1000:.0f} ms "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. A device that is gone stops the motors after the failure limit; they restart once it reads again
+    robot, control_loop, log_manager = create_balancing_loop()
+    imu = control_loop.imu
+    robot.bus.inject_errors(IMU_ADDR, error_number=errno.ENODEV)
+    run_ticks(robot, control_loop, failure_limit + 5)
+    stopped = control_loop.wait_until_correct_angle and robot.driver_left.enable.value == 0
+    critical = any(entry.event_type == "CRITICAL" for entry in log_manager.log_entries)
+    robot.plant.reset()  # Held upright while the IMU is reconnected
+    robot.bus.clear_errors()
+    run_ticks(robot, control_loop, 400)
+    restarted = not control_loop.wait_until_correct_angle and not robot.plant.fallen
+    passed = stopped and critical and imu.fatal_errors >= failure_limit and imu.retries == 0 and restarted
+    print(f"4. ENODEV: motors stopped after {failure_limit} failed reads, restarted after recovery "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 5. An exception in the loop thread ends run() with the motors stopped
+    robot, control_loop, log_manager = create_balancing_loop()
+
+    def failing_update(*args):
+        raise RuntimeError("estimator failure")
+    control_loop.tilt_estimator.update = failing_update
+    control_loop.run(max_ticks=control_loop.ticks + 100)
+    critical = any(entry.event_type == "CRITICAL" for entry in log_manager.log_entries)
+    passed = critical and not control_loop.running and robot.driver_left.enable.value == 0
+    print(f"5. Exception in the loop: logged and motors stopped {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
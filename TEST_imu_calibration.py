@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+IMU calibration persistence test on the simulated I2C bus (no hardware needed)
+
+Saves the BNO055 calibration profile from one simulated sensor and restores
+it into a fresh one through the calibration file, as across a restart. Checks
+that the offset registers are only read and written in CONFIG mode, that a
+measured mounting offset is stored and reloaded, and that a missing or
+corrupt file falls back to the configured mounting offset without raising.
+"""
+
+import json
+import os
+import tempfile
+
+from src.config.configManager import global_config
+from src.hardware.imu import (CALIBRATION_PROFILE_LENGTH, IMU, IMU_ADDR, MODE_CONFIG, MODE_NDOF,
+                              REG_ACC_OFFSET_X_LSB, REG_MODE)
+from src.simulation.simulatedHardware import SimulatedI2CBus
+
+PROFILE = [(7 * i + 3) & 0xFF for i in range(CALIBRATION_PROFILE_LENGTH)]  # Offsets the "sensor" calibrated to
+PROFILE_REGISTERS = range(REG_ACC_OFFSET_X_LSB, REG_ACC_OFFSET_X_LSB + CALIBRATION_PROFILE_LENGTH)
+
+
+class RecordingBus(SimulatedI2CBus):
+    """Simulated bus that records the operation mode of every profile register access"""
+
+    def __init__(self, profile=None):
+        super().__init__()
+        self.profile_access_modes = []
+        if profile is not None:
+            self._imu_registers[REG_ACC_OFFSET_X_LSB:REG_ACC_OFFSET_X_LSB + len(profile)] = bytes(profile)
+
+    def _record(self, addr, register):
+        if addr == IMU_ADDR and register in PROFILE_REGISTERS:
+            self.profile_access_modes.append(self.mode)
+
+    @property
+    def mode(self):
+        return self._imu_registers[REG_MODE]
+
+    @property
+    def profile(self):
+        return list(self._imu_registers[REG_ACC_OFFSET_X_LSB:REG_ACC_OFFSET_X_LSB + CALIBRATION_PROFILE_LENGTH])
+
+    def read_i2c_block_data(self, addr, register, length):
+        self._record(addr, register)
+        return super().read_i2c_block_data(addr, register, length)
+
+    def write_i2c_block_data(self, addr, register, data):
+        self._record(addr, register)
+        super().write_i2c_block_data(addr, register, data)
+
+
+def falls_back(path, configured_offset):
+    """A fresh IMU with this calibration file starts uncalibrated with the configured offset, without raising"""
+    global_config.imu_mounting_offset = configured_offset
+    bus = RecordingBus()
+    try:
+        imu = IMU(bus=bus, calibration_file=path)
+    except Exception as e:
+        print(f"   {type(e).__name__}: {e}")
+        return False
+    return (not imu.calibration_restored and global_config.imu_mounting_offset == configured_offset
+            and bus.profile == [0] * CALIBRATION_PROFILE_LENGTH and bus.mode == MODE_NDOF)
+
+
+def main():
+    results = []
+    configured_offset = global_config.imu_mounting_offset
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "imu_calibration.json")
+
+        # 1. The profile is read in CONFIG mode and saved; the sensor is back in fusion mode afterwards
+        bus = RecordingBus(profile=PROFILE)
+        imu = IMU(bus=bus, calibration_file=path)
+        saved = imu.save_calibration()
+        with open(path) as f:
+            stored = json.load(f)
+        passed = (saved and not imu.calibration_restored and stored.get("profile") == PROFILE
+                  and "imu_mounting_offset" not in stored
+                  and bus.profile_access_modes == [MODE_CONFIG] and bus.mode == MODE_NDOF)
+        print(f"1. Profile saved, read in CONFIG mode, back in NDOF mode {'✓' if passed else '✗'}")
+        results.append(passed)
+
+        # 2. The next IMU() writes it back to a fresh sensor in CONFIG mode
+        bus = RecordingBus()
+        imu = IMU(bus=bus, calibration_file=path)
+        passed = (imu.calibration_restored and bus.profile == PROFILE
+                  and bus.profile_access_modes == [MODE_CONFIG] and bus.mode == MODE_NDOF)
+        print(f"2. Profile restored on the next start, calibration_restored={imu.calibration_restored} "
+              f"{'✓' if passed else '✗'}")
+        results.append(passed)
+
+        # 3. A measured mounting offset is stored next to the profile and applied on the next start
+        bus.set_imu_sample(pitch=2.0, pitch_rate=0.0)  # Held upright, the sensor reads 2° more than configured
+        offset = imu.measure_mounting_offset(samples=5, interval=0.0)
+        imu.save_mounting_offset()
+        global_config.imu_mounting_offset = configured_offset
+        imu = IMU(bus=RecordingBus(), calibration_file=path)
+        with open(path) as f:
+            stored = json.load(f)
+        passed = (abs(offset - (configured_offset + 2.0)) <= 1 / 16 and stored.get("profile") == PROFILE
+                  and global_config.imu_mounting_offset == offset and imu.calibration_restored)
+        print(f"3. Mounting offset {offset:.2f}° stored and reloaded (configured {configured_offset:.2f}°) "
+              f"{'✓' if passed else '✗'}")
+        results.append(passed)
+
+        # 4. Missing, corrupt and wrong-sized files fall back to the configured offset
+        cases = {"missing": None, "corrupt": '{"profile": [1, 2,', "not an object": "[1, 2, 3]",
+                 "short profile": json.dumps({"profile": PROFILE[:10]})}
+        fallbacks = []
+        for name, content in cases.items():
+            case_path = os.path.join(directory, f"{name.replace(' ', '_')}.json")
+            if content is not None:
+                with open(case_path, "w") as f:
+                    f.write(content)
+            if falls_back(case_path, configured_offset):
+                fallbacks.append(name)
+        passed = len(fallbacks) == len(cases)
+        print(f"4. Fallback to the configured offset for: {', '.join(fallbacks)} {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    global_config.imu_mounting_offset = configured_offset
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
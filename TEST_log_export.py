@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Log export test (no hardware needed)
+
+Streams log entries through a LogManager into rotating files, checks the
+indexed queries against a plain scan, and times opening a synthetic 2-hour
+session for post-mortem analysis, which must take under a second.
+"""
+
+import logging
+import tempfile
+import time
+
+import numpy as np
+
+from src.log.logEntry import LogEntry
+from src.log.logExporter import LogExporter, LogQuery, load_logs, parquet_available
+from src.log.logManager import LogManager
+
+SESSION_SECONDS = 2 * 3600
+SESSION_RATE = 20        # Entries per second, debug logging of the loop included
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+LOCATIONS = ("control", "imu", "main", "rate", "i2c", "")
+
+
+def synthetic_entries(count, start, duration, seed=0):
+    """Entries spread over `duration` s with a skewed level mix, like a real session"""
+    rng = np.random.default_rng(seed)
+    times = start + np.sort(rng.uniform(0, duration, count))
+    levels = rng.choice(len(LEVELS), count, p=(0.8, 0.15, 0.04, 0.009, 0.001))
+    locations = rng.choice(len(LOCATIONS), count)
+    entries = []
+    for i in range(count):
+        entry = LogEntry(LOCATIONS[locations[i]] or None, LEVELS[levels[i]], f"message {i}")
+        entry.time = float(times[i])
+        entries.append(entry)
+    return entries
+
+
+def scan(frame, level, location, start, end):
+    """Reference result: filter every row"""
+    mask = (frame["time"] >= start) & (frame["time"] < end)
+    if level is not None:
+        mask &= frame["level"].isin([level] if isinstance(level, str) else level)
+    if location is not None:
+        mask &= frame["location"].isin([location] if isinstance(location, str) else location)
+    return frame[mask]
+
+
+def main():
+    logging.disable(logging.CRITICAL)  # The LogManager also forwards to the logging module
+    results = []
+
+    # 1. Entries logged through the LogManager end up in rotated files, in order, none lost
+    with tempfile.TemporaryDirectory() as directory:
+        log_manager = LogManager(max_entries=100)
+        log_manager.log_info("before the exporter started", location="main")
+        exporter = LogExporter(log_manager, directory, "csv", rotate_entries=250, flush_interval=0.02)
+        exporter.start()
+        for i in range(999):
+            log_manager.log_error(f"entry {i}, with \"quotes\"\nand a newline", location="control" if i % 3 else None)
+            if i % 100 == 0:
+                time.sleep(0.03)  # Let the worker flush in between
+        exporter.stop()
+        frame = load_logs(directory)
+        expected = ["before the exporter started"] + [f"entry {i}, with \"quotes\"\nand a newline" for i in range(999)]
+        passed = (len(exporter.files) == 4 and list(frame["message"]) == expected
+                  and frame["location"].iloc[1] == "" and exporter.write_errors == 0)
+        print(f"1. {exporter.entries_written} entries streamed into {len(exporter.files)} files "
+              f"{'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 2. Indexed queries return the same rows as a scan
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = LogExporter(LogManager(), directory, "csv", rotate_entries=3000)
+        start = 1.7e9
+        for entry in synthetic_entries(10000, start, 600.0, seed=1):
+            exporter.submit(entry)
+        exporter.flush()
+        exporter.stop()
+        logs = LogQuery.from_directory(directory)
+        cases = [
+            ("ERROR", None, start, start + 600),
+            (None, "imu", start + 100, start + 200),
+            (["WARNING", "ERROR"], ["control", "i2c"], start + 50, start + 550),
+            ("CRITICAL", "", start, start + 600),
+            ("DEBUG", "unknown", start, start + 600),
+        ]
+        passed = all(logs.query(level, location, first, last).equals(scan(logs.frame, level, location, first, last))
+                     for level, location, first, last in cases)
+        print(f"2. {len(cases)} level/location/time queries match a full scan {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 3. A 2-hour session opens and answers queries in under a second
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = LogExporter(LogManager(), directory, "csv")
+        start = 1.7e9
+        for entry in synthetic_entries(SESSION_SECONDS * SESSION_RATE, start, SESSION_SECONDS, seed=2):
+            exporter.submit(entry)
+        exporter.flush()
+        exporter.stop()
+
+        open_start = time.perf_counter()
+        logs = LogQuery.from_directory(directory)
+        opened = time.perf_counter() - open_start
+        query_start = time.perf_counter()
+        errors = logs.query(["ERROR", "CRITICAL"])
+        last_minute_imu = logs.query(location="imu", start=start + SESSION_SECONDS - 60)
+        queried = time.perf_counter() - query_start
+        passed = len(logs) == SESSION_SECONDS * SESSION_RATE and opened + queried < 1.0 and len(errors) > 0
+        print(f"3. 2-hour session ({len(logs)} entries, {len(exporter.files)} files) opened in {opened * 1000:.0f} ms, "
+              f"queries {queried * 1000:.1f} ms ({len(errors)} errors, {len(last_minute_imu)} imu entries "
+              f"in the last minute) {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 4. Parquet round trip, or a clear error when no Parquet engine is installed
+    with tempfile.TemporaryDirectory() as directory:
+        if parquet_available():
+            exporter = LogExporter(LogManager(), directory, "parquet", rotate_entries=400)
+            for entry in synthetic_entries(1000, 1.7e9, 60.0, seed=3):
+                exporter.submit(entry)
+            exporter.flush()
+            exporter.stop()
+            passed = len(exporter.files) == 3 and len(load_logs(directory)) == 1000
+            print(f"4. Parquet: 1000 entries in {len(exporter.files)} files {'✓' if passed else '✗'}")
+        else:
+            try:
+                LogExporter(LogManager(), directory, "parquet")
+                passed = False
+            except RuntimeError as e:
+                passed = "pyarrow" in str(e)
+                print(f"   {e}")
+            print(f"4. Parquet without pyarrow: refused at construction {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
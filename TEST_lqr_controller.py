@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+LQR controller test on simulated hardware (no hardware needed)
+
+Checks the Riccati solution against the equation itself, then balances the
+simulated robot with the tilt PID and with LQR state feedback through the
+same disturbances: both must stay up, and LQR must also hold its position
+and follow a drive command.
+"""
+
+import logging
+
+import numpy as np
+
+from src.analysis.telemetryAnalysis import settle_times, snapshot_to_arrays
+from src.config.configManager import global_config
+from src.control.lqrController import discretize, linearized_model, lqr_gains, solve_dare
+from src.log.logManager import LogManager
+from src.simulation.plantModel import DEFAULT_PLANT_PARAMETERS, InvertedPendulumPlant
+from src.simulation.simulatedHardware import SimulatedRobot
+
+DT = 0.005
+PUSH_TIME = 10.0   # s, the body gets a tilt rate kick
+DURATION = 20.0
+
+
+def balance(controller, initial_angle=8.0):
+    """Balance from an initial tilt with a push halfway; returns (robot, control loop, telemetry)"""
+    robot = SimulatedRobot(plant=InvertedPendulumPlant(angle=initial_angle))
+    control_loop = robot.create_control_loop(log_manager=LogManager(print_to_console=False), rate=1 / DT,
+                                             controller=controller)
+    control_loop.start_motors()
+    for i in range(int(DURATION / DT)):
+        if i == int(PUSH_TIME / DT):
+            robot.plant.theta_rate += 0.5
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+    return robot, control_loop, snapshot_to_arrays(control_loop.telemetry.snapshot()[0])
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    results = []
+
+    # 1. The doubling solution satisfies the discrete Riccati equation and stabilizes the model
+    A, B = discretize(*linearized_model(DEFAULT_PLANT_PARAMETERS), DT)
+    Q = np.diag([1.0, 0.1, 1.0, 0.1])
+    R = np.array([[10.0]])
+    P = solve_dare(A, B, Q, R)
+    residual = A.T @ P @ A - A.T @ P @ B @ np.linalg.solve(R + B.T @ P @ B, B.T @ P @ A) + Q - P
+    K = lqr_gains(DEFAULT_PLANT_PARAMETERS, DT, np.diag(Q), R[0, 0])
+    poles = np.abs(np.linalg.eigvals(A - B @ K[np.newaxis, :]))
+    passed = np.abs(residual).max() < 1e-8 * np.abs(P).max() and poles.max() < 1.0
+    print(f"1. Riccati residual {np.abs(residual).max():.1e}, largest closed-loop pole {poles.max():.4f} "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Both controllers recover from the initial tilt and the push; only LQR comes back to its start
+    runs = {}
+    recovered = True
+    for controller in ("pid", "lqr"):
+        robot, control_loop, telemetry = balance(controller)
+        events = settle_times(telemetry["time"], telemetry["angle"], threshold=3.0, band=1.0, hold=0.5)
+        runs[controller] = (robot, control_loop)
+        settled = ", ".join(f"{value:.2f}" for value in events["settle_time"])
+        print(f"   {controller}: settle times {settled} s, final position {robot.plant.position * 1000:+.1f} mm")
+        recovered &= (not robot.plant.fallen and len(events["onset"]) > 0
+                      and not np.isnan(events["settle_time"]).any())
+    lqr_position = runs["lqr"][0].plant.position
+    passed = recovered and abs(lqr_position) < 0.005 and abs(runs["pid"][0].plant.position) > abs(lqr_position)
+    print(f"2. PID and LQR recover from tilt and push, LQR holds its position {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. A drive command becomes a wheel speed target, and the robot holds still again after it
+    robot, control_loop = runs["lqr"]
+    pid_manager = control_loop.pid_manager
+    pid_manager.goForward()
+    start = robot.plant.position
+    for _ in range(int(5.0 / DT)):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+    speed = (robot.plant.position - start) / 5.0
+    pid_manager.stop()
+    for _ in range(int(3.0 / DT)):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+    stopped = robot.plant.position
+    for _ in range(int(2.0 / DT)):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+    expected = global_config.angle_move * global_config.lqr_speed_per_degree
+    passed = (not robot.plant.fallen and abs(speed - expected) < 0.2 * expected
+              and abs(robot.plant.position - stopped) < 0.005)
+    print(f"3. Driving at {speed * 1000:.0f} mm/s (target {expected * 1000:.0f} mm/s), then holding "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
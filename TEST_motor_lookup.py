@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Motor duty lookup test on simulated outputs (no hardware needed)
+
+Checks the supply voltage compensation of MotorController's duty lookup:
+a lower supply voltage drives the same torque command with a proportionally
+longer on-time, full commands stay clipped to full duty, and changes below
+the rebuild threshold keep the current table.
+"""
+
+from src.config.configManager import global_config
+from src.simulation.simulatedHardware import SimulatedMotorDriver
+
+COMMAND = 0.5
+
+
+def on_time_ns(driver, motor, command):
+    """Drive time per PWM period for a command (the driver expects inverted duty)"""
+    motor.set_speed(command)
+    return driver.pwm.get_period_ns() - driver.pwm.duty_ns
+
+
+def main():
+    results = []
+    nominal = global_config.motor_nominal_voltage
+    threshold = global_config.motor_voltage_rebuild_threshold
+
+    driver = SimulatedMotorDriver(is_left=True)
+    motor = driver.create_controller()
+    period_ns = driver.pwm.get_period_ns()
+
+    # 1. At the nominal voltage the on-time is the command
+    nominal_on_time = on_time_ns(driver, motor, COMMAND)
+    passed = abs(nominal_on_time - COMMAND * period_ns) <= 1
+    print(f"1. {nominal:.1f} V: command {COMMAND} on for {nominal_on_time} of {period_ns} ns "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. A lower supply voltage scales the on-time by nominal / actual, full commands clip at full duty
+    low_voltage = 0.8 * nominal
+    motor.set_supply_voltage(low_voltage)
+    low_on_time = on_time_ns(driver, motor, COMMAND)
+    full_on_time = on_time_ns(driver, motor, -1.0)
+    ratio = low_on_time / nominal_on_time
+    passed = abs(ratio - nominal / low_voltage) < 0.002 and full_on_time == period_ns
+    print(f"2. {low_voltage:.1f} V: on-time x{ratio:.3f} (expected x{nominal / low_voltage:.3f}), "
+          f"full command {full_on_time} ns {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. A change below the threshold keeps the table, one above it rebuilds
+    rebuilds = motor.lookup_rebuilds
+    motor.set_supply_voltage(low_voltage + 0.5 * threshold)
+    kept = motor.lookup_rebuilds == rebuilds and on_time_ns(driver, motor, COMMAND) == low_on_time
+    motor.set_supply_voltage(low_voltage + 2 * threshold)
+    rebuilt = motor.lookup_rebuilds == rebuilds + 1 and on_time_ns(driver, motor, COMMAND) < low_on_time
+    passed = kept and rebuilt
+    print(f"3. {0.5 * threshold:.2f} V change keeps the lookup, {2 * threshold:.2f} V rebuilds it "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Odometry test against the simulated plant (no hardware needed)
+
+Moves the simulated robot along known paths, reads the simulated encoders at
+the control loop's encoder rate and checks the integrated pose against the
+geometry: a straight run, a turn on the spot and a full circle arc.
+"""
+
+import math
+
+from src.control.controlLoop import ControlLoop
+from src.estimation.odometry import Odometry
+from src.simulation.simulatedHardware import SimulatedRobot
+
+READ_INTERVAL = 1.0 / ControlLoop.ENCODER_READ_RATE  # s
+
+
+def drive(path, duration):
+    """Pose from the simulated encoders while path(t) -> (position m, heading rad) moves the plant"""
+    robot = SimulatedRobot()
+    plant = robot.plant
+    odometry = Odometry(wheel_radius=plant.params["Rr"], track_width=plant.params["track_width"])
+    for i in range(int(round(duration / READ_INTERVAL)) + 1):
+        plant.position, plant.heading = path(i * READ_INTERVAL)
+        robot.update_sensors()
+        odometry.update(robot.encoder_left.get_steps(), robot.encoder_right.get_steps())
+    return odometry
+
+
+def check(name, odometry, x, y, heading, tolerance=0.002, heading_tolerance=0.002):
+    """Position within `tolerance` m and heading within `heading_tolerance` rad of the expected pose"""
+    error = math.hypot(odometry.x - x, odometry.y - y)
+    heading_error = abs(odometry.heading - heading)
+    passed = error <= tolerance and heading_error <= heading_tolerance
+    print(f"{name}: pose ({odometry.x:.4f} m, {odometry.y:.4f} m, {math.degrees(odometry.heading):.2f}°), "
+          f"expected ({x:.4f} m, {y:.4f} m, {math.degrees(heading):.2f}°), off by {error * 1000:.2f} mm "
+          f"{'✓' if passed else '✗'}")
+    return passed
+
+
+def main():
+    results = []
+
+    # 1. Straight run: 1.5 m at 0.3 m/s, heading unchanged
+    odometry = drive(lambda t: (0.3 * t, 0.0), 5.0)
+    passed = check("1. Straight run", odometry, 1.5, 0.0, 0.0) and abs(odometry.distance - 1.5) < 0.002
+    results.append(passed)
+
+    # 2. Turn on the spot: a quarter turn counter-clockwise, the position must not move
+    odometry = drive(lambda t: (0.0, math.pi / 2 * t / 2.0), 2.0)
+    results.append(check("2. Turn on the spot", odometry, 0.0, 0.0, math.pi / 2))
+
+    # 3. Arc of radius 0.5 m: a quarter circle in 4 s, then the full circle back to the start
+    radius, quarter = 0.5, 4.0
+    rate = math.pi / 2 / quarter
+    speed = radius * rate
+    odometry = drive(lambda t: (speed * t, rate * t), quarter)
+    passed = check("3. Quarter circle arc", odometry, radius, radius, math.pi / 2)
+    odometry = drive(lambda t: (speed * t, rate * t), 4 * quarter)
+    passed &= check("   Full circle arc", odometry, 0.0, 0.0, 2 * math.pi, tolerance=0.002)
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+HardwarePWM startup test against a fake sysfs tree (no hardware needed)
+
+A background thread plays the kernel and udev: the channel directory only
+appears some time after the export. Checks that initialization waits for
+it without spinning a core, reports the time to ready, times out with an
+error, and that create_motor_pair() initializes both channels concurrently.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from gpiozero import Device
+from gpiozero.pins.mock import MockFactory
+
+import src.hardware.motorController as motorController
+from src.hardware.hardwarePWMLib import HardwarePWM, HardwarePWMError
+
+EXPORT_DELAY = 0.15  # s until the exported channel becomes writable
+
+
+def create_fake_chip(root):
+    chip = os.path.join(root, "pwmchip0")
+    os.makedirs(chip)
+    open(os.path.join(chip, "export"), "w").close()
+
+
+def make_channel_ready_later(root, channel, delay):
+    """Create pwm<channel>/ with its attribute files after `delay`"""
+    def create():
+        time.sleep(delay)
+        path = os.path.join(root, "pwmchip0", f"pwm{channel}")
+        os.makedirs(path)
+        for name in ("period", "duty_cycle", "enable"):
+            open(os.path.join(path, name), "w").close()
+    threading.Thread(target=create, daemon=True).start()
+
+
+def fake_pwm_class(root, export_delay=EXPORT_DELAY):
+    """HardwarePWM on the fake tree; exporting makes the channel writable after `export_delay`"""
+    class FakeSysfsPWM(HardwarePWM):
+        SYSFS_PATH = root
+
+        def _export_pwm(self):
+            if export_delay is not None:
+                make_channel_ready_later(root, self._channel, export_delay)
+    return FakeSysfsPWM
+
+
+def main():
+    results = []
+
+    # 1. Waits for the export without spinning and reports the time to ready
+    with tempfile.TemporaryDirectory() as root:
+        create_fake_chip(root)
+        cpu_start = time.process_time()
+        pwm = fake_pwm_class(root)(0, 50000)
+        cpu_used = time.process_time() - cpu_start
+        passed = EXPORT_DELAY <= pwm.time_to_ready < EXPORT_DELAY + 0.1 and cpu_used < 0.2 * EXPORT_DELAY
+        print(f"1. Ready after {pwm.time_to_ready * 1000:.0f} ms using {cpu_used * 1000:.1f} ms CPU "
+              f"{'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 2. A channel that never appears fails after the timeout instead of hanging
+    with tempfile.TemporaryDirectory() as root:
+        create_fake_chip(root)
+        start = time.monotonic()
+        try:
+            fake_pwm_class(root, export_delay=None)(0, 50000, ready_timeout=0.1)
+            passed = False
+        except HardwarePWMError as e:
+            elapsed = time.monotonic() - start
+            passed = 0.1 <= elapsed < 0.2
+            print(f"   {e}")
+        print(f"2. Missing channel: HardwarePWMError after {(time.monotonic() - start) * 1000:.0f} ms "
+              f"{'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 3. Both motor channels are initialized concurrently: one export delay, not two
+    with tempfile.TemporaryDirectory() as root:
+        create_fake_chip(root)
+        Device.pin_factory = MockFactory()
+        motorController.HardwarePWM = fake_pwm_class(root)
+        start = time.monotonic()
+        motor_left, motor_right = motorController.create_motor_pair()
+        elapsed = time.monotonic() - start
+        passed = elapsed < 1.6 * EXPORT_DELAY and min(motor_left.time_to_ready, motor_right.time_to_ready) >= EXPORT_DELAY
+        print(f"3. Motor pair ready in {elapsed * 1000:.0f} ms (left {motor_left.time_to_ready * 1000:.0f} ms, "
+              f"right {motor_right.time_to_ready * 1000:.0f} ms) {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
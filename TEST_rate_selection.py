@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Loop rate self-test on simulated hardware (no hardware needed)
+
+Measures the control stages on simulated drivers with injected latency
+distributions, checks the selected rate and decimation, and runs the
+control loop with the selection to confirm the deadline is kept.
+"""
+
+import math
+import random
+from array import array
+
+from src.config.configManager import global_config
+from src.control.controlLoop import ControlLoop
+from src.control.rateSelector import measure_stage_latencies, run_self_test, select_loop_rate
+from src.control.stageProfiler import StageProfiler
+from src.hardware.imu import IMU_ADDR
+from src.log.logManager import LogManager
+from src.pid.pidManager import pidManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+LOOP_TICKS = 3000
+
+
+def select(robot):
+    imu = robot.create_imu()
+    motor_left, motor_right = robot.create_motors()
+    latencies = measure_stage_latencies(imu, motor_left, motor_right, pidManager(),
+                                        robot.encoder_left, robot.encoder_right)
+    return select_loop_rate(latencies)
+
+
+def measure_tick_p99(robot, decision):
+    """p99 of the real tick durations (ns) running the loop with the decision"""
+    profiler = StageProfiler(ControlLoop.STAGES, capacity=LOOP_TICKS)
+    control_loop = robot.create_control_loop(
+        log_manager=LogManager(), rate=decision.rate, profiler=profiler, decimation=decision.decimation
+    )
+    control_loop.start_motors()
+    for _ in range(LOOP_TICKS):
+        control_loop.tick(robot.get_time())
+        robot.step(decision.interval)
+    ticks = sorted(sum(stage[i] for stage in profiler.samples) for i in range(LOOP_TICKS))
+    return ticks[int(LOOP_TICKS * 0.99)]
+
+
+def check_loop(robot, decision):
+    """
+    Run the loop with the decision: the measured p99 tick must stay within the
+    interval. It is not compared with the budget itself, the budget fraction is
+    the margin for scheduler noise the short measurement cannot capture.
+    """
+    tick_p99 = measure_tick_p99(robot, decision)
+    passed = tick_p99 <= decision.interval * 1e9
+    return passed, (f"measured p99 tick {tick_p99 / 1000:.0f} µs (estimated {decision.tick_p99_ns / 1000:.0f} µs, "
+                    f"interval {decision.interval * 1e6:.0f} µs)")
+
+
+def main():
+    random.seed(1)
+    fastest = max(global_config.control_rate_candidates)
+    results = []
+
+    # 1. Fast simulated hardware runs at the highest candidate rate
+    decision = select(SimulatedRobot())
+    passed = decision.fits and decision.rate == fastest
+    print(f"1. No latency: {decision.format()} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. A slow IMU (lognormal around 0.7 ms) lowers the rate; the loop must then meet the budget
+    slow_imu = {IMU_ADDR: lambda: random.lognormvariate(math.log(0.0007), 0.3)}
+    decision = select(SimulatedRobot(i2c_latencies=slow_imu))
+    loop_ok, measured = check_loop(SimulatedRobot(i2c_latencies=slow_imu), decision)
+    passed = decision.fits and decision.rate < fastest and loop_ok
+    print(f"2. Slow IMU: {decision.format()}\n   {measured} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. Slow encoder reads (0.3 ms each)
+    decision = select(SimulatedRobot(encoder_latency=0.0003))
+    loop_ok, measured = check_loop(SimulatedRobot(encoder_latency=0.0003), decision)
+    passed = decision.fits and loop_ok
+    print(f"3. Slow encoders: {decision.format()}\n   {measured} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. A slow stage that still runs in 1% of the ticks is decimated further before the rate is lowered
+    latencies = {name: array("q", [ns] * 300) for name, ns in
+                 (("imu", 5000), ("encoders", 400000), ("pwm", 5000), ("pid", 5000), ("yaw_pid", 5000))}
+    decision = select_loop_rate(latencies, candidates=(2000,))
+    nominal = math.ceil(2000 / ControlLoop.ENCODER_READ_RATE)
+    passed = decision.fits and decision.decimation["encoders"] == 2 * nominal
+    print(f"4. Synthetic 400 µs encoder read at 2 kHz: {decision.format()} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 5. Hardware too slow for any candidate: slowest rate, reported as over budget
+    robot = SimulatedRobot(i2c_latencies={IMU_ADDR: 0.008})
+    log_manager = LogManager()
+    motor_left, motor_right = robot.create_motors()
+    decision = run_self_test(robot.create_imu(), motor_left, motor_right, pidManager(), log_manager=log_manager)
+    warned = any(entry.event_type == "WARNING" for entry in log_manager.log_entries)
+    passed = not decision.fits and decision.rate == min(global_config.control_rate_candidates) and warned
+    print(f"5. IMU slower than any interval: {decision.format()} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
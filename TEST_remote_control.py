@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Remote command channel test over localhost (no hardware needed)
+
+Starts a RemoteControlServer around a real pidManager, connects a
+RemotePIDManager proxy and checks gains, offsets and joystick commands
+arrive, and that a flood of joystick updates is coalesced.
+"""
+
+import time
+from src.config.configManager import global_config
+
+from src.pid.pidManager import pidManager
+from src.user_input.remoteControl import RemoteControlServer, RemotePIDManager
+
+PORT = 5096
+JOYSTICK_RATE = 20
+
+
+def main():
+    pid_manager = pidManager()
+    server = RemoteControlServer(pid_manager, host="127.0.0.1", port=PORT)
+    server.start()
+    proxy = RemotePIDManager("127.0.0.1", PORT, joystick_rate=JOYSTICK_RATE)
+    results = []
+
+    # Gains: read through the cache, written through setattr like RobotGui does
+    print(f"1. Gains read remotely: kp={proxy.pid_tilt_angle_to_torque.kp}")
+    setattr(proxy.pid_tilt_angle_to_torque, "kp", 0.05)
+    passed = pid_manager.pid_tilt_angle_to_torque.kp == 0.05
+    print(f"   kp set to 0.05 -> robot kp={pid_manager.pid_tilt_angle_to_torque.kp} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    proxy.set_dynamic_target_angle_offset(1.5)
+    passed = pid_manager.dynamic_target_angle_offset == 1.5
+    print(f"2. Dynamic offset -> robot offset={pid_manager.dynamic_target_angle_offset} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # Joystick flood: 1000 drag events within 0.5 s
+    commands_before = server.commands_received
+    start = time.perf_counter()
+    for i in range(1000):
+        proxy.setTargetAngle(i / 1000)
+        proxy.setTargetTorqueDifferenital(-i / 1000)
+        time.sleep(0.0005)
+    time.sleep(3 / JOYSTICK_RATE)  # Let the last coalesced update go out
+    duration = time.perf_counter() - start
+
+    joystick_messages = server.commands_received - commands_before
+    max_expected = duration * JOYSTICK_RATE + 2
+    # Joystick X sets a target yaw rate with yaw rate control, the torque differential directly without
+    if pid_manager.yaw_rate_control_enabled:
+        final_name = "target_yaw_rate"
+        final_value = pid_manager.pid_yaw_rate_to_torque_diff.target_yaw_rate
+        final_ok = abs(final_value - (-0.999 * global_config.max_yaw_rate)) < 1e-9
+    else:
+        final_name = "torque_differential"
+        final_value = pid_manager.torque_differential
+        final_ok = abs(final_value - (-0.999 * 0.03)) < 1e-9
+    passed = joystick_messages <= max_expected and final_ok
+    print(f"3. 1000 joystick updates -> {joystick_messages} messages in {duration:.2f}s "
+          f"(limit {max_expected:.0f}), final {final_name}={final_value:.4f} "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    proxy.close()
+    server.stop()
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
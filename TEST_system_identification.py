@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+System identification test on simulated hardware (no hardware needed)
+
+Records telemetry from the real control loop balancing a simulated robot
+whose plant differs from the defaults, with the identification excitation
+on, then checks that the fitted parameters match the ones the simulation
+used and that the simulator loads the written parameter file.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from src.analysis.systemIdentification import identify_plant
+from src.analysis.telemetryAnalysis import snapshot_to_arrays
+from src.config.configManager import global_config
+from src.log.logManager import LogManager
+from src.simulation.plantModel import (DEFAULT_PLANT_PARAMETERS, InvertedPendulumPlant, load_plant_parameters,
+                                       save_plant_parameters)
+from src.simulation.simulatedHardware import SimulatedRobot
+from src.telemetry.telemetryBuffer import TelemetryBuffer
+
+DT = 0.005
+DURATION = 60.0
+TRUE_PARAMETERS = dict(DEFAULT_PLANT_PARAMETERS, ell=0.13, J_B=0.006, max_wheel_torque=0.25,
+                       rate_damping=0.002, motor_deadband=0.05)
+
+
+def record_session():
+    """Telemetry of DURATION s of balancing with the excitation on"""
+    global_config.sysid_excitation_amplitude = 0.05
+    robot = SimulatedRobot(plant=InvertedPendulumPlant(TRUE_PARAMETERS))
+    control_loop = robot.create_control_loop(log_manager=LogManager(), rate=1 / DT)
+    global_config.sysid_excitation_amplitude = 0.0
+    control_loop.telemetry = TelemetryBuffer(int(DURATION / DT))
+    control_loop.start_motors()
+    for _ in range(int(DURATION / DT)):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+    return snapshot_to_arrays(control_loop.telemetry.snapshot()[0]), robot.plant.fallen
+
+
+def relative_error(parameters, name):
+    return abs(parameters[name] - TRUE_PARAMETERS[name]) / TRUE_PARAMETERS[name]
+
+
+def main():
+    results = []
+    telemetry, fallen = record_session()
+    # Mass and lever arm are measured on the robot, the rest is fitted
+    base_parameters = dict(DEFAULT_PLANT_PARAMETERS, m=TRUE_PARAMETERS["m"], ell=TRUE_PARAMETERS["ell"])
+
+    # 1. Fit with encoder data: inertia, motor gain and deadband
+    result = identify_plant(telemetry, base_parameters)
+    print(result.format())
+    fitted = result.parameters
+    passed = (not fallen and relative_error(fitted, "J_B") < 0.1 and relative_error(fitted, "max_wheel_torque") < 0.05
+              and abs(fitted["motor_deadband"] - TRUE_PARAMETERS["motor_deadband"]) < 0.01 and result.tilt_r2 > 0.9)
+    print(f"1. J_B off by {relative_error(fitted, 'J_B') * 100:.1f}%, max_wheel_torque by "
+          f"{relative_error(fitted, 'max_wheel_torque') * 100:.1f}%, deadband {fitted['motor_deadband']:.3f} "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Without encoders the motor gain comes from the tilt fit alone
+    no_encoders = dict(telemetry, left_position=np.zeros_like(telemetry["time"]),
+                       right_position=np.zeros_like(telemetry["time"]))
+    tilt_only = identify_plant(no_encoders, base_parameters).parameters
+    passed = relative_error(tilt_only, "J_B") < 0.1 and relative_error(tilt_only, "max_wheel_torque") < 0.1
+    print(f"2. Tilt only: J_B off by {relative_error(tilt_only, 'J_B') * 100:.1f}%, max_wheel_torque by "
+          f"{relative_error(tilt_only, 'max_wheel_torque') * 100:.1f}% {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. The simulator picks up the written parameter file
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "plant_parameters.json")
+        save_plant_parameters(fitted, path)
+        plant = InvertedPendulumPlant(load_plant_parameters(path))
+        passed = all(plant.params[name] == fitted[name] for name in ("J_B", "max_wheel_torque", "motor_deadband"))
+        print(f"3. Parameter file loaded by the simulator {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Telemetry analysis test on synthetic recordings (no hardware needed)
+
+Each metric is checked on a signal with a known answer, then a full
+analysis of an hour of 200 Hz telemetry has to finish in under a second.
+"""
+
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.analysis.telemetryAnalysis import (analyze, damping_ratio, dominant_frequency, encoder_drift,
+                                            format_report, load_telemetry, loop_period_jitter,
+                                            saturation_ratio, settle_times)
+from src.telemetry.telemetryBuffer import TELEMETRY_FIELDS
+
+RATE = 200.0
+HOUR_SAMPLES = int(3600 * RATE)
+
+
+def close(value, expected, tolerance):
+    return abs(value - expected) <= tolerance * abs(expected)
+
+
+def synthetic_session(samples, seed=0):
+    """Balancing session: noisy 1.8 Hz wobble, kicks every 20 s, jittery loop timing, creeping wheels"""
+    rng = np.random.default_rng(seed)
+    periods = 1 / RATE + 40e-6 * np.sin(2 * np.pi * 7.0 * np.arange(samples) / RATE) + rng.normal(0, 5e-6, samples)
+    t = np.concatenate(([0.0], np.cumsum(periods[1:])))
+    since_kick = t % 20.0
+    angle = (6.0 * np.exp(-0.12 * 2 * np.pi * 1.8 * since_kick) * np.cos(2 * np.pi * 1.8 * since_kick)
+             + rng.normal(0, 0.05, samples))
+    torque = np.clip(0.2 * angle, -1.0, 1.0)
+    left = 40.0 * t + rng.normal(0, 2, samples)
+    right = 44.0 * t + rng.normal(0, 2, samples)
+    telemetry = {field: np.zeros(samples) for field in TELEMETRY_FIELDS}
+    telemetry.update(time=t, angle=angle, torque=torque, left_position=left, right_position=right)
+    return telemetry
+
+
+def main():
+    results = []
+    t = np.arange(int(30 * RATE)) / RATE
+
+    # 1. Frequency and damping ratio of a decaying oscillation
+    frequency, zeta = 2.5, 0.08
+    decay = 5.0 * np.exp(-zeta * 2 * np.pi * frequency * t) * np.cos(2 * np.pi * frequency * t)
+    found_frequency, _amplitude = dominant_frequency(t, decay)
+    found_zeta = damping_ratio(t, decay)
+    passed = close(found_frequency, frequency, 0.02) and close(found_zeta, zeta, 0.15)
+    print(f"1. Decay at {frequency} Hz, zeta {zeta}: found {found_frequency:.3f} Hz, zeta {found_zeta:.3f} "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Settle times of two exponential recoveries and one disturbance that never settles
+    t_long = np.arange(int(60 * RATE)) / RATE
+    error = np.zeros_like(t_long)
+    for onset, peak in ((10.0, 8.0), (30.0, 5.0)):
+        after = t_long >= onset
+        error[after] += peak * np.exp(-(t_long[after] - onset) / 0.3)
+    error[t_long >= 55.0] = 4.0
+    events = settle_times(t_long, error, threshold=3.0, band=1.0, hold=0.5)
+    expected = (0.3 * math.log(8.0), 0.3 * math.log(5.0))
+    passed = (len(events["onset"]) == 3 and np.allclose(events["onset"], (10.0, 30.0, 55.0))
+              and np.allclose(events["settle_time"][:2], expected, atol=2 / RATE)
+              and math.isnan(events["settle_time"][2]) and np.allclose(events["peak"], (8.0, 5.0, 4.0)))
+    print(f"2. Settle times {np.round(events['settle_time'], 3)} s, expected {np.round(expected, 3)} and unsettled "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. Saturation ratio against counting the ticks one by one
+    torque = np.clip(1.5 * np.sin(2 * np.pi * 0.5 * t), -1.0, 1.0)
+    reference = sum(1 for value in torque if abs(value) >= 0.99) / len(torque)
+    ratio = saturation_ratio(torque, limit=1.0, tolerance=0.01)
+    passed = math.isclose(ratio, reference)
+    print(f"3. Torque saturated {ratio * 100:.1f}% of ticks {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. Loop period jitter with a periodic 7 Hz disturber, and wheel drift of 40/44 steps/s
+    session = synthetic_session(int(120 * RATE))
+    jitter = loop_period_jitter(session["time"])
+    drift = encoder_drift(session["time"], session["left_position"], session["right_position"], meters_per_step=1e-3)
+    passed = (close(jitter["dominant_frequency"], 7.0, 0.03) and close(jitter["mean_us"], 5000, 0.01)
+              and close(drift["position"], 0.042, 0.01) and close(drift["differential"], 0.004, 0.05))
+    print(f"4. Jitter peak at {jitter['dominant_frequency']:.2f} Hz (std {jitter['std_us']:.1f} µs), drift "
+          f"{drift['position'] * 1000:.1f} mm/s, differential {drift['differential'] * 1000:.2f} mm/s "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 5. Recording round trip through the receiver's CSV format
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.csv")
+        rows = np.column_stack([np.arange(len(session["time"]))] + [session[field] for field in TELEMETRY_FIELDS])
+        np.savetxt(path, rows, delimiter=",", header=",".join(("sequence",) + TELEMETRY_FIELDS), comments="")
+        loaded = load_telemetry(path)
+        passed = all(np.allclose(loaded[field], session[field]) for field in TELEMETRY_FIELDS)
+        print(f"5. {len(loaded['time'])} records loaded from a receiver recording {'✓' if passed else '✗'}")
+        results.append(passed)
+
+    # 6. An hour of 200 Hz telemetry in under a second
+    session = synthetic_session(HOUR_SAMPLES, seed=1)
+    start = time.perf_counter()
+    report = analyze(session)
+    elapsed = time.perf_counter() - start
+    passed = (elapsed < 1.0 and close(report["oscillation_frequency"], 1.8, 0.02)
+              and close(report["damping_ratio"], 0.12, 0.2)
+              and len(report["disturbances"]["onset"]) == 180 and report["unsettled"] == 0)
+    print(format_report(report))
+    print(f"6. One hour ({HOUR_SAMPLES} samples) analyzed in {elapsed * 1000:.0f} ms {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
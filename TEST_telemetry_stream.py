@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+UDP telemetry stream test (no hardware needed)
+
+Checks the packet layout round trip, streams records from a
+TelemetryPublisher to a TelemetryReceiver over 127.0.0.1 on an ephemeral
+port, and feeds the receiver's decode path a gapped, reordered and
+duplicated sequence: gaps are counted as lost, late and duplicate packets
+are dropped without rewinding the stream, and the sequence number wraps.
+"""
+
+import time
+
+from src.telemetry.telemetryBuffer import TELEMETRY_FIELDS, TelemetryBuffer
+from src.telemetry.telemetryProtocol import PACKET, SEQUENCE_MODULO, decode_packet, encode_packet
+from src.telemetry.telemetryPublisher import TelemetryPublisher
+from src.telemetry.telemetryReceiver import TelemetryReceiver
+
+
+def make_record(i):
+    """Record i in TELEMETRY_FIELDS order, with values exact in float32"""
+    return (i * 0.005,) + tuple(float(i + k) / 4 for k in range(1, len(TELEMETRY_FIELDS)))
+
+
+def received_times(receiver):
+    columns, _head = receiver.telemetry.snapshot()
+    return [round(t / 0.005) for t in columns[0]]
+
+
+def main():
+    results = []
+
+    # 1. encode/decode round trip; other layouts are rejected
+    record = make_record(7)
+    packet = encode_packet(SEQUENCE_MODULO + 41, record)
+    decoded = decode_packet(packet)
+    corrupted = bytearray(packet)
+    corrupted[0:2] = b"XX"
+    passed = (len(packet) == PACKET.size and decoded == (41, record) and decode_packet(bytes(corrupted)) is None
+              and decode_packet(packet[:-1]) is None)
+    print(f"1. {PACKET.size}-byte packet round trip, sequence wrapped to {decoded[0]}, "
+          f"foreign packets rejected {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Publisher to receiver over the loopback interface
+    receiver = TelemetryReceiver(port=0, host="127.0.0.1")
+    receiver.start()
+    telemetry = TelemetryBuffer(64)
+    publisher = TelemetryPublisher(telemetry, host="127.0.0.1", port=receiver.port, rate=1000)
+    sent = 0
+    for i in range(20):
+        telemetry.record(*make_record(i))
+        sent += publisher.publish()
+    repeated = publisher.publish()  # No new record since the last packet
+    deadline = time.monotonic() + 2.0
+    while receiver.packets_received < sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    publisher.stop()
+    receiver.stop()
+    passed = (sent == 20 and not repeated and receiver.packets_received == 20 and receiver.packets_lost == 0
+              and receiver.telemetry.latest() == make_record(19) and received_times(receiver) == list(range(20)))
+    print(f"2. Loopback on port {receiver.port}: {receiver.packets_received}/{sent} packets, "
+          f"records intact {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. Gaps count as lost; late and duplicate packets are dropped, garbage is counted as invalid
+    receiver = TelemetryReceiver(port=0, host="127.0.0.1")
+    for sequence in (0, 1, 2, 5, 4, 5, 3, 6, 9, 9, 7, 10):
+        receiver.handle_packet(encode_packet(sequence, make_record(sequence)))
+    receiver.handle_packet(b"not a telemetry packet")
+    receiver.stop()
+    passed = (receiver.packets_received == 7 and receiver.packets_lost == 4 and receiver.packets_out_of_order == 5
+              and receiver.invalid_packets == 1 and received_times(receiver) == [0, 1, 2, 5, 6, 9, 10])
+    print(f"3. Reordered stream: {receiver.packets_received} kept, {receiver.packets_lost} lost, "
+          f"{receiver.packets_out_of_order} late or duplicate, {receiver.invalid_packets} invalid, "
+          f"loss ratio {receiver.get_loss_ratio() * 100:.0f}% {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. The sequence number wraps without counting a loss
+    receiver = TelemetryReceiver(port=0, host="127.0.0.1")
+    for sequence in (SEQUENCE_MODULO - 2, SEQUENCE_MODULO - 1, 0, 1, SEQUENCE_MODULO - 1, 3):
+        receiver.handle_packet(encode_packet(sequence, make_record(sequence % 100)))
+    receiver.stop()
+    passed = receiver.packets_received == 5 and receiver.packets_lost == 1 and receiver.packets_out_of_order == 1
+    print(f"4. Sequence wrap: {receiver.packets_received} kept, {receiver.packets_lost} lost, "
+          f"{receiver.packets_out_of_order} late {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
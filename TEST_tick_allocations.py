@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Allocation test of the control tick on simulated hardware (no hardware needed)
+
+Runs the real control loop against the simulated robot and checks that
+steady-state ticks leave no allocations behind: the number of allocated
+memory blocks and the blocks traced by tracemalloc must not grow over
+10,000 ticks. Temporary floats and tuples freed within a tick are fine.
+
+The allocator's free lists make the block count wobble by a few dozen
+blocks between measurements, so a small fixed tolerance is allowed; a leak of
+one object per tick would show up as 10,000 blocks.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+from src.log.logManager import LogManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+WARMUP_TICKS = 2000   # Fills the log store and every lazily created object
+MEASURED_TICKS = 10000
+DT = 0.005
+TOLERANCE_BLOCKS = 32  # Free list noise, independent of the number of ticks
+
+
+def run_ticks(robot, control_loop, count):
+    for _ in range(count):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+
+
+def main():
+    robot = SimulatedRobot()
+    # Debug logging stays on so the rate-limited log line is exercised; the store holds 16 entries
+    log_manager = LogManager(print_to_console=False, debug_mode=True, max_entries=16)
+    control_loop = robot.create_control_loop(log_manager=log_manager, rate=1 / DT)
+    control_loop.start_motors()
+    results = []
+
+    run_ticks(robot, control_loop, WARMUP_TICKS)
+
+    # 1. Allocated blocks before and after, with the cyclic GC out of the picture
+    gc.collect()
+    gc.disable()
+    blocks_before = sys.getallocatedblocks()
+    run_ticks(robot, control_loop, MEASURED_TICKS)
+    blocks_after = sys.getallocatedblocks()
+    gc_objects = gc.get_count()[0]  # Net new GC-tracked containers, i.e. collector pressure
+    gc.enable()
+    gc.collect()
+    blocks_collected = sys.getallocatedblocks()
+
+    growth = blocks_after - blocks_before
+    passed = (growth <= TOLERANCE_BLOCKS and blocks_collected - blocks_before <= TOLERANCE_BLOCKS
+              and gc_objects <= TOLERANCE_BLOCKS)
+    print(f"1. {MEASURED_TICKS} ticks: {growth:+d} allocated blocks ({blocks_collected - blocks_before:+d} "
+          f"after gc.collect()), {gc_objects} new GC-tracked objects {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Traced blocks of the robot code, reporting where they grew if they did
+    tracemalloc.start()
+    run_ticks(robot, control_loop, WARMUP_TICKS)  # Replace every log entry allocated before tracing
+    snapshot_before = tracemalloc.take_snapshot()
+    run_ticks(robot, control_loop, MEASURED_TICKS)
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Filtered only after both snapshots, the filters compile patterns themselves
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    snapshot_before = snapshot_before.filter_traces(ignore)
+    snapshot_after = snapshot_after.filter_traces(ignore)
+
+    differences = snapshot_after.compare_to(snapshot_before, "lineno")
+    growth = sum(stat.count_diff for stat in differences)
+    growth_bytes = sum(stat.size_diff for stat in differences)
+    passed = growth <= TOLERANCE_BLOCKS
+    print(f"2. {MEASURED_TICKS} ticks: {growth:+d} traced blocks ({growth_bytes:+d} bytes) {'✓' if passed else '✗'}")
+    if not passed:
+        for stat in differences[:10]:
+            print(f"   {os.path.relpath(stat.traceback[0].filename)}:{stat.traceback[0].lineno} "
+                  f"{stat.count_diff:+d} blocks {stat.size_diff:+d} bytes")
+    results.append(passed)
+
+    # 3. The loop must still have been balancing
+    passed = not robot.plant.fallen and not control_loop.wait_until_correct_angle
+    print(f"3. Still balancing after {control_loop.ticks} ticks: angle={robot.plant.angle:.2f}° "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
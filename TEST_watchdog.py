@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Control loop watchdog test on simulated hardware (no hardware needed)
+
+Drives Watchdog.check() directly with the simulated time instead of running
+its thread: no trip while the loop ticks, a trip after
+max(missed_deadlines * interval, min_timeout) without a tick that forces both
+motors to standstill and logs the stall, re-arming once the loop ticks again,
+and a restart only through the loop's upright check, also when the
+watchdog stops the motors while the loop thread is restarting them.
+"""
+
+import math
+import threading
+import time
+
+from src.control.watchdog import Watchdog
+from src.log.logManager import LogManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+CHECK_STEP = 0.0005  # s between watchdog checks while the loop is stalled
+
+
+def create_loop(rate):
+    robot = SimulatedRobot()
+    log_manager = LogManager()
+    control_loop = robot.create_control_loop(log_manager=log_manager, rate=rate)
+    control_loop.running = True  # As in run(); the watchdog only acts on a running loop
+    return robot, control_loop, log_manager
+
+
+def tick_and_check(robot, control_loop, watchdog, count):
+    """Tick normally with a watchdog check after every tick; returns True if it ever tripped"""
+    tripped = False
+    for _ in range(count):
+        control_loop.tick(robot.get_time())
+        robot.step(control_loop.interval)
+        tripped |= watchdog.check(robot.get_time())
+    return tripped
+
+
+def stall_until_trip(robot, control_loop, watchdog, limit=1.0):
+    """Check without ticking until the watchdog trips; returns the stall time it tripped at"""
+    start = robot.get_time()
+    stall = 0.0
+    while stall < limit:
+        stall += CHECK_STEP
+        if watchdog.check(start + stall):
+            robot.plant.time = start + stall  # The loop resumes after the stall
+            return stall
+    return None
+
+
+def motors_forced_off(robot):
+    drivers = (robot.driver_left, robot.driver_right)
+    return all(driver.get_command() == 0.0 and driver.enable.value == 0
+               and driver.pwm.duty_ns == driver.pwm.get_period_ns() for driver in drivers)
+
+
+def main():
+    results = []
+
+    # 1. No trip while the loop ticks, a trip after missed_deadlines intervals without a tick
+    robot, control_loop, log_manager = create_loop(rate=100)
+    watchdog = Watchdog(control_loop, missed_deadlines=5, min_timeout=0.025, log_manager=log_manager)
+    tripped_while_ticking = tick_and_check(robot, control_loop, watchdog, 400)
+    running_before = robot.driver_left.enable.value == 1 and robot.driver_right.enable.value == 1
+    stall = stall_until_trip(robot, control_loop, watchdog)
+    expected = max(5 * control_loop.interval, 0.025)
+    passed = (not tripped_while_ticking and running_before and stall is not None
+              and expected - 1e-9 <= stall < expected + 2 * CHECK_STEP)
+    print(f"1. 100 Hz: no trip over 400 ticks, tripped after {stall * 1000:.1f} ms "
+          f"(timeout {expected * 1000:.1f} ms) {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Both motors at standstill duty with the drivers disabled, the stall logged with its duration
+    critical = [entry.message for entry in log_manager.log_entries if entry.event_type == "CRITICAL"]
+    passed = (motors_forced_off(robot) and control_loop.wait_until_correct_angle and watchdog.trips == 1
+              and any("stalled for" in message and " ms" in message for message in critical))
+    print(f"2. Motors forced off, stall logged: {critical[-1] if critical else None!r} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. Re-armed once the loop ticks again: the resume is logged and a second stall trips again
+    resumed = not tick_and_check(robot, control_loop, watchdog, 1)
+    warnings = [entry.message for entry in log_manager.log_entries if entry.event_type == "WARNING"]
+    logged = any("resumed after" in message for message in warnings)
+    stall_again = stall_until_trip(robot, control_loop, watchdog)
+    passed = (resumed and logged and stall_again is not None
+              and watchdog.trips == 2 and watchdog.longest_stall >= expected)
+    print(f"3. Re-armed after the loop resumed, tripped again after {stall_again * 1000:.1f} ms "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 4. The timeout floor applies at high loop rates
+    robot, control_loop, log_manager = create_loop(rate=1000)
+    watchdog = Watchdog(control_loop, missed_deadlines=5, min_timeout=0.025, log_manager=log_manager)
+    tick_and_check(robot, control_loop, watchdog, 200)
+    stall = stall_until_trip(robot, control_loop, watchdog)
+    passed = stall is not None and 0.025 - 1e-9 <= stall < 0.025 + 2 * CHECK_STEP
+    print(f"4. 1000 Hz: 5 intervals are {5 * control_loop.interval * 1000:.0f} ms, tripped at the "
+          f"{watchdog.min_timeout * 1000:.0f} ms floor after {stall * 1000:.1f} ms {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 5. After the watchdog stop the motors only restart through the upright check
+    robot.plant.theta = math.radians(70.0)  # Fell while the loop was stalled, beyond the hard limit
+    control_loop.tilt_estimator.reset(robot.plant.angle)
+    for _ in range(500):
+        robot.update_sensors()
+        control_loop.tick(robot.get_time())
+        robot.plant.time += control_loop.interval
+    held = (control_loop.wait_until_correct_angle
+            and all(driver.get_command() == 0.0 for driver in (robot.driver_left, robot.driver_right)))
+    robot.plant.theta = 0.0  # Held upright until the estimate has settled
+    robot.plant.theta_rate = 0.0
+    control_loop.tilt_estimator.reset(robot.plant.angle)
+    tick_and_check(robot, control_loop, watchdog, 1000)
+    restarted = (not control_loop.wait_until_correct_angle and robot.driver_left.enable.value == 1
+                 and not robot.plant.fallen)
+    passed = held and restarted
+    print(f"5. Motors stay off while tilted past the limit, restart once upright {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 6. A watchdog stop while the loop thread is restarting the motors is not undone by the restart
+    robot, control_loop, log_manager = create_loop(rate=200)
+    motor_left_start = control_loop.motor_left.start
+    watchdog_thread = threading.Thread(target=control_loop.force_stop_motors)
+
+    def start_racing_the_watchdog():
+        motor_left_start()
+        watchdog_thread.start()
+        time.sleep(0.02)  # The watchdog thread runs in the middle of start_motors()
+    control_loop.motor_left.start = start_racing_the_watchdog
+    control_loop.tick(robot.get_time())  # Upright: the safety check restarts the motors
+    watchdog_thread.join()
+    passed = control_loop.wait_until_correct_angle and motors_forced_off(robot)
+    print(f"6. Watchdog stop during a restart: motors off, restart left to the upright check "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Yaw rate loop restart test on simulated hardware (no hardware needed)
+
+Holds the simulated robot past the tilt limit, so the motors are stopped,
+while a yaw rate is commanded that cannot be reached: the yaw PID keeps
+integrating gyro Z. Checks that the robot restarts with a torque
+differential of zero instead of the wound-up one, and that the yaw loop
+still follows a command afterwards.
+"""
+
+import math
+
+from src.config.configManager import global_config
+from src.log.logManager import LogManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+DT = 0.005
+
+
+def run_ticks(robot, control_loop, count):
+    for _ in range(count):
+        control_loop.tick(robot.get_time())
+        robot.step(DT)
+
+
+def main():
+    results = []
+    if not global_config.yaw_rate_control_enabled:
+        print("Yaw rate control is disabled in the configuration, nothing to test")
+        return
+
+    robot = SimulatedRobot()
+    control_loop = robot.create_control_loop(log_manager=LogManager(), rate=1 / DT)
+    pid_manager = control_loop.pid_manager
+    yaw_pid = pid_manager.pid_yaw_rate_to_torque_diff
+    control_loop.start_motors()
+    run_ticks(robot, control_loop, 200)
+
+    # 1. Stopped past the hard limit with a turn commanded: the yaw PID winds up to its limit
+    robot.plant.theta = math.radians(70.0)
+    control_loop.tilt_estimator.reset(robot.plant.angle)
+    pid_manager.setTargetTorqueDifferenital(1.0)
+    for _ in range(int(2.0 / DT)):
+        robot.plant.theta = math.radians(70.0)  # Lying on the ground, the wheels do not turn
+        robot.plant.theta_rate = 0.0
+        robot.update_sensors()
+        control_loop.tick(robot.get_time())
+        robot.plant.time += DT
+    wound_up = pid_manager.torque_differential
+    stopped = control_loop.wait_until_correct_angle and robot.driver_left.get_command() == 0.0
+    passed = stopped and abs(wound_up) >= 0.99 * global_config.torque_differential_limit
+    print(f"1. Motors stopped for 2 s with a turn commanded: torque differential {wound_up:+.3f} "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 2. Set upright with the command released: the restart begins from zero, not the wound-up value
+    pid_manager.setTargetTorqueDifferenital(0.0)
+    robot.plant.theta = 0.0
+    control_loop.tilt_estimator.reset(0.0)
+    robot.update_sensors()
+    control_loop.tick(robot.get_time())
+    restarted = not control_loop.wait_until_correct_angle
+    after_restart = pid_manager.torque_differential
+    passed = restarted and abs(after_restart) < 0.01 * global_config.torque_differential_limit
+    print(f"2. Restarted with torque differential {after_restart:+.4f} {'✓' if passed else '✗'}")
+    results.append(passed)
+
+    # 3. The yaw loop still closes on gyro Z after the restart
+    pid_manager.setTargetTorqueDifferenital(0.3)
+    run_ticks(robot, control_loop, int(3.0 / DT))
+    target = yaw_pid.target_yaw_rate
+    passed = not robot.plant.fallen and abs(robot.plant.yaw_rate - target) < 0.2 * target
+    print(f"3. Turning at {robot.plant.yaw_rate:.1f} °/s for a {target:.1f} °/s command "
+          f"{'✓' if passed else '✗'}")
+    results.append(passed)
+
+    print("\nALL PASSED" if all(results) else "\nSOME TESTS FAILED")
+
+
+if __name__ == "__main__":
+    main()
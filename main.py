@@ -1,183 +1,141 @@
 import threading
-import time
 import tkinter as tk
 
 from src.config.configManager import global_config
 from src.pid.pidManager import pidManager
 from src.log.logManager import global_log_manager
+from src.log.logExporter import LogExporter
 from src.hardware.imu import IMU
-from src.hardware.motorController import MotorController
+from src.hardware.i2cBus import get_i2c_bus
+from src.hardware.motorController import create_motor_pair
 from src.hardware.motorEncoder import MotorEncoder
-
-# === Shared Variables for GUI ===
-latest_angle = 0.0
-latest_torque = 0.0
-latest_left_position = 0.0
-latest_right_position = 0.0
-latest_left_travel = 0.0
-latest_right_travel = 0.0
-
-def get_latest_state():
-    return (latest_angle, latest_torque, latest_left_position, latest_right_position, 
-            latest_left_travel, latest_right_travel)
+from src.hardware.currentSensor import CurrentSensor
+from src.estimation.tiltEstimator import create_tilt_estimator
+from src.estimation.odometry import Odometry
+from src.pid.currentLoop import CurrentLoop
+from src.control.controlLoop import ControlLoop
+from src.control.lqrController import create_state_feedback
+from src.control.rateSelector import run_self_test
+from src.control.stageProfiler import StageProfiler
+from src.control.watchdog import Watchdog
+from src.telemetry.telemetryBuffer import TelemetryBuffer
+from src.telemetry.telemetryPublisher import TelemetryPublisher
+from src.user_input.remoteControl import RemoteControlServer
 
 # === Initialization ===
+# Streams every log entry to rotating files in the background for post-mortem analysis
+log_exporter = None
+if global_config.log_export_enabled:
+    log_exporter = LogExporter()
+    log_exporter.start()
 global_log_manager.log_info("Initializing components", location="main")
 
 # Use simulator if test mode is on
 
 imu = IMU()
-motor_left = MotorController(is_left=True)
-motor_right = MotorController(is_left=False)
-
-# === TEMPORARILY DISABLED FOR TIMING TEST ===
-# Initialize encoders for position tracking
-# encoder_left = MotorEncoder(is_left=True)
-# encoder_right = MotorEncoder(is_left=False)
-
-# Reset travel distance counters
-# encoder_left.reset_travel_distance()
-# encoder_right.reset_travel_distance()
+# With a restored profile the sensor is usable at once, but reports low levels until it is moved: only wait briefly.
+# Without one this waits for calibration motion
+calibration_timeout = (global_config.imu_restored_calibration_timeout if imu.calibration_restored
+                       else global_config.imu_calibration_timeout)
+if imu.wait_until_calibrated(timeout=calibration_timeout):
+    # Saved right away, before balancing starts: saving leaves fusion mode for a moment
+    if not imu.calibration_restored and imu.save_calibration():
+        global_log_manager.log_info("IMU calibration saved", location="main")
+elif not imu.calibration_restored:
+    global_log_manager.log_warning(
+        f"IMU not calibrated after {calibration_timeout}s: {imu.get_calibration_status()}",
+        location="main"
+    )
+
+# Replaces the configured mounting offset; the robot must be held upright during the measurement
+if global_config.imu_measure_mounting_offset:
+    global_log_manager.log_info("Measuring the IMU mounting offset, hold the robot upright", location="main")
+    offset = imu.measure_mounting_offset()
+    imu.save_mounting_offset()
+    global_log_manager.log_info(f"IMU mounting offset {offset:.2f}° measured and saved", location="main")
+
+# Current ADCs share the IMU's bus manager and only sample between IMU reads
+current_sensor = None
+if global_config.current_sensor_enabled or global_config.current_loop_enabled:
+    current_sensor = CurrentSensor(bus_idle=imu.freshness.get_bus_idle_time)
+
+motor_left, motor_right = create_motor_pair()
+global_log_manager.log_info(
+    f"Motor PWM ready after {motor_left.time_to_ready * 1000:.1f} ms (left), "
+    f"{motor_right.time_to_ready * 1000:.1f} ms (right)",
+    location="main"
+)
+
+# The inner current loop samples the ADCs itself; otherwise they are sampled in the background
+current_loop = None
+if global_config.current_loop_enabled:
+    current_loop = CurrentLoop(motor_left, motor_right, current_sensor)
+    current_loop.start()
+elif current_sensor is not None:
+    current_sensor.start()
+
+# Encoders for position tracking and odometry (disabled by default while checking loop timing)
+encoder_left = encoder_right = None
+if global_config.encoders_enabled:
+    encoder_left = MotorEncoder(is_left=True)
+    encoder_right = MotorEncoder(is_left=False)
+
+    # Reset travel distance counters
+    encoder_left.reset_travel_distance()
+    encoder_right.reset_travel_distance()
+odometry = Odometry()
 
 pid_manager = pidManager()
 
-wait_until_correct_angle = True
-
-# === Control Loop ===
-LOG_INTERVAL = 0.25
-last_log_time = time.time()
-RUNNING = True
-last_tilt_to_torque_time = 0
-
-# === Timing optimization for encoder reads ===
-# With 40Hz main loop, read encoders at 20Hz (every 2nd iteration)
-# This minimizes I2C traffic while maintaining adequate position tracking
-ENCODER_READ_RATE = 20  # Hz - Final conservative approach
-encoder_read_interval = 1.0 / ENCODER_READ_RATE
-last_encoder_read_time = 0
-
-def control_loop():
-    global last_log_time, last_tilt_to_torque_time, last_encoder_read_time
-    global latest_angle, latest_torque
-    global latest_left_position, latest_right_position, latest_left_travel, latest_right_travel
-    global wait_until_correct_angle
-
-    start_time = time.time()
-    target_torque = 0.0  # ensure it's initialized
-
-    motor_left.start()
-    motor_right.start()
-
-    while RUNNING:
-        current_time = time.time()        
-        
-        # === Sensor readings ===
-        raw_imu_reading = imu.read_pitch_raw()  # For debugging
-        estimated_tilt_angle = imu.read_pitch()        # === Encoder readings (TEMPORARILY DISABLED) ===
-        # Only read encoders at 20Hz instead of 40Hz to improve timing
-        # This is sufficient for position tracking while maintaining stability
-        if current_time - last_encoder_read_time >= encoder_read_interval:
-            # left_position = encoder_left.get_steps()
-            # right_position = encoder_right.get_steps()
-            # left_travel = encoder_left.update_travel_distance()
-            # right_travel = encoder_right.update_travel_distance()
-            
-            # Update shared values for GUI (set to dummy values)
-            latest_left_position = 0
-            latest_right_position = 0
-            latest_left_travel = 0
-            latest_right_travel = 0
-            
-            last_encoder_read_time = current_time
-
-        # === Safety check ===:
-        abs_angle = abs(estimated_tilt_angle)
-
-        if abs_angle > global_config.angle_limit:
-            # HARD LIMIT: stop everything
-            global_log_manager.log_critical(
-                f"Angle exceeded hard limit: {estimated_tilt_angle:.2f}. Stopping motors.",
-                location="safety"
-            )
-            motor_left.stop()
-            motor_right.stop()
-            wait_until_correct_angle = True
-
-        elif abs_angle > global_config.tilt_angle_soft_limit:
-            # SOFT LIMIT: still running, but set target angle to 0
-            if pid_manager.pid_tilt_angle_to_torque.target_angle != global_config.angle_neutral:
-                global_log_manager.log_warning(
-                    f"Angle exceeded soft limit: {estimated_tilt_angle:.2f}. PID target set to 0.",
-                    location="safety"
-                )
-            pid_manager.pid_tilt_angle_to_torque.target_angle = global_config.angle_neutral
-
-        else:
-            # Within safe range
-            if wait_until_correct_angle:
-                motor_left.start()
-                motor_right.start()
-                wait_until_correct_angle = False
-            
-            # Reset PID target angle to normal if it was set to neutral before
-            if pid_manager.pid_tilt_angle_to_torque.target_angle == global_config.angle_neutral:
-                pid_manager.update_pid_target()  # Restore proper target angle
-
-
-        # === Control loops ===
-        target_torque = pid_manager.pid_tilt_angle_to_torque.update(estimated_tilt_angle)
-        target_torque_left  = clip(target_torque - pid_manager.torque_differential, -1.0, 1.0)
-        target_torque_right = clip(target_torque + pid_manager.torque_differential, -1.0, 1.0)
-        
-        # === Motor Commands ===
-        motor_left.set_speed(target_torque_left)
-        motor_right.set_speed(target_torque_right)
-
-        # === Update shared values for GUI ===
-        latest_angle = estimated_tilt_angle
-        latest_torque = target_torque
-        # Encoder values updated above at 1kHz rate
-
-        # === Logging ===
-        if current_time - last_log_time >= LOG_INTERVAL:
-            global_log_manager.log_debug(
-                f"raw_imu={raw_imu_reading:.2f}  "
-                f"corrected={estimated_tilt_angle:.2f}  "
-                f"offset={global_config.imu_mounting_offset:.2f}  "
-                f"set={pid_manager.pid_tilt_angle_to_torque.target_angle:.2f}  "
-                f"tgtT={target_torque:.2f}  "
-                f"encL={latest_left_position:.0f}  "
-                f"encR={latest_right_position:.0f}  "
-                f"travL={latest_left_travel:.0f}  "
-                f"travR={latest_right_travel:.0f}  ",
-                location="debug"            )
-            last_log_time = current_time
-
-        time.sleep(global_config.main_loop_interval)
-
-    motor_left.stop()
-    motor_right.stop()
-    global_log_manager.log_info("Control loop exited", location="main")
-    
-def clip(value, min_val, max_val):
-    return max(min(value, max_val), min_val)
+# Measure the control stages on this hardware and pick the loop rate and stage decimation from them
+loop_rate = decimation = None
+if global_config.control_rate_autoselect:
+    rate_decision = run_self_test(imu, motor_left, motor_right, pid_manager, encoder_left, encoder_right)
+    loop_rate = rate_decision.rate
+    decimation = rate_decision.decimation
+
+# LQR gains depend on the loop interval, so they are computed once the rate is known (None: tilt PID)
+state_feedback = create_state_feedback(1.0 / loop_rate if loop_rate else global_config.main_loop_interval)
+
+# Lets RobotGui run on a laptop (python -m src.user_input.remoteControl --host <robot>)
+remote_control_server = None
+if global_config.remote_control_enabled:
+    remote_control_server = RemoteControlServer(pid_manager)
+    remote_control_server.start()
+tilt_estimator = create_tilt_estimator()
+telemetry = TelemetryBuffer(global_config.telemetry_buffer_size)
+telemetry_publisher = None
+if global_config.telemetry_enabled:
+    telemetry_publisher = TelemetryPublisher(telemetry)
+    telemetry_publisher.start()
+
+profiler = StageProfiler(ControlLoop.STAGES) if global_config.control_profiling_enabled else None
+control_loop = ControlLoop(
+    imu, tilt_estimator, pid_manager, motor_left, motor_right, telemetry,
+    current_sensor=current_sensor, current_loop=current_loop, rate=loop_rate, profiler=profiler,
+    encoder_left=encoder_left, encoder_right=encoder_right, odometry=odometry, decimation=decimation,
+    state_feedback=state_feedback
+)
+# Forces the motors off if the control loop stops ticking
+watchdog = Watchdog(control_loop) if global_config.watchdog_enabled else None
 
 # === Shutdown Handler ===
 def shutdown():
-    global RUNNING
-    RUNNING = False
+    control_loop.stop()
     global_log_manager.log_warning("Shutdown initiated by KeyboardInterrupt", location="main")
 
 if __name__ == "__main__":
     try:
         global_log_manager.log_info("Starting motors", location="main")
 
-        loop_thread = threading.Thread(target=control_loop, daemon=True)
+        loop_thread = threading.Thread(target=control_loop.run, daemon=True)
         loop_thread.start()
+        if watchdog is not None:
+            watchdog.start()
 
         from src.user_input.RobotGui import RobotGui
         root = tk.Tk()
-        gui = RobotGui(root, pid_manager, get_latest_state)
+        gui = RobotGui(root, pid_manager, control_loop.get_latest_state, telemetry)
         root.mainloop()
 
     except KeyboardInterrupt:
@@ -186,8 +144,30 @@ if __name__ == "__main__":
     finally:
         # Always stop motors and join thread safely
         global_log_manager.log_info("Final cleanup: stopping motors", location="main")
-        RUNNING = False
-        motor_left.stop()
-        motor_right.stop()
+        control_loop.stop()
+        control_loop.stop_motors()
         loop_thread.join()
+        if watchdog is not None:
+            watchdog.stop()
+        if current_loop is not None:
+            current_loop.stop()
+        if current_sensor is not None:
+            current_sensor.stop()
+        if telemetry_publisher is not None:
+            telemetry_publisher.stop()
+        if remote_control_server is not None:
+            remote_control_server.stop()
+        for encoder in (encoder_left, encoder_right):
+            if encoder is not None:
+                encoder.close()
+        global_log_manager.log_info(get_i2c_bus().format_stats(), location="i2c")
+        # Keep the calibration the sensor reached during this run for the next startup (it may have improved since)
+        # The bus may be what failed: an error here must not cost the queued log entries below
+        try:
+            if imu.save_calibration():
+                global_log_manager.log_info("IMU calibration saved", location="main")
+        except OSError as e:
+            global_log_manager.log_warning(f"IMU calibration not saved: {e}", location="main")
         global_log_manager.log_info("Shutdown complete", location="main")
+        if log_exporter is not None:
+            log_exporter.stop()
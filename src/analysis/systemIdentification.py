@@ -0,0 +1,281 @@
+"""
+System identification of the inverted pendulum plant from recorded telemetry.
+
+Fits the parameters of InvertedPendulumPlant (body inertia, rotational
+damping, motor torque gain and deadband) to the tilt response to
+the recorded torque commands, and writes them to the parameter file the
+simulator loads (global_config.simulation_plant_file).
+
+    python -m src.telemetry.telemetryReceiver --record session.csv
+    python -m src.analysis.systemIdentification session.csv
+
+Record with disturbances (pushes, a changing target angle): a robot that
+stands perfectly still carries no information about its dynamics.
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from src.analysis.telemetryAnalysis import load_telemetry
+from src.config.configManager import global_config
+from src.simulation.plantModel import load_plant_parameters, save_plant_parameters
+
+CHUNK_SAMPLES = 65536  # Samples per batch of the normal equations
+
+
+def _smooth(signal, window):
+    """
+    Centred moving average over the last axis (window rounded up to odd).
+    The window / 2 samples at either end average in zeros and are masked by the caller.
+    """
+    if window <= 1:
+        return signal
+    half = window // 2
+    window = 2 * half + 1
+    padding = [(0, 0)] * (np.ndim(signal) - 1) + [(half + 1, half)]
+    sums = np.cumsum(np.pad(signal, padding), axis=-1)
+    return (sums[..., window:] - sums[..., :-window]) / window
+
+
+def _second_derivative(signal, t):
+    """Three-point second difference (the narrowest stencil, matching the command alignment)"""
+    slopes = np.diff(signal) / np.diff(t)
+    result = np.zeros_like(signal)
+    result[1:-1] = (slopes[1:] - slopes[:-1]) / (0.5 * (t[2:] - t[:-2]))
+    return result
+
+
+def motor_duty(torque, lut_deadband=None):
+    """
+    Signed duty MotorController.set_speed() outputs for a torque command:
+    non-zero commands skip the lookup table's deadband (see build_duty_lookup).
+    """
+    lut_deadband = global_config.motor_deadband if lut_deadband is None else lut_deadband
+    magnitude = np.minimum(lut_deadband + (1.0 - lut_deadband) * np.abs(torque), 1.0)
+    return np.where(torque == 0.0, 0.0, np.sign(torque) * magnitude)
+
+
+def _effective_command(duty, deadbands):
+    """
+    Sum of both motors' commands beyond each candidate deadband: (deadbands, samples).
+
+    A command recorded at tick k acts until tick k + 1, while the second
+    difference of the angle at k spans ticks k - 1 to k + 1, so each sample
+    is averaged with the previous one to line the two up.
+    """
+    beyond = np.maximum(np.abs(duty)[np.newaxis, :] - deadbands[:, np.newaxis], 0.0)
+    command = 2.0 * np.sign(duty)[np.newaxis, :] * beyond
+    command[:, 1:] = 0.5 * (command[:, 1:] + command[:, :-1])
+    return command
+
+
+def _tilt_regressors(theta, theta_rate, command, lever_ratio):
+    """
+    Columns of theta'' = a sin(theta) - b (r cos(theta) + 1) u - c theta'
+
+    with u the summed motor command beyond the deadband, for each deadband
+    candidate (first axis of command), and r = l / Rr. From the plant model:
+    a = m g l / I, b = K / I, c = damping / I, I = J_B + m l^2.
+    """
+    candidates, samples = command.shape
+    columns = np.empty((candidates, samples, 3))
+    columns[:, :, 0] = np.sin(theta)
+    columns[:, :, 1] = -(lever_ratio * np.cos(theta) + 1.0) * command
+    columns[:, :, 2] = -theta_rate
+    return columns
+
+
+def fit_deadband(theta, theta_rate, theta_acceleration, duty, valid, deadbands, smoothing, lever_ratio):
+    """
+    Batched least squares over deadband candidates: (coefficients, squared
+    error) per candidate, using the samples where valid is set.
+
+    The deadband is a nonlinearity, so it is applied to the duty before the
+    command is smoothed like the angle. Regressors of every candidate are
+    built for one chunk of samples at a time (with a margin for the
+    smoothing) and their normal equations accumulated, so memory stays
+    bounded on long recordings; all candidates are then solved in one call.
+    """
+    count = len(deadbands)
+    gram = np.zeros((count, 3, 3))
+    moment = np.zeros((count, 3))
+    target_energy = 0.0
+    margin = smoothing // 2 + 1
+    for start in range(0, len(theta), CHUNK_SAMPLES):
+        stop = min(start + CHUNK_SAMPLES, len(theta))
+        rows = valid[start:stop]
+        if not rows.any():
+            continue
+        low = max(0, start - margin)
+        command = _smooth(_effective_command(duty[low:stop + margin], deadbands), smoothing)
+        command = command[:, start - low:stop - low][:, rows]
+        columns = _tilt_regressors(theta[start:stop][rows], theta_rate[start:stop][rows], command, lever_ratio)
+        target = theta_acceleration[start:stop][rows]
+        gram += np.einsum("kni,knj->kij", columns, columns)
+        moment += np.einsum("kni,n->ki", columns, target)
+        target_energy += float(np.dot(target, target))
+
+    # Pseudo-inverse: a deadband above every recorded command leaves its command column all zero
+    coefficients = (np.linalg.pinv(gram) @ moment[:, :, np.newaxis])[:, :, 0]
+    errors = (target_energy - 2.0 * np.einsum("ki,ki->k", coefficients, moment)
+              + np.einsum("ki,kij,kj->k", coefficients, gram, coefficients))
+    return coefficients, errors
+
+
+def _search_deadband(theta, theta_rate, theta_acceleration, duty, valid, candidates, smoothing, lever_ratio):
+    """Best (deadband, coefficients, squared error): coarse candidates, then a finer grid around the best"""
+    coefficients, errors = fit_deadband(theta, theta_rate, theta_acceleration, duty, valid, candidates,
+                                        smoothing, lever_ratio)
+    best = int(np.argmin(errors))
+    if len(candidates) > 1:
+        step = candidates[1] - candidates[0]
+        candidates = np.clip(np.linspace(candidates[best] - step, candidates[best] + step, 21), 0.0, None)
+        coefficients, errors = fit_deadband(theta, theta_rate, theta_acceleration, duty, valid, candidates,
+                                            smoothing, lever_ratio)
+        best = int(np.argmin(errors))
+    return float(candidates[best]), coefficients[best], float(errors[best])
+
+
+class PlantIdentification:
+    """Parameters fitted by identify_plant() and how well they explain the recording"""
+
+    def __init__(self, parameters, tilt_r2, samples, wheel_r2=None):
+        self.parameters = parameters  # InvertedPendulumPlant parameters, fitted and assumed
+        self.tilt_r2 = tilt_r2        # Fraction of the tilt acceleration variance explained
+        self.samples = samples
+        self.wheel_r2 = wheel_r2      # Same for the wheel acceleration, None without encoder data
+
+    def format(self) -> str:
+        p = self.parameters
+        gain_source = "wheel acceleration" if self.wheel_r2 is not None else "tilt fit, no encoder data"
+        lines = [
+            f"{self.samples} samples, tilt fit R² = {self.tilt_r2:.3f}"
+            + (f", wheel fit R² = {self.wheel_r2:.3f}" if self.wheel_r2 is not None else ""),
+            f"J_B = {p['J_B']:.5f} kg m², rate_damping = {p['rate_damping']:.5f} N m s/rad "
+            f"(m = {p['m']} kg, ell = {p['ell']} m assumed)",
+            f"max_wheel_torque = {p['max_wheel_torque']:.4f} N m ({gain_source}), "
+            f"motor_deadband = {p['motor_deadband']:.3f}",
+        ]
+        return "\n".join(lines)
+
+
+def identify_plant(telemetry, base_parameters=None, lut_deadband=None, smoothing=None,
+                   deadband_candidates=None) -> PlantIdentification:
+    """
+    Fit the plant to telemetry given as {field: array} (see load_telemetry).
+
+    Tilt rate and acceleration are differentiated from the smoothed angle,
+    the torque commands smoothed the same way so both sides of the fit see
+    the same filter. The tilt dynamics only determine the parameters
+    relative to the body inertia, and the lever arm only through ell / I, so
+    the mass m (weigh the robot), the lever arm ell (balance the robot on an
+    edge), g and the wheel radius are taken from base_parameters (default:
+    load_plant_parameters()). With wheel encoder data the motor gain comes
+    from the wheel acceleration, otherwise from the tilt fit.
+    """
+    p = dict(base_parameters if base_parameters is not None else load_plant_parameters())
+    smoothing = smoothing or global_config.sysid_smoothing_samples
+    if deadband_candidates is None:
+        deadband_candidates = np.arange(0.0, global_config.sysid_max_deadband + 1e-9, 0.01)
+    candidates = np.asarray(deadband_candidates, dtype=np.float64)
+
+    t = telemetry["time"]
+    theta = np.radians(_smooth(telemetry["angle"], smoothing))
+    theta_rate = np.gradient(theta, t)
+    theta_acceleration = _second_derivative(theta, t)
+    duty = motor_duty(telemetry["torque"], lut_deadband)
+
+    # Drop the filter edges, gaps in the recording and samples with the motors off or the robot down
+    period = np.median(np.diff(t))
+    gaps = np.abs(np.diff(t) - period) > 0.5 * period
+    valid = np.abs(telemetry["angle"]) < global_config.tilt_angle_soft_limit
+    valid[1:] &= ~gaps
+    valid[:-1] &= ~gaps
+    valid = np.convolve(valid, np.ones(2 * smoothing + 1), mode="same") >= 2 * smoothing + 1  # Whole window valid
+    valid[:smoothing + 2] = False
+    valid[-smoothing - 2:] = False
+    if np.count_nonzero(valid) < 10 * smoothing:
+        raise ValueError("Not enough usable telemetry for identification")
+
+    m, g, radius, ell = p["m"], p["g"], p["Rr"], p["ell"]
+    deadband, (a, b, c), error = _search_deadband(theta, theta_rate, theta_acceleration, duty, valid,
+                                                  candidates, smoothing, ell / radius)
+    if a <= 0 or b <= 0:
+        raise ValueError(f"Fit is not physical (a = {a:.3g}, b = {b:.3g}); record with more excitation")
+    inertia = m * g * ell / a
+    gain = b * inertia
+
+    # The wheels accelerate with K / (m Rr) regardless of the body, a better conditioned motor gain
+    wheel_r2 = None
+    if np.any(telemetry["left_position"]) or np.any(telemetry["right_position"]):
+        wheel_smoothing = max(smoothing, int(round(global_config.sysid_wheel_smoothing / period)))
+        gain, wheel_r2 = _wheel_gain(telemetry, t, duty, valid, deadband, wheel_smoothing, m, radius)
+
+    target = theta_acceleration[valid]
+    tilt_r2 = 1.0 - error / float(np.sum((target - target.mean()) ** 2))
+    p.update(
+        J_B=float(inertia - m * ell ** 2),
+        max_wheel_torque=float(gain),
+        rate_damping=float(max(c * inertia, 0.0)),  # A small damping can come out slightly negative
+        motor_deadband=deadband,
+    )
+    if p["J_B"] <= 0 or gain <= 0:
+        raise ValueError(f"Fit is not physical (J_B = {p['J_B']:.3g}, max_wheel_torque = {gain:.3g}); "
+                         f"record with more excitation")
+    return PlantIdentification(p, float(tilt_r2), int(np.count_nonzero(valid)), wheel_r2)
+
+
+def _wheel_gain(telemetry, t, duty, valid, deadband, smoothing, m, radius):
+    """
+    Motor gain K and R² from the wheel acceleration, x'' = K u / (m Rr).
+
+    The encoders are read slower than the loop runs, so the held position
+    and the command both go through two moving averages spanning several reads.
+    """
+    meters_per_step = 2 * math.pi * radius / global_config.encoder_steps_per_revolution
+    position = 0.5 * (telemetry["left_position"] + telemetry["right_position"]) * meters_per_step
+    position = _smooth(_smooth(position, smoothing), smoothing)
+    command = _effective_command(duty, np.array([deadband]))[0]
+    command = _smooth(_smooth(command, smoothing), smoothing)
+    valid = np.convolve(valid, np.ones(2 * smoothing + 1), mode="same") >= 2 * smoothing + 1
+    if not valid.any():
+        raise ValueError("Not enough usable encoder data for identification")
+
+    # The held position lags the motion: use the command delay (up to half the smoothing window)
+    # that explains the wheel acceleration best
+    acceleration = _second_derivative(position, t)
+    rows = np.flatnonzero(valid)
+    rows = rows[rows >= smoothing // 2]
+    target = acceleration[rows]
+    best_error, best_slope = math.inf, 0.0
+    for delay in range(smoothing // 2 + 1):
+        delayed = command[rows - delay]
+        slope = float(np.dot(delayed, target)) / max(float(np.dot(delayed, delayed)), 1e-12)
+        residual = target - slope * delayed
+        error = float(np.dot(residual, residual))
+        if error < best_error:
+            best_error, best_slope = error, slope
+    r2 = 1.0 - best_error / float(np.sum((target - target.mean()) ** 2))
+    return best_slope * m * radius, r2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the simulator's plant model to recorded telemetry")
+    parser.add_argument("recording", help="CSV recorded with python -m src.telemetry.telemetryReceiver --record")
+    parser.add_argument("--output", default=global_config.simulation_plant_file, help="plant parameter file to write")
+    parser.add_argument("--mass", type=float, help="robot mass in kg (default: current plant parameters)")
+    args = parser.parse_args()
+
+    base_parameters = load_plant_parameters()
+    if args.mass:
+        base_parameters["m"] = args.mass
+    result = identify_plant(load_telemetry(args.recording), base_parameters)
+    print(result.format())
+    save_plant_parameters(result.parameters, args.output)
+    print(f"Written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
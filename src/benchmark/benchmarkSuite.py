@@ -0,0 +1,318 @@
+"""
+Hardware-free benchmarks of the control path.
+
+Every case runs the real drivers and control code on simulated hardware
+(src/simulation), so results are comparable between a laptop and the Pi and
+between commits. Results are reported in microseconds and can be saved as
+JSON and compared against a stored baseline; regressions exit with code 1.
+
+    python -m src.benchmark.benchmarkSuite                     # run and print
+    python -m src.benchmark.benchmarkSuite --save-baseline     # store benchmark_baseline.json
+    python -m src.benchmark.benchmarkSuite --baseline          # compare against it
+    python -m src.benchmark.benchmarkSuite --cases full_tick pid_update --output results.json
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import sys
+import time
+from array import array
+
+from src.config.configManager import global_config
+from src.control.controlLoop import ControlLoop
+from src.control.stageProfiler import StageProfiler
+from src.estimation.tiltEstimator import create_tilt_estimator
+from src.hardware.imu import BURST_LENGTH, IMU_ADDR, REG_GYRO_X_LSB
+from src.log.logManager import LogManager
+from src.simulation.simulatedHardware import SimulatedRobot
+
+WARMUP_ITERATIONS = 100
+METRICS = ("p50_us", "p99_us")  # Compared against the baseline
+
+
+# === Measurement ===
+
+def measure(func, iterations, before=None) -> array:
+    """Duration of each call of func in ns; before() runs untimed ahead of every call"""
+    for _ in range(WARMUP_ITERATIONS):
+        if before is not None:
+            before()
+        func()
+
+    samples = array("q", bytes(8 * iterations))
+    clock = time.perf_counter_ns
+    for i in range(iterations):
+        if before is not None:
+            before()
+        start = clock()
+        func()
+        samples[i] = clock() - start
+    return samples
+
+
+def summarize(samples_ns) -> dict:
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    return {
+        "iterations": count,
+        "mean_us": sum(ordered) / count / 1000,
+        "p50_us": ordered[count // 2] / 1000,
+        "p99_us": ordered[min(count - 1, int(count * 0.99))] / 1000,
+        "max_us": ordered[-1] / 1000,
+    }
+
+
+def _test_signal(count, amplitude):
+    """Slow sine with sign changes, so cached paths (e.g. the direction pin) are exercised realistically"""
+    return [amplitude * math.sin(2 * math.pi * i / count) for i in range(count)]
+
+
+# === Benchmark cases ===
+# Each takes the iteration count and returns the samples in ns
+
+def bench_imu_decode(iterations):
+    robot = SimulatedRobot()
+    imu = robot.create_imu()
+    robot.bus.set_imu_sample(3.5, -20.0, 5.0)
+    raw = bytes(robot.bus.read_i2c_block_data(IMU_ADDR, REG_GYRO_X_LSB, BURST_LENGTH))
+    return measure(lambda: imu._decode_burst(raw), iterations)
+
+
+def bench_imu_read(iterations):
+    robot = SimulatedRobot()
+    imu = robot.create_imu()
+    return measure(imu.read_burst, iterations)
+
+
+def bench_estimator(iterations):
+    estimator = create_tilt_estimator()
+    angles = _test_signal(100, 5.0)
+    state = [0]
+
+    def update():
+        i = state[0] = (state[0] + 1) % 100
+        estimator.update(angles[i], angles[i] * 4, 0.005)
+    return measure(update, iterations)
+
+
+def bench_pid_update(iterations):
+    robot = SimulatedRobot()
+    pid = robot.create_control_loop(log_manager=LogManager()).pid_manager.pid_tilt_angle_to_torque
+    angles = _test_signal(100, 5.0)
+    state = [0]
+
+    def advance():
+        state[0] = (state[0] + 1) % 100
+        robot.plant.time += 0.005  # simple_pid only updates once its sample time has passed
+
+    def update():
+        pid.update(angles[state[0]], angles[state[0]] * 4)
+    return measure(update, iterations, before=advance)
+
+
+def bench_lqr_update(iterations):
+    """State feedback counterpart of pid_update"""
+    robot = SimulatedRobot()
+    controller = robot.create_control_loop(log_manager=LogManager(), controller="lqr").state_feedback
+    angles = _test_signal(100, 5.0)
+    state = [0]
+
+    def update():
+        i = state[0] = (state[0] + 1) % 100
+        controller.update(angles[i], angles[i] * 4, angles[i] * 100, angles[i] * 400, 0.0)
+    return measure(update, iterations)
+
+
+def bench_yaw_pid_update(iterations):
+    robot = SimulatedRobot()
+    pid_manager = robot.create_control_loop(log_manager=LogManager()).pid_manager
+    pid_manager.setTargetTorqueDifferenital(0.3)
+    rates = _test_signal(100, 40.0)
+    state = [0]
+
+    def update():
+        i = state[0] = (state[0] + 1) % 100
+        pid_manager.update_torque_differential(rates[i], 0.01)
+    return measure(update, iterations)
+
+
+def bench_motor_command(iterations):
+    robot = SimulatedRobot()
+    motor_left, motor_right = robot.create_motors()
+    motor_left.start()
+    motor_right.start()
+    commands = _test_signal(100, 0.8)
+    state = [0]
+
+    def command():
+        i = state[0] = (state[0] + 1) % 100
+        motor_left.set_speed(commands[i])
+        motor_right.set_speed(commands[i])
+    return measure(command, iterations)
+
+
+def bench_logging(iterations):
+    log_manager = LogManager(print_to_console=False, debug_mode=True)
+    angle = 1.2345
+    return measure(lambda: log_manager.log_debug(f"corrected={angle:.2f}  tgtT={angle * 0.03:.2f}", location="debug"), iterations)
+
+
+def bench_full_tick(iterations, profiler=None, yaw_rate_control=True, controller="pid"):
+    """One control loop iteration including IMU poll, safety checks, PID, motor commands and telemetry"""
+    robot = SimulatedRobot()
+    loop = robot.create_control_loop(log_manager=LogManager(print_to_console=False, debug_mode=True), profiler=profiler,
+                                     controller=controller)
+    loop.pid_manager.yaw_rate_control_enabled = yaw_rate_control
+    loop.start_motors()
+    interval = loop.interval
+    state = [0.0]
+
+    def advance():
+        state[0] += interval
+        robot.step(interval)
+        if robot.plant.fallen:
+            robot.plant.reset()
+    return measure(lambda: loop.tick(state[0]), iterations, before=advance)
+
+
+def bench_open_loop_yaw_tick(iterations):
+    """full_tick with the yaw rate loop disabled, to show what it adds to the tick"""
+    return bench_full_tick(iterations, yaw_rate_control=False)
+
+
+def bench_lqr_tick(iterations):
+    """full_tick balancing with LQR state feedback instead of the tilt PID (encoders read every tick)"""
+    return bench_full_tick(iterations, controller="lqr")
+
+
+def bench_profiled_tick(iterations):
+    """full_tick with stage profiling enabled, to keep the instrumentation overhead visible"""
+    return bench_full_tick(iterations, StageProfiler(ControlLoop.STAGES, capacity=iterations + WARMUP_ITERATIONS))
+
+
+def bench_scheduler_jitter(iterations):
+    """Deviation of the real tick period from the configured interval, running ControlLoop.run()"""
+    robot = SimulatedRobot()
+    loop = robot.create_control_loop(log_manager=LogManager(print_to_console=False, debug_mode=True))
+    ticks = min(iterations, global_config.main_loop_rate * 5)  # Runs in real time: at most 5 s
+    tick_times = array("q", bytes(8 * ticks))
+    tick = loop.tick
+
+    def timed_tick(now):
+        tick_times[loop.ticks] = time.perf_counter_ns()
+        tick(now)
+    loop.tick = timed_tick
+    loop.run(max_ticks=ticks)
+
+    interval_ns = int(loop.interval * 1e9)
+    return array("q", (abs(tick_times[i] - tick_times[i - 1] - interval_ns) for i in range(1, ticks)))
+
+
+BENCHMARKS = {
+    "imu_decode": bench_imu_decode,
+    "imu_read": bench_imu_read,
+    "estimator": bench_estimator,
+    "pid_update": bench_pid_update,
+    "lqr_update": bench_lqr_update,
+    "yaw_pid_update": bench_yaw_pid_update,
+    "motor_command": bench_motor_command,
+    "logging": bench_logging,
+    "full_tick": bench_full_tick,
+    "open_loop_yaw_tick": bench_open_loop_yaw_tick,
+    "lqr_tick": bench_lqr_tick,
+    "profiled_tick": bench_profiled_tick,
+    "scheduler_jitter": bench_scheduler_jitter,
+}
+
+
+def run_benchmarks(names=None, iterations=None) -> dict:
+    iterations = iterations or global_config.benchmark_iterations
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "host": platform.node(),
+        "cases": {},
+    }
+    # The control code prints status messages; keep them out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name in names or BENCHMARKS:
+            results["cases"][name] = summarize(BENCHMARKS[name](iterations))
+    return results
+
+
+# === Baseline comparison ===
+
+def compare_to_baseline(results, baseline, threshold=None, min_delta_us=None) -> list:
+    """
+    Returns (case, metric, baseline, current) for every metric that got slower
+    by more than `threshold` (fraction) and more than `min_delta_us`.
+    """
+    threshold = global_config.benchmark_regression_threshold if threshold is None else threshold
+    min_delta_us = global_config.benchmark_min_regression_us if min_delta_us is None else min_delta_us
+
+    regressions = []
+    for name, current in results["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+        for metric in METRICS:
+            before, after = reference[metric], current[metric]
+            if after > before * (1 + threshold) and after - before > min_delta_us:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def format_results(results, baseline=None) -> str:
+    lines = [f"{'case':<18}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}   (us)"]
+    for name, r in results["cases"].items():
+        line = f"{name:<18}{r['mean_us']:>10.2f}{r['p50_us']:>10.2f}{r['p99_us']:>10.2f}{r['max_us']:>10.2f}"
+        reference = baseline["cases"].get(name) if baseline else None
+        if reference is not None and reference["p50_us"] > 0:
+            line += f"   p50 {r['p50_us'] / reference['p50_us'] - 1:+.0%} vs baseline"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the control path on simulated hardware")
+    parser.add_argument("--cases", nargs="+", choices=list(BENCHMARKS), help="Cases to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=global_config.benchmark_iterations)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", nargs="?", const=global_config.benchmark_baseline_file,
+                        help="Compare against a baseline JSON file (default: %(const)s)")
+    parser.add_argument("--save-baseline", nargs="?", const=global_config.benchmark_baseline_file,
+                        help="Store the results as the new baseline (default: %(const)s)")
+    parser.add_argument("--threshold", type=float, default=global_config.benchmark_regression_threshold,
+                        help="Allowed slowdown as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.cases, args.iterations)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {path}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for name, metric, before, after in regressions:
+            print(f"REGRESSION {name} {metric}: {before:.2f} -> {after:.2f} us")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
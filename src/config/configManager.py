@@ -7,6 +7,37 @@ class ConfigManager:
         # === IMU Calibration (CONSOLIDATED) ===
         # Angle IMU reads when robot is perfectly upright - used to correct mounting offset
         self.imu_mounting_offset = -6.7
+        # Stored BNO055 calibration profile (also holds a measured mounting offset)
+        self.imu_calibration_file = "imu_calibration.json"
+        # Minimum calibration levels (sys, gyro, accel, mag) before balancing; pitch needs gyro + accel
+        self.imu_required_calibration = (0, 3, 3, 0)
+        self.imu_calibration_timeout = 30.0  # s
+        self.imu_restored_calibration_timeout = 1.0  # s, wait at startup after a stored profile was restored
+        # Measure the mounting offset at startup (robot held upright) and store it with the calibration
+        self.imu_measure_mounting_offset = False
+        # Gyro Y sign so that a positive rate means pitch is increasing
+        self.imu_pitch_rate_sign = 1.0
+        # Gyro Z sign so that a positive yaw rate is the turn a positive torque differential causes
+        self.imu_yaw_rate_sign = 1.0
+
+        # === I2C error handling ===
+        self.i2c_timeout = 0.02                  # s, kernel adapter timeout so a hung bus returns an error
+        self.imu_read_retries = 2                # Extra attempts after a transient error, within one tick
+        self.imu_retry_budget = 0.001            # s per tick the retries may take
+        self.imu_max_consecutive_failures = 10   # Failed reads in a row before the motors are stopped
+
+        # === IMU sample freshness ===
+        # The fusion output only changes at 100 Hz: skip reads until a new sample is due
+        self.imu_skip_stale_samples = True
+        self.imu_sample_period = 0.01           # s
+        self.imu_sample_retry_interval = 0.001  # s, re-poll delay after an unchanged read
+
+        # === Tilt estimation ===
+        self.tilt_estimator = "complementary"   # "raw", "complementary" or "kalman"
+        self.complementary_filter_alpha = 0.98  # Weight of the integrated gyro rate
+        self.kalman_q_angle = 0.001
+        self.kalman_q_bias = 0.003
+        self.kalman_r_measure = 0.03
         
         self.torque_differential = 0.1
 
@@ -23,6 +54,7 @@ class ConfigManager:
         # Previous analysis showed IMU reads at 0.73ms average
         # Target: 200Hz (5ms interval) for stable balancing
         # This gives 7x safety margin over IMU read time
+        # Only used when control_rate_autoselect is off; otherwise the startup self-test picks the rate
         self.main_loop_rate = 200  # Test frequency without encoder interference
         self.main_loop_interval = 1 / self.main_loop_rate        # === Motion and angle settings ===
         self.base_velocity = 0.1
@@ -37,10 +69,142 @@ class ConfigManager:
         self.torque_limit = 1.0
         self.torque_differential_limit = 0.1
 
+        # === Yaw rate control (gyro Z -> torque differential) ===
+        # When disabled, the joystick X value sets the torque differential open-loop
+        self.yaw_rate_control_enabled = True
+        self.max_yaw_rate = 90.0  # °/s target yaw rate at full joystick deflection
+        self.yaw_rate_kp = 0.002  # Torque differential per °/s
+        self.yaw_rate_ki = 0.01
+        self.yaw_rate_kd = 0.0
+
+        # === Balance controller ===
+        # "pid": tilt PID (pidManager), "lqr": state feedback on tilt and wheel position/velocity
+        # (src/control/lqrController.py, gains from the plant parameter file at startup; needs the encoders)
+        self.controller_type = "pid"
+        self.lqr_state_weights = (1.0, 0.0, 1.0, 0.0)  # Q: tilt (rad), tilt rate (rad/s), wheel position (m), velocity (m/s)
+        self.lqr_command_weight = 10.0                 # R: torque command of both motors
+        self.lqr_speed_per_degree = 0.03               # m/s wheel speed target per ° of drive target angle
+
+        # === Motor output ===
+        self.motor_pwm_frequency = 50000            # Hz
+        self.pwm_ready_timeout = 2.0                # s to wait for an exported PWM channel to become writable
+        self.pwm_ready_initial_backoff = 0.001      # s, first retry delay, doubled per attempt
+        self.pwm_ready_max_backoff = 0.05           # s
+        self.motor_lut_resolution = 1000            # Lookup entries per unit of torque command
+        self.motor_deadband = 0.0                   # Command fraction needed before the wheels move
+        self.motor_nominal_voltage = 12.0           # V, supply voltage the gains were tuned at
+        self.motor_voltage_rebuild_threshold = 0.1  # V change before the duty lookup is rebuilt
+
+        # === Motor current sensing (MCP3021 ADCs on the IMU's I2C bus) ===
+        self.current_sensor_enabled = True
+        self.current_sample_rate = 200              # Hz per channel
+        self.current_sensor_amps_per_count = 0.01   # A per ADC count, calibrate against a meter
+        self.current_sensor_zero_count = 0          # ADC reading at zero current
+        self.current_filter_alpha = 0.2             # Low-pass weight of a new sample
+        self.current_limit = 3.0                    # A, filtered current that triggers a stop
+        self.overcurrent_cooldown = 1.0             # s motors stay off after an overcurrent stop
+        self.i2c_guard_time = 0.0005                # s kept free before a due IMU read
+
+        # === Inner current loop (torque setpoint -> motor command) ===
+        # When enabled, the current loop thread samples the ADCs itself and drives the motors
+        self.current_loop_enabled = False
+        self.current_loop_rate = 1000               # Hz
+        self.current_loop_kp = 0.05                 # Command per A of current error
+        self.current_loop_ki = 20.0                 # Command per A*s
+        self.current_loop_amps_at_full_torque = 2.0 # Current setpoint for a torque command of 1.0
+        self.current_sign_left = 1.0                # Sensor sign so that positive current = positive torque
+        self.current_sign_right = 1.0
+
+        # === Encoders ===
+        self.encoders_enabled = False               # Disabled in main.py while checking loop timing
+        self.encoder_backend = "gpiozero"           # "gpiozero" or "chardev" (/dev/gpiochip line events)
+        self.encoder_gpio_chip = "/dev/gpiochip0"   # Pi 5 on older kernels: /dev/gpiochip4
+        self.encoder_max_steps = 0                  # gpiozero step limit, 0 = unbounded (was 256 * 21 / 2)
+
+        # === Odometry ===
+        self.wheel_radius = 20e-3                          # m (Rr in documentation/mobrob_init.m)
+        self.track_width = 0.15                            # m between the wheel contact points, measure on the robot
+        self.encoder_steps_per_revolution = 256 * 21       # Encoder steps per wheel revolution
+
+        # === Encoder velocity estimation ===
+        self.encoder_edge_buffer_size = 64      # Edge timestamps kept per encoder (power of two)
+        self.encoder_velocity_window = 8        # Edges averaged once the wheel turns fast
+        self.encoder_high_speed_period = 0.002  # Edge period (s) below which averaging is used
+        self.encoder_velocity_timeout = 0.25    # No edge for this long (s) = standstill
+
+        # === Telemetry and GUI plotting ===
+        self.telemetry_buffer_size = 8192   # Control ticks kept for plotting (~40 s at 200 Hz)
+        self.gui_plot_window = 10.0         # s of history shown in the live plot
+        self.gui_plot_interval_ms = 100     # Live plot refresh period
+
+        # === Remote telemetry (UDP) ===
+        self.telemetry_enabled = False
+        self.telemetry_host = "255.255.255.255"   # Receiver address, broadcast by default
+        self.telemetry_port = 5005
+        self.telemetry_rate = 50                  # Packets per second
+
+        # === Remote command channel (TCP) ===
+        self.remote_control_enabled = False
+        self.remote_control_host = "0.0.0.0"      # Interface the robot listens on
+        self.remote_control_port = 5006
+        self.remote_joystick_rate = 20            # Max joystick messages per second
+
+        # === Control loop deadlines and watchdog ===
+        self.control_near_miss_fraction = 0.2  # A tick leaving less than this fraction of the interval is a near miss
+        self.watchdog_enabled = True
+        self.watchdog_missed_deadlines = 5     # Ticks without a heartbeat before the motors are forced off
+        self.watchdog_min_timeout = 0.025      # s, floor of that timeout: several GIL switch intervals (5 ms)
+
+        # === Loop rate self-test ===
+        # At startup the stage latencies are measured on the robot and the highest candidate rate
+        # whose p99 tick time fits the budget is used instead of main_loop_rate
+        self.control_rate_autoselect = True
+        self.control_rate_candidates = (1000, 500, 400, 250, 200, 100)  # Hz
+        self.control_tick_budget_fraction = 0.5  # p99 tick time allowed as a fraction of the interval
+        self.control_rate_selftest_samples = 300  # Timed calls per stage
+        self.encoder_min_read_rate = 10          # Hz, slowest the encoder reads may be decimated to
+        self.yaw_rate_min_update_rate = 25       # Hz, slowest the yaw rate PID may be decimated to
+
+        # === Control loop profiling ===
+        # Per-stage tick timing; only costs time when enabled
+        self.control_profiling_enabled = False
+        self.control_profile_capacity = 10000                # Ticks kept for the statistics (~50 s at 200 Hz)
+        self.control_profile_file = "control_profile.folded"  # Flame graph input written at shutdown
+
+        # === Telemetry analysis (src/analysis) ===
+        self.analysis_disturbance_threshold = 3.0  # ° of tilt error that counts as a disturbance
+        self.analysis_settle_band = 1.0            # ° of tilt error considered settled
+        self.analysis_settle_hold = 0.5            # s the error must stay in the band to be settled
+        self.analysis_saturation_tolerance = 0.01  # Commands within this fraction of the limit are saturated
+
+        # === System identification (src/analysis/systemIdentification.py) ===
+        # Record with excitation on: a pseudo-random torque added to the tilt PID output
+        self.sysid_excitation_amplitude = 0.0  # Torque command, 0 = off (try ~0.05 while identifying)
+        self.sysid_excitation_hold_ticks = 20  # Ticks each value is held, long enough to tilt the body
+        self.sysid_smoothing_samples = 15      # Moving average over the angle before differentiating twice
+        self.sysid_max_deadband = 0.3          # Largest motor deadband searched
+        self.sysid_wheel_smoothing = 0.25      # s, moving average over the wheel position (encoders read at ~20 Hz)
+
+        # === Simulation and benchmarks ===
+        self.simulation_plant_file = "plant_parameters.json"  # Overrides the default plant model parameters
+        self.benchmark_iterations = 10000
+        self.benchmark_baseline_file = "benchmark_baseline.json"
+        self.benchmark_regression_threshold = 0.25  # Allowed p50/p99 slowdown against the baseline
+        self.benchmark_min_regression_us = 1.0      # Smaller slowdowns are treated as noise
+
+        # === Log export ===
+        # Log entries are streamed to rotating files for post-mortem analysis (python -m src.log.logExporter)
+        self.log_export_enabled = True
+        self.log_export_directory = "logs"
+        self.log_export_format = "csv"          # "csv" or "parquet" (needs pyarrow, not in requirements.txt)
+        self.log_export_rotate_entries = 100000 # Entries per file
+        self.log_export_flush_interval = 1.0    # s between writes of the queued entries
+
         # === Other ===
         self.angle_limit_time_delay = 1.0
         self.print_to_console = True
         self.debug_mode = True
+        self.log_max_entries = 10000  # Log entries kept in memory, the oldest are dropped first
         
         self.angle_move = 3
 
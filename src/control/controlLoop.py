@@ -0,0 +1,467 @@
+import random
+import threading
+import time
+import traceback
+from array import array
+
+from src.config.configManager import global_config
+from src.log.logManager import global_log_manager
+
+
+def clip(value, min_val, max_val):
+    if value > max_val:
+        return max_val
+    if value < min_val:
+        return min_val
+    return value
+
+
+def excitation_sequence(amplitude, hold_ticks, length=8192, seed=0) -> array:
+    """
+    Pseudo-random +-amplitude torque sequence, each value held for hold_ticks.
+
+    Added to the tilt PID output while recording for system identification:
+    without it the torque is a function of the measured tilt alone and the
+    plant cannot be told apart from the controller.
+    """
+    generator = random.Random(seed)
+    values = array("d")
+    while len(values) < length:
+        values.extend([amplitude if generator.random() < 0.5 else -amplitude] * hold_ticks)
+    return values[:length]
+
+
+class ControlLoop:
+    """
+    Balancing loop: IMU -> tilt estimate -> safety checks -> tilt PID -> motors.
+
+    With a state feedback controller (see src/control/lqrController.py) it
+    replaces the tilt PID and also uses the wheel position and velocity; the
+    tilt PID's target angle stays the drive command either way.
+
+    tick() runs one iteration for a given time, so the same code runs on the
+    robot via run() and against simulated hardware in the benchmarks. The
+    latest values are kept as attributes for the GUI (see get_latest_state).
+
+    Each tick runs the stages in STAGES order. With a StageProfiler the
+    instrumented tick is bound at construction instead, so the plain tick
+    carries no profiling checks at all.
+
+    In steady state a tick leaves no allocations behind: sensor reads fill
+    preallocated buffers, state is updated in place and telemetry goes into
+    a fixed ring. Strings are only built for the rate-limited debug line and
+    for safety events (see TEST_tick_allocations.py).
+    """
+
+    STAGES = ("imu", "encoders", "currents", "safety", "control", "motors", "telemetry", "logging")
+
+    LOG_INTERVAL = 0.25  # s between debug log lines
+
+    # === Timing optimization for encoder reads ===
+    # Read encoders at 20Hz; this minimizes I2C traffic while maintaining adequate position tracking
+    ENCODER_READ_RATE = 20  # Hz
+
+    def __init__(self, imu, tilt_estimator, pid_manager, motor_left, motor_right, telemetry,
+                 current_sensor=None, current_loop=None, log_manager=None, rate=None, profiler=None,
+                 encoder_left=None, encoder_right=None, odometry=None, decimation=None, state_feedback=None):
+        self.imu = imu
+        self.tilt_estimator = tilt_estimator
+        self.pid_manager = pid_manager
+        self.motor_left = motor_left
+        self.motor_right = motor_right
+        self.telemetry = telemetry
+        self.current_sensor = current_sensor
+        self.current_loop = current_loop
+        self.encoder_left = encoder_left
+        self.encoder_right = encoder_right
+        self.odometry = odometry
+        self.state_feedback = state_feedback
+        self.log_manager = log_manager if log_manager is not None else global_log_manager
+
+        self.interval = 1.0 / rate if rate else global_config.main_loop_interval
+        # {stage: run every n-th tick} from the rate self-test overrides the configured stage rates.
+        # Stages are scheduled by time, so half a tick of margin absorbs jitter
+        self.decimation = dict(decimation or {})
+        if "encoders" in self.decimation:
+            self.encoder_read_interval = (self.decimation["encoders"] - 0.5) * self.interval
+        elif state_feedback is not None:
+            self.encoder_read_interval = 0.5 * self.interval  # Every tick: a lagging wheel velocity destabilizes it
+        else:
+            self.encoder_read_interval = 1.0 / self.ENCODER_READ_RATE
+
+        # === Shared values for the GUI ===
+        self.angle = 0.0
+        self.torque = 0.0
+        self.left_position = 0.0
+        self.right_position = 0.0
+        self.left_travel = 0.0
+        self.right_travel = 0.0
+        self.wheel_position = 0.0  # steps, mean of both wheels
+        self.wheel_velocity = 0.0  # steps/s, between the last two encoder reads
+        self.current_left = 0.0
+        self.current_right = 0.0
+        self.torque_left = 0.0
+        self.torque_right = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+
+        # Set while the angle is predicted because IMU reads fail, with the age of the last good sample (s)
+        self.imu_fallback = False
+        self.imu_sample_age = 0.0
+        self._imu_failure_limit = global_config.imu_max_consecutive_failures
+        self._reset_estimator = False
+
+        self.wait_until_correct_angle = True
+        # Held while the loop restarts the motors and while the watchdog thread stops them
+        self._motor_state_lock = threading.Lock()
+        self.target_angle_overridden = False  # Soft limit forced the neutral target angle
+        self.overcurrent_time = 0.0
+        self.running = False
+        self.ticks = 0  # Also the heartbeat the watchdog checks
+
+        # Deadline statistics of run(): a near miss left less than the configured slack before the deadline
+        self.deadline_misses = 0
+        self.near_misses = 0
+        self.min_slack = float("inf")  # s
+        self._near_miss_slack = global_config.control_near_miss_fraction * self.interval
+
+        self._last_tick_time = None
+        self._imu_sample_fresh = False
+        self._last_yaw_update_time = 0.0
+        if "yaw_pid" in self.decimation:
+            self._yaw_update_interval = (self.decimation["yaw_pid"] - 0.5) * self.interval
+        else:
+            self._yaw_update_interval = global_config.angular_velocity_to_torque_diff_interval
+        self._last_log_time = 0.0
+        self._last_encoder_read_time = 0.0
+
+        # Identification excitation, replayed cyclically; None when disabled
+        self._excitation = None
+        self._excitation_index = 0
+        if global_config.sysid_excitation_amplitude:
+            self._excitation = excitation_sequence(global_config.sysid_excitation_amplitude,
+                                                   global_config.sysid_excitation_hold_ticks)
+
+        if state_feedback is not None and encoder_left is None:
+            self.log_manager.log_warning("State feedback without encoders: wheel position and velocity stay 0",
+                                         location="main")
+
+        # Profiling is decided here once: the instrumented tick replaces the plain one
+        self.profiler = profiler
+        if profiler is not None:
+            self.tick = self._profiled_tick
+
+    def get_latest_state(self):
+        return (self.angle, self.torque, self.left_position, self.right_position,
+                self.left_travel, self.right_travel, self.x, self.y, self.heading)
+
+    def start_motors(self):
+        if self.state_feedback is not None:
+            self.state_feedback.reset(self.wheel_position)  # Don't drive back to where the motors stopped
+        # Every stop (safety, overcurrent cooldown, watchdog) restarts here: drop the yaw PID's wound-up integral
+        self.pid_manager.reset_torque_differential()
+        self.motor_left.start()
+        self.motor_right.start()
+        if self.current_loop is not None:
+            self.current_loop.release()
+
+    def stop_motors(self):
+        if self.current_loop is not None:
+            self.current_loop.hold()
+        self.motor_left.stop()
+        self.motor_right.stop()
+
+    def force_stop_motors(self):
+        """
+        Failsafe for the watchdog thread: zero both motor outputs without
+        waiting for the loop. The loop restarts the motors through the
+        safety check once it ticks again.
+
+        The outputs are zeroed at once and again under the motor state lock
+        together with wait_until_correct_angle: a restart the loop thread was
+        in the middle of finishes first and is then undone, so the loop never
+        drives the motors again without passing the upright check.
+        """
+        self._zero_motor_outputs()
+        with self._motor_state_lock:
+            self.wait_until_correct_angle = True
+            self._zero_motor_outputs()
+
+    def _zero_motor_outputs(self):
+        if self.current_loop is not None:
+            self.current_loop.hold()
+        self.motor_left.force_zero()
+        self.motor_right.force_zero()
+
+    def stop(self):
+        """Ask run() to exit after the current tick"""
+        self.running = False
+
+    def run(self, max_ticks=None):
+        """Tick at the main loop rate until stop() (or max_ticks), on absolute deadlines so sleep errors don't accumulate"""
+        self.running = True
+        self.start_motors()
+
+        next_tick = time.perf_counter()
+        try:
+            while self.running:
+                self.tick(time.perf_counter())
+                if max_ticks is not None and self.ticks >= max_ticks:
+                    break
+
+                next_tick += self.interval
+                delay = next_tick - time.perf_counter()
+                if delay < self.min_slack:
+                    self.min_slack = delay
+                if delay > 0:
+                    if delay < self._near_miss_slack:
+                        self.near_misses += 1
+                    time.sleep(delay)
+                else:
+                    self.deadline_misses += 1
+                    next_tick = time.perf_counter()  # Don't try to catch up in a burst
+        except Exception:
+            # The loop runs in a daemon thread: without this an error would end it silently with the motors on
+            self.log_manager.log_critical(f"Control loop failed, stopping motors:\n{traceback.format_exc()}",
+                                          location="main")
+        finally:
+            self.running = False
+            self.stop_motors()
+
+        self.log_manager.log_info("Control loop exited", location="main")
+        self.log_manager.log_info(self.format_deadline_stats(), location="main")
+        self.log_manager.log_info(self.imu.format_error_stats(), location="main")
+        if self.profiler is not None:
+            self.log_manager.log_info(self.profiler.format_summary(), location="profile")
+            path = self.profiler.write_folded()
+            self.log_manager.log_info(f"Flame graph data written to {path}", location="profile")
+
+    def format_deadline_stats(self) -> str:
+        return (f"{self.ticks} ticks, {self.deadline_misses} missed deadlines, {self.near_misses} near misses, "
+                f"min slack {self.min_slack * 1000:.3f} ms of {self.interval * 1000:.3f} ms")
+
+    def tick(self, now: float):
+        """One loop iteration at time `now` (time.perf_counter() on the robot)"""
+        self.ticks += 1
+        self._read_imu(now)
+        self._read_encoders(now)
+        self._read_currents()
+        self._check_safety(now)
+        self._update_control(now)
+        self._command_motors()
+        self._record(now)
+        self._log(now)
+
+    def _profiled_tick(self, now: float):
+        """tick() with the duration of every stage written to the profiler's arrays"""
+        clock = time.perf_counter_ns
+        slot = self.profiler.next_slot()
+        imu, encoders, currents, safety, control, motors, telemetry, logging = self.profiler.samples
+
+        self.ticks += 1
+        t0 = clock()
+        self._read_imu(now)
+        t1 = clock()
+        imu[slot] = t1 - t0
+        self._read_encoders(now)
+        t0 = clock()
+        encoders[slot] = t0 - t1
+        self._read_currents()
+        t1 = clock()
+        currents[slot] = t1 - t0
+        self._check_safety(now)
+        t0 = clock()
+        safety[slot] = t0 - t1
+        self._update_control(now)
+        t1 = clock()
+        control[slot] = t1 - t0
+        self._command_motors()
+        t0 = clock()
+        motors[slot] = t0 - t1
+        self._record(now)
+        t1 = clock()
+        telemetry[slot] = t1 - t0
+        self._log(now)
+        logging[slot] = clock() - t1
+
+    # === Stages ===
+
+    def _read_imu(self, now: float):
+        # Pitch and gyro rates come from one burst read; pitch and gyro Y are fused by the estimator.
+        # The IMU is only read when a new fusion sample is due; in between the estimator predicts
+        imu = self.imu
+        if self._last_tick_time is None:
+            self._last_tick_time = now
+            self._last_yaw_update_time = now
+        self._imu_sample_fresh = imu.poll(now)
+        if self._imu_sample_fresh:
+            if self._reset_estimator:
+                # First sample after an IMU failure stop: the long prediction is worthless
+                self.tilt_estimator.reset(imu.pitch)
+                self._reset_estimator = False
+            self.angle = self.tilt_estimator.update(imu.pitch, imu.pitch_rate, now - self._last_tick_time)
+        else:
+            self.angle = self.tilt_estimator.predict(now - self._last_tick_time)
+        self._last_tick_time = now
+
+        # Failed reads leave the estimator predicting from the last good sample
+        if imu.consecutive_failures:
+            self.imu_fallback = True
+            self.imu_sample_age = imu.get_sample_age(now)
+        elif self.imu_fallback:
+            self.imu_fallback = False
+            self.imu_sample_age = 0.0
+
+    def _read_encoders(self, now: float):
+        # Positions and odometry only update at the encoder rate; without encoders the values stay 0
+        if now - self._last_encoder_read_time < self.encoder_read_interval or self.encoder_left is None:
+            return
+        elapsed = now - self._last_encoder_read_time
+        self._last_encoder_read_time = now
+
+        self.left_position = self.encoder_left.get_steps()
+        self.right_position = self.encoder_right.get_steps()
+        wheel_position = 0.5 * (self.left_position + self.right_position)
+        self.wheel_velocity = (wheel_position - self.wheel_position) / elapsed
+        self.wheel_position = wheel_position
+        self.left_travel = self.encoder_left.update_travel_distance()
+        self.right_travel = self.encoder_right.update_travel_distance()
+
+        odometry = self.odometry
+        if odometry is not None:
+            odometry.update(self.left_position, self.right_position)
+            self.x = odometry.x
+            self.y = odometry.y
+            self.heading = odometry.heading
+
+    def _read_currents(self):
+        # Sampled in the background; only the latest filtered values are copied
+        if self.current_sensor is not None:
+            self.current_left = self.current_sensor.current_left
+            self.current_right = self.current_sensor.current_right
+
+    def _check_safety(self, now: float):
+        pid_manager = self.pid_manager
+        pid = pid_manager.pid_tilt_angle_to_torque
+        current_sensor = self.current_sensor
+        estimated_tilt_angle = self.angle
+        abs_angle = abs(estimated_tilt_angle)
+
+        if self.imu.consecutive_failures >= self._imu_failure_limit:
+            # IMU FAILURE: the angle is only extrapolated; stop until reads succeed again
+            if not self.wait_until_correct_angle:
+                self.log_manager.log_critical(
+                    f"IMU read failed {self.imu.consecutive_failures} times in a row ({self.imu.last_error}), "
+                    f"last sample {self.imu_sample_age * 1000:.0f} ms old. Stopping motors.",
+                    location="safety"
+                )
+                self.stop_motors()
+                self.wait_until_correct_angle = True
+            self._reset_estimator = True
+
+        elif current_sensor is not None and current_sensor.overcurrent:
+            # OVERCURRENT: stop motors and keep them off for the cooldown
+            if not self.wait_until_correct_angle:
+                self.log_manager.log_critical(
+                    f"Motor overcurrent: left={self.current_left:.2f}A right={self.current_right:.2f}A. Stopping motors.",
+                    location="safety"
+                )
+                self.stop_motors()
+                self.wait_until_correct_angle = True
+                self.overcurrent_time = now
+            elif now - self.overcurrent_time >= global_config.overcurrent_cooldown:
+                current_sensor.reset_overcurrent()
+
+        elif abs_angle > global_config.angle_limit:
+            # HARD LIMIT: stop everything
+            self.log_manager.log_critical(
+                f"Angle exceeded hard limit: {estimated_tilt_angle:.2f}. Stopping motors.",
+                location="safety"
+            )
+            self.stop_motors()
+            self.wait_until_correct_angle = True
+
+        elif abs_angle > global_config.tilt_angle_soft_limit:
+            # SOFT LIMIT: still running, but set target angle to 0
+            if pid.target_angle != global_config.angle_neutral:
+                self.log_manager.log_warning(
+                    f"Angle exceeded soft limit: {estimated_tilt_angle:.2f}. PID target set to 0.",
+                    location="safety"
+                )
+            pid.target_angle = global_config.angle_neutral
+            self.target_angle_overridden = True
+
+        else:
+            # Within safe range
+            if self.wait_until_correct_angle:
+                with self._motor_state_lock:
+                    self.start_motors()
+                    self.wait_until_correct_angle = False
+
+            # Restore the commanded target angle once after the soft limit overrode it
+            if self.target_angle_overridden:
+                self.target_angle_overridden = False
+                pid_manager.update_pid_target()
+
+    def _update_control(self, now: float):
+        pid_manager = self.pid_manager
+
+        # Yaw rate loop: gyro Z only changes with a new IMU sample, at most at its configured rate
+        if self._imu_sample_fresh and now - self._last_yaw_update_time >= self._yaw_update_interval:
+            pid_manager.update_torque_differential(self.imu.yaw_rate, now - self._last_yaw_update_time)
+            self._last_yaw_update_time = now
+
+        if self.state_feedback is None:
+            target_torque = pid_manager.pid_tilt_angle_to_torque.update(self.angle, self.tilt_estimator.rate)
+        else:
+            target_torque = self.state_feedback.update(self.angle, self.tilt_estimator.rate, self.wheel_position,
+                                                       self.wheel_velocity,
+                                                       pid_manager.pid_tilt_angle_to_torque.target_angle)
+        if self._excitation is not None:
+            target_torque += self._excitation[self._excitation_index]
+            self._excitation_index = (self._excitation_index + 1) % len(self._excitation)
+        self.torque = target_torque
+        self.torque_left = clip(target_torque - pid_manager.torque_differential, -1.0, 1.0)
+        self.torque_right = clip(target_torque + pid_manager.torque_differential, -1.0, 1.0)
+
+    def _command_motors(self):
+        if self.current_loop is not None:
+            self.current_loop.set_torque(self.torque_left, self.torque_right)
+        else:
+            self.motor_left.set_speed(self.torque_left)
+            self.motor_right.set_speed(self.torque_right)
+
+    def _record(self, now: float):
+        self.telemetry.record(
+            now, self.angle, self.pid_manager.pid_tilt_angle_to_torque.target_angle, self.torque,
+            self.left_position, self.right_position, self.current_left, self.current_right,
+            self.x, self.y, self.heading
+        )
+
+    def _log(self, now: float):
+        # Only formats the line when debug logging is on, a few times per second
+        if now - self._last_log_time < self.LOG_INTERVAL or not self.log_manager.debug_mode:
+            return
+        imu = self.imu
+        self.log_manager.log_debug(
+            f"raw_imu={imu.pitch + global_config.imu_mounting_offset:.2f}  "
+            f"corrected={self.angle:.2f}  "
+            f"rate={self.tilt_estimator.rate:.1f}  "
+            f"offset={global_config.imu_mounting_offset:.2f}  "
+            f"set={self.pid_manager.pid_tilt_angle_to_torque.target_angle:.2f}  "
+            f"tgtT={self.torque:.2f}  "
+            f"encL={self.left_position:.0f}  "
+            f"encR={self.right_position:.0f}  "
+            f"travL={self.left_travel:.0f}  "
+            f"travR={self.right_travel:.0f}  "
+            f"curL={self.current_left:.2f}  "
+            f"curR={self.current_right:.2f}  "
+            f"imu_fresh={imu.freshness.fresh_samples}  "
+            f"imu_stale={imu.freshness.stale_reads}  "
+            f"imu_skipped={imu.freshness.skipped_polls}  "
+            f"imu_errors={imu.read_errors}  "
+            f"imu_retries={imu.retries}  ",
+            location="debug"
+        )
+        self._last_log_time = now
@@ -0,0 +1,186 @@
+"""
+LQR state feedback on tilt, tilt rate, wheel position and wheel velocity.
+
+The gains are computed once at startup: the plant model (the identified
+parameter file, or the documentation/mobrob_init.m values without one) is
+linearized around upright, discretized at the loop interval and the discrete
+Riccati equation is solved in NumPy. Per tick the controller only evaluates
+a dot product of four precomputed gains with the state error.
+
+    python -m src.control.lqrController                 # gains for the configured loop rate
+    python -m src.control.lqrController --rate 500 --plant plant_parameters.json
+"""
+
+import argparse
+import math
+from array import array
+
+import numpy as np
+
+from src.config.configManager import global_config
+from src.simulation.plantModel import load_plant_parameters
+
+STATES = ("tilt", "tilt_rate", "wheel_position", "wheel_velocity")  # rad, rad/s, m, m/s
+
+
+def linearized_model(params):
+    """
+    Continuous (A, B) of the plant model linearized around upright, for the
+    state STATES and the command of both motors (positive accelerates forward).
+    """
+    inertia = params["J_B"] + params["m"] * params["ell"] ** 2
+    torque = 2 * params["max_wheel_torque"]  # Both wheels at a command of 1.0
+    acceleration = torque / (params["m"] * params["Rr"])
+    A = np.zeros((4, 4))
+    A[0, 1] = 1.0
+    A[1, 0] = params["m"] * params["g"] * params["ell"] / inertia
+    A[1, 1] = -params["rate_damping"] / inertia
+    A[2, 3] = 1.0
+    B = np.zeros((4, 1))
+    B[1, 0] = -(params["m"] * params["ell"] * acceleration + torque) / inertia
+    B[3, 0] = acceleration
+    return A, B
+
+
+def _expm(M):
+    """Matrix exponential by scaling and squaring of a truncated Taylor series"""
+    norm = np.linalg.norm(M, np.inf)
+    squarings = max(0, int(math.ceil(math.log2(norm))) + 1) if norm > 0 else 0
+    M = M / 2 ** squarings
+    result = np.eye(len(M))
+    term = np.eye(len(M))
+    for k in range(1, 16):
+        term = term @ M / k
+        result = result + term
+    for _ in range(squarings):
+        result = result @ result
+    return result
+
+
+def discretize(A, B, dt):
+    """Zero-order hold (Ad, Bd): the command is held for the loop interval"""
+    n, m = B.shape
+    augmented = np.zeros((n + m, n + m))
+    augmented[:n, :n] = A
+    augmented[:n, n:] = B
+    exponential = _expm(augmented * dt)
+    return exponential[:n, :n], exponential[:n, n:]
+
+
+def solve_dare(A, B, Q, R, tolerance=1e-12, max_iterations=64):
+    """
+    Stabilizing solution P of the discrete algebraic Riccati equation
+    P = A'PA - A'PB (R + B'PB)^-1 B'PA + Q, by the structure-preserving
+    doubling algorithm (quadratic convergence, a few dozen iterations at most).
+    """
+    identity = np.eye(len(A))
+    A_k = A.copy()
+    G_k = B @ np.linalg.solve(R, B.T)
+    H_k = Q.copy()
+    for _ in range(max_iterations):
+        W = identity + G_k @ H_k
+        W_A = np.linalg.solve(W, A_k)
+        W_G = np.linalg.solve(W, G_k)
+        H_next = H_k + A_k.T @ H_k @ W_A
+        G_k = G_k + A_k @ W_G @ A_k.T
+        A_k = A_k @ W_A
+        if np.linalg.norm(H_next - H_k, 1) <= tolerance * np.linalg.norm(H_next, 1):
+            return H_next
+        H_k = H_next
+    raise ValueError("Riccati iteration did not converge: is the plant model controllable?")
+
+
+def lqr_gains(params=None, interval=None, state_weights=None, command_weight=None) -> np.ndarray:
+    """
+    Discrete LQR gains K for STATES, command = -K x, at the loop interval (s).
+    params defaults to load_plant_parameters(), the weights to the configuration.
+    """
+    params = params if params is not None else load_plant_parameters()
+    interval = interval or global_config.main_loop_interval
+    state_weights = state_weights if state_weights is not None else global_config.lqr_state_weights
+    command_weight = command_weight if command_weight is not None else global_config.lqr_command_weight
+
+    A, B = discretize(*linearized_model(params), interval)
+    Q = np.diag(np.asarray(state_weights, dtype=float))
+    R = np.array([[float(command_weight)]])
+    P = solve_dare(A, B, Q, R)
+    return np.linalg.solve(R + B.T @ P @ B, B.T @ P @ A)[0]
+
+
+class LQRController:
+    """
+    State feedback in the control loop's units: tilt in °, tilt rate in °/s,
+    wheel position in encoder steps and wheel velocity in steps/s.
+
+    A target angle away from neutral (drive commands, as for the tilt PID)
+    becomes a wheel velocity target; while driving the position target
+    follows the wheels, at standstill the robot holds its position.
+    """
+
+    def __init__(self, gains, steps_per_meter=None, neutral_angle=None, speed_per_degree=None, torque_limit=None):
+        steps_per_meter = steps_per_meter or (global_config.encoder_steps_per_revolution
+                                              / (2 * math.pi * global_config.wheel_radius))
+        self.gains = np.asarray(gains, dtype=float)  # SI, see STATES
+        # Converted once to the units of update()'s arguments, with the sign of command = -K x
+        degree = math.pi / 180
+        self._k = array("d", (-self.gains[0] * degree, -self.gains[1] * degree,
+                              -self.gains[2] / steps_per_meter, -self.gains[3] / steps_per_meter))
+        self.neutral_angle = global_config.angle_neutral if neutral_angle is None else neutral_angle
+        speed_per_degree = global_config.lqr_speed_per_degree if speed_per_degree is None else speed_per_degree
+        self._velocity_per_degree = speed_per_degree * steps_per_meter
+        self.torque_limit = global_config.torque_limit if torque_limit is None else torque_limit
+        self.target_position = 0.0  # steps
+        self.target_velocity = 0.0  # steps/s
+
+    def reset(self, position: float):
+        """Hold the current wheel position, e.g. when the motors restart after a stop"""
+        self.target_position = position
+
+    def update(self, angle: float, rate: float, position: float, velocity: float, target_angle: float) -> float:
+        target_velocity = self.target_velocity = (target_angle - self.neutral_angle) * self._velocity_per_degree
+        if target_velocity:
+            self.target_position = position
+        k = self._k
+        output = (k[0] * (angle - self.neutral_angle) + k[1] * rate
+                  + k[2] * (position - self.target_position) + k[3] * (velocity - target_velocity))
+        if output > self.torque_limit:
+            return self.torque_limit
+        if output < -self.torque_limit:
+            return -self.torque_limit
+        return output
+
+
+def create_state_feedback(interval, params=None, kind=None):
+    """
+    Controller selected by global_config.controller_type: None for "pid" (the
+    control loop runs the tilt PID), an LQRController for "lqr".
+    """
+    kind = kind or global_config.controller_type
+    if kind == "pid":
+        return None
+    if kind == "lqr":
+        params = params if params is not None else load_plant_parameters()
+        steps_per_meter = global_config.encoder_steps_per_revolution / (2 * math.pi * params["Rr"])
+        return LQRController(lqr_gains(params, interval), steps_per_meter)
+    raise ValueError(f"Unknown controller type: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the LQR gains from the plant model")
+    parser.add_argument("--rate", type=float, default=global_config.main_loop_rate, help="Loop rate (Hz)")
+    parser.add_argument("--plant", default=global_config.simulation_plant_file,
+                        help="Plant parameter file (default: %(default)s, model defaults if missing)")
+    args = parser.parse_args()
+
+    params = load_plant_parameters(args.plant)
+    gains = lqr_gains(params, 1.0 / args.rate)
+    A, B = discretize(*linearized_model(params), 1.0 / args.rate)
+    poles = np.linalg.eigvals(A - B @ gains[np.newaxis, :])
+    print(f"LQR gains at {args.rate:g} Hz (command = -K x):")
+    for name, gain in zip(STATES, gains):
+        print(f"  {name:<15}{gain:>12.5g}")
+    print(f"Closed-loop pole magnitudes: {', '.join(f'{abs(p):.4f}' for p in sorted(poles, key=abs))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import math
+import time
+from array import array
+
+from src.config.configManager import global_config
+from src.control.controlLoop import ControlLoop
+from src.estimation.odometry import Odometry
+from src.log.logManager import global_log_manager
+from src.pid.PIDTiltAngleToTorque import PIDTiltAngleToTorque
+from src.pid.PIDYawRateToTorqueDiff import PIDYawRateToTorqueDiff
+
+ESTIMATE_TICKS = 2000  # Ticks combined from the measured latencies per estimate
+
+
+def _measure(func, samples) -> array:
+    """Duration of each of `samples` calls of func, in ns"""
+    durations = array("q", bytes(8 * samples))
+    clock = time.perf_counter_ns
+    for i in range(samples):
+        start = clock()
+        func()
+        durations[i] = clock() - start
+    return durations
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure_stage_latencies(imu, motor_left, motor_right, pid_manager,
+                            encoder_left=None, encoder_right=None, samples=None) -> dict:
+    """
+    Time the expensive parts of a control tick on the given drivers: {stage: array of ns}.
+
+    Runs before the control loop starts. The motors only get standstill
+    commands and their drivers stay disabled; the PIDs are copies with the
+    same gains on a simulated clock, so the real controllers keep their state.
+    """
+    samples = samples or global_config.control_rate_selftest_samples
+    latencies = {"imu": _measure(imu.read_burst, samples)}
+
+    if encoder_left is not None:
+        odometry = Odometry()
+
+        def read_encoders():
+            left = encoder_left.get_steps()
+            right = encoder_right.get_steps()
+            encoder_left.update_travel_distance()
+            encoder_right.update_travel_distance()
+            odometry.update(left, right)
+        latencies["encoders"] = _measure(read_encoders, samples)
+
+    def command_motors():
+        motor_left.set_speed(0.0)
+        motor_right.set_speed(0.0)
+    latencies["pwm"] = _measure(command_motors, samples)
+
+    # simple_pid skips updates within its sample time: advance a clock so every call computes
+    tilt = pid_manager.pid_tilt_angle_to_torque
+    tilt_pid = PIDTiltAngleToTorque(tilt.kp, tilt.ki, tilt.kd, tilt.target_angle, tilt.output_limits)
+    clock = [0.0]
+
+    def simulated_time():
+        clock[0] += 1.0
+        return clock[0]
+    tilt_pid.pid.time_fn = simulated_time
+    tilt_pid.pid.reset()
+    latencies["pid"] = _measure(lambda: tilt_pid.update(1.0, 10.0), samples)
+
+    yaw = pid_manager.pid_yaw_rate_to_torque_diff
+    yaw_pid = PIDYawRateToTorqueDiff(yaw.kp, yaw.ki, yaw.kd, yaw.target_yaw_rate, yaw.output_limits)
+    latencies["yaw_pid"] = _measure(lambda: yaw_pid.update(10.0, 0.01), samples)
+    return latencies
+
+
+def estimate_tick_p99(latencies, decimation, ticks=ESTIMATE_TICKS) -> int:
+    """
+    p99 tick time (ns) when stage s only runs every decimation[s]-th tick.
+
+    Builds `ticks` synthetic ticks from the measured latencies, each stage
+    drawing its samples in turn, so a rarely running slow stage only shows
+    up in the percentile as often as it would in the loop.
+    """
+    stages = [(samples, decimation.get(name, 1), len(samples)) for name, samples in latencies.items()]
+    totals = array("q", bytes(8 * ticks))
+    for i in range(ticks):
+        total = 0
+        for samples, every, count in stages:
+            if i % every == 0:
+                total += samples[(i // every) % count]
+        totals[i] = total
+    return _percentile(sorted(totals), 0.99)
+
+
+class RateDecision:
+    """Loop rate and stage decimation chosen by select_loop_rate()"""
+
+    def __init__(self, rate, decimation, tick_p99_ns, budget_ns, stage_p99_ns, fits):
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self.decimation = decimation      # {stage: run every n-th tick}
+        self.tick_p99_ns = tick_p99_ns
+        self.budget_ns = budget_ns
+        self.stage_p99_ns = stage_p99_ns  # {stage: measured p99}
+        self.fits = fits                  # False: even the slowest candidate exceeds the budget
+
+    def format(self) -> str:
+        stages = ", ".join(f"{name} {p99 / 1000:.0f}" for name, p99 in self.stage_p99_ns.items())
+        decimation = ", ".join(f"{name} 1/{every}" for name, every in self.decimation.items())
+        return (f"Loop rate {self.rate} Hz: p99 tick {self.tick_p99_ns / 1000:.0f} µs of "
+                f"{self.budget_ns / 1000:.0f} µs budget{'' if self.fits else ' (EXCEEDED)'}. "
+                f"Decimation: {decimation}. Stage p99 (µs): {stages}")
+
+
+def select_loop_rate(latencies, candidates=None, budget_fraction=None) -> RateDecision:
+    """
+    Highest candidate rate whose estimated p99 tick time stays within
+    `budget_fraction` of the interval.
+
+    The IMU is read once per fusion sample and the yaw PID only runs on a
+    new sample, so their decimation follows from the rate. The encoder read
+    and the yaw PID start at their configured rates and are decimated
+    further (halved, slowest stage first) down to their minimum rates
+    before a lower loop rate is tried.
+    """
+    candidates = sorted(candidates or global_config.control_rate_candidates, reverse=True)
+    budget_fraction = budget_fraction or global_config.control_tick_budget_fraction
+    stage_p99 = {name: _percentile(sorted(samples), 0.99) for name, samples in latencies.items()}
+
+    decision = None
+    for rate in candidates:
+        budget_ns = int(budget_fraction * 1e9 / rate)
+        imu_every = max(1, int(rate * global_config.imu_sample_period))
+        yaw_every = imu_every * max(1, math.ceil(rate / global_config.angular_velocity_to_torque_diff_rate / imu_every))
+        decimation = {
+            "imu": imu_every,
+            "encoders": max(1, math.ceil(rate / ControlLoop.ENCODER_READ_RATE)),
+            "yaw_pid": yaw_every,
+        }
+        slowest = {
+            "encoders": max(1, rate // global_config.encoder_min_read_rate),
+            "yaw_pid": max(1, rate // global_config.yaw_rate_min_update_rate),
+        }
+
+        while True:
+            tick_p99 = estimate_tick_p99(latencies, decimation)
+            decision = RateDecision(rate, decimation, tick_p99, budget_ns, stage_p99, tick_p99 <= budget_ns)
+            if decision.fits:
+                return decision
+            # Doubling keeps the yaw PID on ticks with a new IMU sample
+            adjustable = [name for name in slowest if name in latencies and decimation[name] * 2 <= slowest[name]]
+            if not adjustable:
+                break
+            name = max(adjustable, key=stage_p99.get)
+            decimation[name] *= 2
+
+    return decision  # Slowest candidate, over budget
+
+
+def run_self_test(imu, motor_left, motor_right, pid_manager, encoder_left=None, encoder_right=None,
+                  log_manager=None) -> RateDecision:
+    """Measure the stages on this hardware, select the loop rate and log the decision"""
+    log_manager = log_manager if log_manager is not None else global_log_manager
+    latencies = measure_stage_latencies(imu, motor_left, motor_right, pid_manager, encoder_left, encoder_right)
+    decision = select_loop_rate(latencies)
+    if decision.fits:
+        log_manager.log_info(decision.format(), location="rate")
+    else:
+        log_manager.log_warning(decision.format(), location="rate")
+    return decision
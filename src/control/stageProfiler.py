@@ -0,0 +1,69 @@
+from array import array
+
+from src.config.configManager import global_config
+
+
+class StageProfiler:
+    """
+    Per-stage durations of the control tick, in ns.
+
+    The control loop writes one duration per stage per tick into
+    preallocated arrays (a ring of `capacity` ticks, samples[stage][slot]),
+    so profiling does not allocate while running. Totals cover every tick,
+    also those that were overwritten in the ring.
+    """
+
+    def __init__(self, stages, capacity=None):
+        self.stages = tuple(stages)
+        self.capacity = capacity or global_config.control_profile_capacity
+        self.samples = [array("q", bytes(8 * self.capacity)) for _ in self.stages]
+        self._wrapped_totals = [0] * len(self.stages)  # Sums of the ticks already overwritten
+        self.count = 0
+
+    def next_slot(self) -> int:
+        """Index to write the next tick's durations to"""
+        slot = self.count % self.capacity
+        if slot == 0 and self.count:
+            for i, samples in enumerate(self.samples):
+                self._wrapped_totals[i] += sum(samples)
+        self.count += 1
+        return slot
+
+    def get_totals(self) -> list:
+        """Total ns per stage over all ticks"""
+        stored = (self.count - 1) % self.capacity + 1 if self.count else 0  # Ticks in the current pass of the ring
+        return [wrapped + sum(samples[:stored]) for wrapped, samples in zip(self._wrapped_totals, self.samples)]
+
+    def get_stage_stats(self) -> dict:
+        """{stage: (mean, p50, p99, max)} in µs over the ticks still in the ring"""
+        stored = min(self.count, self.capacity)
+        stats = {}
+        if stored == 0:
+            return stats
+        for name, samples in zip(self.stages, self.samples):
+            ordered = sorted(samples[:stored])
+            stats[name] = (
+                sum(ordered) / stored / 1000,
+                ordered[stored // 2] / 1000,
+                ordered[min(stored - 1, int(stored * 0.99))] / 1000,
+                ordered[-1] / 1000,
+            )
+        return stats
+
+    def format_summary(self) -> str:
+        lines = [f"Control tick profile over {self.count} ticks (µs):",
+                 f"{'stage':<12}{'mean':>9}{'p50':>9}{'p99':>9}{'max':>9}"]
+        for name, (mean, p50, p99, maximum) in self.get_stage_stats().items():
+            lines.append(f"{name:<12}{mean:>9.2f}{p50:>9.2f}{p99:>9.2f}{maximum:>9.2f}")
+        return "\n".join(lines)
+
+    def write_folded(self, path=None, root="control_loop;tick"):
+        """
+        Write total time per stage (µs) in the folded stack format read by
+        flamegraph.pl, speedscope and similar tools ("frame;frame value" per line).
+        """
+        path = path or global_config.control_profile_file
+        with open(path, "w") as f:
+            for name, total in zip(self.stages, self.get_totals()):
+                f.write(f"{root};{name} {total // 1000}\n")
+        return path
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from src.config.configManager import global_config
+from src.log.logManager import global_log_manager
+
+
+class Watchdog:
+    """
+    Failsafe for a stalled control loop (I2C hang, GC pause, GIL held elsewhere).
+
+    A thread checks the loop's tick counter once per loop interval. If it has
+    not advanced for `missed_deadlines` intervals while the loop is running,
+    both motors are forced to standstill through the duty lookup fast path
+    and the drivers are disabled. The timeout never drops below `min_timeout`:
+    at high loop rates a few intervals are no longer than one GIL hold by
+    another thread, which must not stop the motors mid-balance. The stall is logged when it is detected
+    and again with its full duration when the loop resumes.
+
+    Being a thread, it can only act while the GIL is released or switched;
+    blocking I2C calls and sleeps do release it.
+    """
+
+    def __init__(self, control_loop, missed_deadlines=None, min_timeout=None, log_manager=None):
+        self.control_loop = control_loop
+        self.interval = control_loop.interval
+        self.missed_deadlines = missed_deadlines or global_config.watchdog_missed_deadlines
+        self.min_timeout = global_config.watchdog_min_timeout if min_timeout is None else min_timeout
+        self.timeout = max(self.missed_deadlines * self.interval, self.min_timeout)
+        self.log_manager = log_manager if log_manager is not None else global_log_manager
+
+        self.tripped = False
+        self.trips = 0
+        self.longest_stall = 0.0  # s
+
+        self._last_heartbeat = None
+        self._last_beat_time = 0.0
+        self._running = False
+        self._thread = None
+
+    def check(self, now: float) -> bool:
+        """Compare the heartbeat with the previous check. Returns True while tripped."""
+        loop = self.control_loop
+        heartbeat = loop.ticks
+
+        if heartbeat != self._last_heartbeat:
+            if self.tripped:
+                stall = now - self._last_beat_time
+                self.longest_stall = max(self.longest_stall, stall)
+                self.tripped = False
+                self.log_manager.log_warning(
+                    f"Control loop resumed after a {stall * 1000:.1f} ms stall", location="watchdog"
+                )
+            self._last_heartbeat = heartbeat
+            self._last_beat_time = now
+            return False
+
+        if self.tripped or not loop.running:
+            return self.tripped
+
+        stall = now - self._last_beat_time
+        if stall >= self.timeout:
+            self.tripped = True
+            self.trips += 1
+            loop.force_stop_motors()
+            self.log_manager.log_critical(
+                f"Control loop stalled for {stall * 1000:.1f} ms ({stall / self.interval:.0f} missed deadlines). "
+                f"Motors forced off.",
+                location="watchdog"
+            )
+        return self.tripped
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.interval)
+            self.check(time.perf_counter())
@@ -0,0 +1,57 @@
+import math
+
+from src.config.configManager import global_config
+
+
+class Odometry:
+    """
+    Differential-drive pose (x, y in m, heading in rad) from wheel encoder steps.
+
+    Step counts are converted with scale factors precomputed from the wheel
+    radius, track width and steps per wheel revolution, so an update is a few
+    multiplications. Heading is positive counter-clockwise (right wheel ahead)
+    and not wrapped, so it stays continuous for control.
+    """
+
+    def __init__(self, wheel_radius=None, track_width=None, steps_per_revolution=None):
+        wheel_radius = wheel_radius or global_config.wheel_radius
+        self.track_width = track_width or global_config.track_width
+        steps_per_revolution = steps_per_revolution or global_config.encoder_steps_per_revolution
+
+        self.meters_per_step = 2 * math.pi * wheel_radius / steps_per_revolution
+        self._half_meters_per_step = self.meters_per_step / 2            # (dl + dr) -> distance
+        self._radians_per_step = self.meters_per_step / self.track_width  # (dr - dl) -> heading change
+
+        self.reset()
+
+    def reset(self, x=0.0, y=0.0, heading=0.0):
+        """Set the pose; the next update() only stores the encoder counts as reference"""
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.distance = 0.0  # Signed distance along the path (m)
+        self._last_left = None
+        self._last_right = None
+
+    def update(self, left_steps: float, right_steps: float):
+        """Integrate the wheel motion since the previous call (signed steps, forward positive)"""
+        if self._last_left is None:
+            self._last_left = left_steps
+            self._last_right = right_steps
+            return
+
+        delta_left = left_steps - self._last_left
+        delta_right = right_steps - self._last_right
+        if not delta_left and not delta_right:
+            return
+        self._last_left = left_steps
+        self._last_right = right_steps
+
+        distance = (delta_left + delta_right) * self._half_meters_per_step
+        rotation = (delta_right - delta_left) * self._radians_per_step
+        # Move along the mean heading of the interval (second-order accurate for arcs)
+        mid_heading = self.heading + 0.5 * rotation
+        self.x += distance * math.cos(mid_heading)
+        self.y += distance * math.sin(mid_heading)
+        self.heading += rotation
+        self.distance += distance
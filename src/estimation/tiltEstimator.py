@@ -0,0 +1,124 @@
+from src.config.configManager import global_config
+
+
+class RawTiltEstimator:
+    """No fusion: passes the IMU's Euler pitch and gyro rate straight through."""
+
+    def __init__(self):
+        self.angle = 0.0
+        self.rate = 0.0
+
+    def update(self, pitch: float, rate: float, dt: float) -> float:
+        self.angle = pitch
+        self.rate = rate
+        return pitch
+
+    def predict(self, dt: float) -> float:
+        """Advance the angle with the last known rate when no new sample is available."""
+        self.angle += self.rate * dt
+        return self.angle
+
+    def reset(self, pitch: float):
+        self.angle = pitch
+        self.rate = 0.0
+
+
+class ComplementaryFilter(RawTiltEstimator):
+    """
+    Integrates the gyro rate for fast response and pulls towards the Euler
+    pitch to cancel gyro drift. alpha close to 1 trusts the gyro more.
+    """
+
+    def __init__(self, alpha=0.98):
+        super().__init__()
+        self.alpha = alpha
+        self._pitch_weight = 1.0 - alpha
+        self._initialized = False
+
+    def update(self, pitch: float, rate: float, dt: float) -> float:
+        if not self._initialized:
+            self.angle = pitch
+            self._initialized = True
+        else:
+            self.angle = self.alpha * (self.angle + rate * dt) + self._pitch_weight * pitch
+        self.rate = rate
+        return self.angle
+
+    def reset(self, pitch: float):
+        super().reset(pitch)
+        self._initialized = True
+
+
+class KalmanTiltFilter(RawTiltEstimator):
+    """
+    Two-state Kalman filter (angle, gyro bias) with scalar math only.
+
+    q_angle / q_bias: process noise of angle and bias, r_measure: pitch measurement noise.
+    """
+
+    def __init__(self, q_angle=0.001, q_bias=0.003, r_measure=0.03):
+        super().__init__()
+        self.q_angle = q_angle
+        self.q_bias = q_bias
+        self.r_measure = r_measure
+
+        self.bias = 0.0
+        self._p00 = self._p01 = self._p10 = self._p11 = 0.0
+        self._initialized = False
+
+    def update(self, pitch: float, rate: float, dt: float) -> float:
+        if not self._initialized:
+            self.reset(pitch)
+
+        # Predict
+        self.rate = rate - self.bias
+        self._propagate(dt)
+
+        # Correct with the Euler pitch
+        s = self._p00 + self.r_measure
+        k0 = self._p00 / s
+        k1 = self._p10 / s
+        innovation = pitch - self.angle
+        self.angle += k0 * innovation
+        self.bias += k1 * innovation
+
+        p00 = self._p00
+        p01 = self._p01
+        self._p00 -= k0 * p00
+        self._p01 -= k0 * p01
+        self._p10 -= k1 * p00
+        self._p11 -= k1 * p01
+        return self.angle
+
+    def predict(self, dt: float) -> float:
+        self._propagate(dt)
+        return self.angle
+
+    def _propagate(self, dt: float):
+        self.angle += dt * self.rate
+        self._p00 += dt * (dt * self._p11 - self._p01 - self._p10 + self.q_angle)
+        self._p01 -= dt * self._p11
+        self._p10 -= dt * self._p11
+        self._p11 += self.q_bias * dt
+
+    def reset(self, pitch: float):
+        super().reset(pitch)
+        self.bias = 0.0
+        self._p00 = self._p01 = self._p10 = self._p11 = 0.0
+        self._initialized = True
+
+
+def create_tilt_estimator(kind=None):
+    """Build the estimator selected by global_config.tilt_estimator ("raw", "complementary" or "kalman")."""
+    kind = kind or global_config.tilt_estimator
+    if kind == "complementary":
+        return ComplementaryFilter(global_config.complementary_filter_alpha)
+    if kind == "kalman":
+        return KalmanTiltFilter(
+            global_config.kalman_q_angle,
+            global_config.kalman_q_bias,
+            global_config.kalman_r_measure
+        )
+    if kind == "raw":
+        return RawTiltEstimator()
+    raise ValueError(f"Unknown tilt estimator: {kind}")
@@ -0,0 +1,144 @@
+import threading
+import time
+from src.config.configManager import global_config
+from src.hardware.i2cBus import PRIORITY_NORMAL, get_i2c_bus
+
+
+# I2C configuration (MCP3021 ADCs, shared bus with the IMU)
+ADC_ADDR_LEFT = 0x4B
+ADC_ADDR_RIGHT = 0x4D
+
+ADC_RESOLUTION = 1024  # 10 bit
+
+
+def build_current_lookup(amps_per_count: float, zero_count: int) -> list:
+    """Precompute amps for every 10-bit reading (two's complement, as wired on the board)"""
+    table = []
+    for raw in range(ADC_RESOLUTION):
+        count = raw - ADC_RESOLUTION if raw & 0x200 else raw
+        table.append((count - zero_count) * amps_per_count)
+    return table
+
+
+class CurrentSensor:
+    """
+    Motor current measurement for both motors, sampled on a background thread.
+
+    The latest filtered values are published in `current_left` / `current_right`
+    (A), so the control loop reads them without any I2C transaction. If a
+    `bus_idle` callback is given, reads are only started while it reports the
+    bus free, which keeps them out of the way of the IMU reads.
+    """
+
+    def __init__(self, bus=None, bus_idle=None) -> None:
+        self.bus = bus if bus is not None else get_i2c_bus()
+        # With the bus manager both ADCs are read in one combined transaction
+        self._batched = hasattr(self.bus, "read_batch")
+        if hasattr(self.bus, "register_device"):
+            self.bus.register_device(ADC_ADDR_LEFT, "current_left", PRIORITY_NORMAL)
+            self.bus.register_device(ADC_ADDR_RIGHT, "current_right", PRIORITY_NORMAL)
+        self.bus_idle = bus_idle  # now -> seconds until the bus may be used (0 = free now)
+
+        self._lookup = build_current_lookup(
+            global_config.current_sensor_amps_per_count,
+            global_config.current_sensor_zero_count
+        )
+        self._alpha = global_config.current_filter_alpha
+        self._limit = global_config.current_limit
+        # Both channels per slot when batched, otherwise one channel per slot, alternating
+        slots_per_sample = 1 if self._batched else 2
+        self._interval = 1.0 / (slots_per_sample * global_config.current_sample_rate)
+
+        self.current_left = 0.0
+        self.current_right = 0.0
+        self.raw_current_left = 0.0   # Latest unfiltered samples, for the inner current loop
+        self.raw_current_right = 0.0
+        self.overcurrent = False
+        self.sample_count = 0
+        self.read_errors = 0
+
+        self._running = False
+        self._thread = None
+
+    def _decode(self, data) -> float:
+        return self._lookup[((data[1] >> 2) | (data[0] << 6)) & 0x3FF]
+
+    def read_channel(self, is_left: bool) -> float:
+        """Single unfiltered reading in A"""
+        data = self.bus.read_i2c_block_data(ADC_ADDR_LEFT if is_left else ADC_ADDR_RIGHT, 0x00, 2)
+        return self._decode(data)
+
+    def sample_channel(self, is_left: bool):
+        """Read one channel and update its filtered value and the overcurrent flag"""
+        self._update(is_left, self.read_channel(is_left))
+
+    def sample(self):
+        """Read both channels"""
+        if not self._batched:
+            self.sample_channel(True)
+            self.sample_channel(False)
+            return
+
+        data_left, data_right = self.bus.read_batch(
+            ((ADC_ADDR_LEFT, None, 2), (ADC_ADDR_RIGHT, None, 2))
+        )
+        self._update(True, self._decode(data_left))
+        self._update(False, self._decode(data_right))
+
+    def _update(self, is_left: bool, current: float):
+        alpha = self._alpha
+        if is_left:
+            self.raw_current_left = current
+            self.current_left += alpha * (current - self.current_left)
+            filtered = self.current_left
+        else:
+            self.raw_current_right = current
+            self.current_right += alpha * (current - self.current_right)
+            filtered = self.current_right
+
+        if filtered > self._limit or filtered < -self._limit:
+            self.overcurrent = True
+        self.sample_count += 1
+
+    def reset_overcurrent(self):
+        self.overcurrent = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample_loop(self):
+        is_left = True
+        next_sample = time.perf_counter()
+        while self._running:
+            now = time.perf_counter()
+            if now < next_sample:
+                time.sleep(next_sample - now)
+                continue
+
+            if self.bus_idle is not None:
+                wait = self.bus_idle(now)
+                if wait > 0:
+                    time.sleep(wait)
+                    continue
+
+            try:
+                if self._batched:
+                    self.sample()
+                else:
+                    self.sample_channel(is_left)
+                    is_left = not is_left
+            except OSError:
+                self.read_errors += 1
+            next_sample += self._interval
+            if next_sample < now:
+                next_sample = now  # Fell behind: don't try to catch up in a burst
@@ -0,0 +1,97 @@
+import time
+
+
+class EdgeRingBuffer:
+    """
+    Fixed-size ring buffer of encoder edge timestamps and step counts.
+
+    Written by a single producer (the encoder callback thread) and read by a
+    single consumer (the control loop). The producer fills a slot before it
+    publishes the new head index, so the reader never sees a half-written
+    entry and no lock is needed. All reads are O(1).
+    """
+
+    def __init__(self, size=64, window=8, high_speed_period=0.002, timeout=0.25):
+        if size < 2 or size & (size - 1):
+            raise ValueError("Edge buffer size must be a power of two")
+        if not 1 <= window < size:
+            raise ValueError("Velocity window must be smaller than the buffer size")
+
+        self._mask = size - 1
+        self._times = [0.0] * size
+        self._steps = [0] * size
+        self._head = 0  # Total number of edges recorded (never wraps)
+
+        self.window = window                        # Edges averaged at high speed
+        self.high_speed_period = high_speed_period  # Edge period below which we average (s)
+        self.timeout = timeout                      # No edge for this long means standstill (s)
+
+    def record(self, steps, timestamp=None):
+        """Store one edge. Called from the encoder callback only."""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        head = self._head
+        index = head & self._mask
+        self._times[index] = timestamp
+        self._steps[index] = steps
+        self._head = head + 1  # Publish only after the slot is complete
+
+    def reset(self):
+        self._head = 0
+
+    def get_edge_count(self) -> int:
+        return self._head
+
+    def get_last_edge_time(self) -> float:
+        head = self._head
+        return self._times[(head - 1) & self._mask] if head else 0.0
+
+    def get_velocity(self, now=None) -> float:
+        """
+        Velocity in steps/s.
+
+        Low speed: period measurement between the last two edges.
+        High speed: count difference over the last `window` edges, which
+        averages out edge jitter once edges arrive faster than the period
+        measurement can resolve.
+        """
+        head = self._head
+        if head < 2:
+            return 0.0
+
+        mask = self._mask
+        last = (head - 1) & mask
+        t_last = self._times[last]
+        s_last = self._steps[last]
+        previous = (head - 2) & mask
+        period = t_last - self._times[previous]
+
+        if period < self.high_speed_period and head > self.window:
+            first = (head - 1 - self.window) & mask
+            span = t_last - self._times[first]
+            steps = s_last - self._steps[first]
+        else:
+            span = period
+            steps = s_last - self._steps[previous]
+
+        if span <= 0.0:
+            return 0.0
+
+        if now is None:
+            now = time.perf_counter()
+        elapsed = now - t_last
+        if elapsed > self.timeout:
+            return 0.0
+
+        # Wheel is slowing down: no edge has arrived for longer than the last
+        # measured period, so the true speed can be at most one step per elapsed time
+        if elapsed > span / abs(steps or 1):
+            bound = 1.0 / elapsed
+            velocity = steps / span
+            if velocity > bound:
+                return bound
+            if velocity < -bound:
+                return -bound
+            return velocity
+
+        return steps / span
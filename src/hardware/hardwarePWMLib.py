@@ -22,35 +22,57 @@ Notes:
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
+import time
 
 class HardwarePWMError(Exception):
     pass
 
 class HardwarePWM:
-    def __init__(self, channel: int, frequency_hz: float, chip: int = 0) -> None:
+    SYSFS_PATH = "/sys/class/pwm"
+
+    def __init__(self, channel: int, frequency_hz: float, chip: int = 0, ready_timeout: float = 2.0,
+                 initial_backoff: float = 0.001, max_backoff: float = 0.05) -> None:
         if channel not in {0, 1, 2, 3}:
             raise HardwarePWMError("Only channels 0–3 are supported.")
 
-        self._chip_path = f"/sys/class/pwm/pwmchip{chip}"
+        self._chip_path = f"{self.SYSFS_PATH}/pwmchip{chip}"
         self._pwm_path = f"{self._chip_path}/pwm{channel}"
         self._channel = channel
         self._duty_cycle = 0.0
         self._frequency_hz = frequency_hz
+        self._period_ns = int((1 / frequency_hz) * 1_000_000_000)
+        self._duty_fd = None  # Kept open for the fast duty path
 
         if not os.path.isdir(self._chip_path):
             raise HardwarePWMError("Missing overlay: add 'dtoverlay=pwm-2chan' to /boot/config.txt and reboot.")
         if not os.access(os.path.join(self._chip_path, "export"), os.W_OK):
             raise HardwarePWMError(f"No write access to {self._chip_path}")
+        started = time.monotonic()
         if not os.path.isdir(self._pwm_path):
             self._export_pwm()
 
         # Set frequency once everything is ready
+        self._wait_until_ready(frequency_hz, ready_timeout, initial_backoff, max_backoff)
+        self.time_to_ready = time.monotonic() - started  # s from export to a writable channel
+
+    def _wait_until_ready(self, frequency_hz, timeout, initial_backoff, max_backoff) -> None:
+        """
+        After an export the channel directory appears asynchronously and udev
+        fixes its permissions a little later. Retry with exponential backoff
+        (sleeping, not spinning) until the period can be written or `timeout` passes.
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_backoff
         while True:
             try:
                 self.set_frequency(frequency_hz)
-                break
-            except PermissionError:
-                continue
+                return
+            except (PermissionError, FileNotFoundError) as e:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise HardwarePWMError(f"{self._pwm_path} not ready after {timeout} s: {e}") from e
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, max_backoff)
 
     def _export_pwm(self) -> None:
         self._write(self._channel, os.path.join(self._chip_path, "export"))
@@ -59,6 +81,26 @@ class HardwarePWM:
         with open(filepath, "w") as f:
             f.write(f"{value}\n")
 
+    def _open_duty_fd(self) -> int:
+        if self._duty_fd is None:
+            self._duty_fd = os.open(os.path.join(self._pwm_path, "duty_cycle"), os.O_WRONLY)
+        return self._duty_fd
+
+    def get_period_ns(self) -> int:
+        return self._period_ns
+
+    def encode_duty_ns(self, duty_ns: int) -> bytes:
+        """Pre-encode a duty value for write_duty()"""
+        return b"%d\n" % duty_ns
+
+    def write_duty(self, encoded_duty_ns: bytes) -> None:
+        """
+        Fast path: write a pre-encoded duty (see encode_duty_ns) through a file
+        descriptor that stays open. No range check, no float math and no file
+        open per call. Does not update the duty cycle restored by set_frequency().
+        """
+        os.pwrite(self._duty_fd if self._duty_fd is not None else self._open_duty_fd(), encoded_duty_ns, 0)
+
     def start(self, duty_cycle: float) -> None:
         self.set_duty_cycle(duty_cycle)
         self._write(1, os.path.join(self._pwm_path, "enable"))
@@ -72,8 +114,7 @@ class HardwarePWM:
             raise HardwarePWMError("Duty cycle must be between 0 and 100.")
 
         self._duty_cycle = duty_cycle
-        period_ns = int((1 / self._frequency_hz) * 1_000_000_000)
-        duty_ns = int(period_ns * duty_cycle / 100)
+        duty_ns = int(self._period_ns * duty_cycle / 100)
         self._write(duty_ns, os.path.join(self._pwm_path, "duty_cycle"))
 
     def set_frequency(self, frequency_hz: float) -> None:
@@ -88,5 +129,6 @@ class HardwarePWM:
 
         period_ns = int((1 / frequency_hz) * 1_000_000_000)
         self._write(period_ns, os.path.join(self._pwm_path, "period"))
+        self._period_ns = period_ns
 
         self.set_duty_cycle(current_duty)
\ No newline at end of file
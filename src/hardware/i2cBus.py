@@ -0,0 +1,267 @@
+import ctypes
+import errno
+import fcntl
+import heapq
+import itertools
+import math
+import threading
+import time
+from smbus2 import SMBus, i2c_msg
+from src.config.configManager import global_config
+
+
+I2C_BUS_ID = 1
+
+# ioctl from linux/i2c-dev.h: adapter timeout in units of 10 ms
+I2C_TIMEOUT = 0x0702
+
+# A transfer failing with one of these may succeed when repeated: missing ACK or lost arbitration
+# (EREMOTEIO, EIO), clock stretching or adapter timeout (ETIMEDOUT), adapter busy (EAGAIN, EBUSY).
+# Anything else (ENODEV, ENXIO, EBADF, ...) means the device or adapter is gone.
+TRANSIENT_I2C_ERRNOS = frozenset((errno.EREMOTEIO, errno.EIO, errno.ETIMEDOUT, errno.EAGAIN, errno.EBUSY))
+
+# Lower value wins the bus first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+def is_transient_i2c_error(error: OSError) -> bool:
+    return error.errno in TRANSIENT_I2C_ERRNOS
+
+
+def read_message_into(address: int, buffer: bytearray) -> i2c_msg:
+    """
+    i2c_msg.read() that fills `buffer` in place on every i2c_rdwr(), so a
+    message built once can be reused without allocating a result per read.
+    """
+    message = i2c_msg.read(address, len(buffer))
+    message.buf = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+    return message
+
+
+class DeviceStats:
+    """Transaction counters for one device on the bus"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.transactions = 0
+        self.errors = 0
+        self.transient_errors = 0  # Of errors: may succeed when repeated (see TRANSIENT_I2C_ERRNOS)
+        self.fatal_errors = 0
+        self.busy_ns = 0       # Time spent in transactions
+        self.max_busy_ns = 0
+        self.wait_ns = 0       # Time spent waiting for other devices (contention)
+        self.max_wait_ns = 0
+
+    def count_error(self, error: OSError):
+        self.errors += 1
+        if is_transient_i2c_error(error):
+            self.transient_errors += 1
+        else:
+            self.fatal_errors += 1
+
+    def to_dict(self) -> dict:
+        count = self.transactions or 1
+        return {
+            "transactions": self.transactions,
+            "errors": self.errors,
+            "transient_errors": self.transient_errors,
+            "fatal_errors": self.fatal_errors,
+            "avg_ms": self.busy_ns / count / 1e6,
+            "max_ms": self.max_busy_ns / 1e6,
+            "avg_wait_ms": self.wait_ns / count / 1e6,
+            "max_wait_ms": self.max_wait_ns / 1e6,
+            "busy_s": self.busy_ns / 1e9,
+        }
+
+
+class I2CBusManager:
+    """
+    Owns the SMBus handle shared by the IMU and the current ADCs.
+
+    Transactions are serialized; when several threads wait for the bus, the
+    device with the highest priority (lowest value) goes first. Offers the
+    smbus2 methods the drivers already use, so it can be passed wherever a
+    bus is expected, plus `read_batch()` to combine several reads into one
+    I2C_RDWR ioctl. Latency, wait time and errors are recorded per device.
+    """
+
+    def __init__(self, bus_id=I2C_BUS_ID, bus=None, timeout=None):
+        self._bus = bus if bus is not None else SMBus(bus_id)
+        if bus is None:
+            # Without a timeout a hung bus (e.g. SDA held low) blocks the control loop in the ioctl
+            try:
+                self.set_timeout(global_config.i2c_timeout if timeout is None else timeout)
+            except OSError as e:
+                print(f"Could not set the I2C adapter timeout: {e}")
+        self._condition = threading.Condition()
+        self._busy = False
+        self._queue = []
+        self._tickets = itertools.count()
+
+        self._priorities = {}
+        self._stats = {}
+        self._started_ns = time.perf_counter_ns()
+
+    def set_timeout(self, timeout: float):
+        """Kernel-side adapter timeout (s, rounded up to 10 ms): a stuck transfer fails with ETIMEDOUT"""
+        fcntl.ioctl(self._bus.fd, I2C_TIMEOUT, max(1, math.ceil(timeout / 0.01)))
+
+    # === Device registration ===
+
+    def register_device(self, address: int, name: str, priority=PRIORITY_NORMAL):
+        self._priorities[address] = priority
+        self._stats[address] = DeviceStats(name)
+
+    def _get_stats(self, address: int) -> DeviceStats:
+        stats = self._stats.get(address)
+        if stats is None:
+            stats = self._stats[address] = DeviceStats(f"0x{address:02X}")
+        return stats
+
+    # === Arbitration ===
+
+    def _acquire(self, priority: int):
+        with self._condition:
+            if not self._busy and not self._queue:
+                self._busy = True
+                return
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._queue, ticket)
+            while self._busy or self._queue[0] != ticket:
+                self._condition.wait()
+            heapq.heappop(self._queue)
+            self._busy = True
+
+    def _release(self):
+        with self._condition:
+            self._busy = False
+            if self._queue:
+                self._condition.notify_all()
+
+    def _transaction(self, address: int, function, *args):
+        stats = self._get_stats(address)
+        requested = time.perf_counter_ns()
+        self._acquire(self._priorities.get(address, PRIORITY_NORMAL))
+        started = time.perf_counter_ns()
+        try:
+            return function(*args)
+        except OSError as e:
+            stats.count_error(e)
+            raise
+        finally:
+            finished = time.perf_counter_ns()
+            self._release()
+            self._record(stats, started - requested, finished - started)
+
+    @staticmethod
+    def _record(stats: DeviceStats, wait_ns: int, busy_ns: int):
+        stats.transactions += 1
+        stats.busy_ns += busy_ns
+        stats.wait_ns += wait_ns
+        if busy_ns > stats.max_busy_ns:
+            stats.max_busy_ns = busy_ns
+        if wait_ns > stats.max_wait_ns:
+            stats.max_wait_ns = wait_ns
+
+    # === smbus2-compatible transactions ===
+
+    def read_byte_data(self, address: int, register: int) -> int:
+        return self._transaction(address, self._bus.read_byte_data, address, register)
+
+    def write_byte_data(self, address: int, register: int, value: int):
+        return self._transaction(address, self._bus.write_byte_data, address, register, value)
+
+    def read_i2c_block_data(self, address: int, register: int, length: int) -> list:
+        return self._transaction(address, self._bus.read_i2c_block_data, address, register, length)
+
+    def write_i2c_block_data(self, address: int, register: int, data: list):
+        return self._transaction(address, self._bus.write_i2c_block_data, address, register, data)
+
+    def i2c_rdwr(self, *messages):
+        return self._transaction(messages[0].addr, self._bus.i2c_rdwr, *messages)
+
+    # === Batched reads ===
+
+    def read_batch(self, requests) -> list:
+        """
+        Perform several reads as one combined transaction (repeated starts).
+
+        requests: sequence of (address, register, length); register None means a
+        plain read without a register pointer write (e.g. MCP3021).
+        Returns one bytes object per request.
+        """
+        messages = []
+        reads = []
+        for address, register, length in requests:
+            if register is not None:
+                messages.append(i2c_msg.write(address, [register]))
+            read = i2c_msg.read(address, length)
+            messages.append(read)
+            reads.append(read)
+
+        addresses = {address for address, _register, _length in requests}
+        priority = min(self._priorities.get(address, PRIORITY_NORMAL) for address in addresses)
+
+        requested = time.perf_counter_ns()
+        self._acquire(priority)
+        started = time.perf_counter_ns()
+        try:
+            self._bus.i2c_rdwr(*messages)
+        except OSError as e:
+            for address in addresses:
+                self._get_stats(address).count_error(e)
+            raise
+        finally:
+            finished = time.perf_counter_ns()
+            self._release()
+            # Every device in the batch experienced the full latency
+            for address in addresses:
+                self._record(self._get_stats(address), started - requested, finished - started)
+
+        return [bytes(read) for read in reads]
+
+    # === Metrics ===
+
+    def get_stats(self) -> dict:
+        """Per-device statistics plus the fraction of time the bus was busy"""
+        elapsed_s = (time.perf_counter_ns() - self._started_ns) / 1e9
+        stats = {s.name: s.to_dict() for s in self._stats.values()}
+        busy_s = sum(s["busy_s"] for s in stats.values())
+        stats["bus_utilization"] = busy_s / elapsed_s if elapsed_s > 0 else 0.0
+        return stats
+
+    def reset_stats(self):
+        for address, stats in list(self._stats.items()):
+            self._stats[address] = DeviceStats(stats.name)
+        self._started_ns = time.perf_counter_ns()
+
+    def format_stats(self) -> str:
+        stats = self.get_stats()
+        utilization = stats.pop("bus_utilization")
+        lines = [f"I2C bus utilization: {utilization * 100:.1f}%"]
+        for name, s in stats.items():
+            lines.append(
+                f"{name}: n={s['transactions']} err={s['errors']} "
+                f"(transient={s['transient_errors']} fatal={s['fatal_errors']}) "
+                f"avg={s['avg_ms']:.3f}ms max={s['max_ms']:.3f}ms "
+                f"wait_avg={s['avg_wait_ms']:.3f}ms wait_max={s['max_wait_ms']:.3f}ms"
+            )
+        return "\n".join(lines)
+
+    def close(self):
+        self._bus.close()
+
+
+_global_bus = None
+_global_bus_lock = threading.Lock()
+
+
+def get_i2c_bus() -> I2CBusManager:
+    """The process-wide bus manager, opened on first use"""
+    global _global_bus
+    with _global_bus_lock:
+        if _global_bus is None:
+            _global_bus = I2CBusManager()
+        return _global_bus
@@ -1,38 +1,197 @@
-import smbus2 as smbus
+import errno
+import json
+import os
+import struct
+import time
+from smbus2 import i2c_msg
 from src.config.configManager import global_config
+from src.hardware.i2cBus import PRIORITY_HIGH, get_i2c_bus, is_transient_i2c_error, read_message_into
 
 
 # I2C configuration
-I2C_BUS_ID = 1
 IMU_ADDR = 0x28
 
 # Register addresses
 REG_MODE = 0x3D
+REG_GYRO_X_LSB = 0x14
 REG_PITCH_LSB = 0x1E
 REG_GYRO_Y_LSB = 0x16
 REG_GYRO_Z_LSB = 0x18
+REG_CALIB_STAT = 0x35
+REG_ACC_OFFSET_X_LSB = 0x55  # Start of accel/mag/gyro offsets and accel/mag radius (0x55-0x6A)
 
 # Operation modes
 MODE_CONFIG = 0b0000
 MODE_NDOF = 0b1100
 
+# Mode switch times from the datasheet (s)
+CONFIG_TO_ANY_DELAY = 0.007
+ANY_TO_CONFIG_DELAY = 0.019
+
+# Calibration profile: 3x3 offsets (accel, mag, gyro) + 2 radii, 16-bit each
+CALIBRATION_PROFILE_LENGTH = 22
+
+# Burst read from gyro X to pitch: gyro X/Y/Z then Euler heading/roll/pitch, 16-bit little endian each
+BURST_LENGTH = 12
+BURST_FORMAT = struct.Struct("<6h")
+
 class IMU:
-    def __init__(self, bus=smbus.SMBus(I2C_BUS_ID)) -> None:
-        self.bus = bus
-        self.pitch_filtered = None
-        self.gyro_y_filtered = None
-        self.alpha = 0.1  # Smoothing factor: lower = smoother but slower
-        
+    def __init__(self, bus=None, calibration_file=None) -> None:
+        # Shared bus manager unless a bus is passed explicitly (e.g. a plain SMBus in test scripts)
+        self.bus = bus if bus is not None else get_i2c_bus()
+        if hasattr(self.bus, "register_device"):
+            self.bus.register_device(IMU_ADDR, "imu", PRIORITY_HIGH)
+        self.calibration_file = calibration_file or global_config.imu_calibration_file
+        self.calibration_restored = False
+        self.mounting_offset_measured = False  # Only a measured offset is written to the calibration file
+
+        # Latest sample from poll()
+        self.pitch = 0.0
+        self.pitch_rate = 0.0
+        self.yaw_rate = 0.0
+        self.last_sample_time = None  # Time of the latest sample from poll(), or of the first poll before one
+        self.freshness = SampleFreshnessTracker(
+            period=global_config.imu_sample_period,
+            retry_interval=global_config.imu_sample_retry_interval,
+            enabled=global_config.imu_skip_stale_samples
+        )
+
+        # Read errors in poll(): transient ones are retried within the budget, then the sample is skipped
+        self._read_retries = global_config.imu_read_retries
+        self._retry_budget = global_config.imu_retry_budget
+        self.read_errors = 0
+        self.transient_errors = 0
+        self.fatal_errors = 0
+        self.retries = 0
+        self.failed_reads = 0            # Polls that gave up without a sample
+        self.consecutive_failures = 0
+        self.max_consecutive_failures = 0
+        self.last_error = None           # errno name of the latest error
+
+        # Burst read as one preallocated register write + read, filling the same buffer every time
+        self._burst_data = bytearray(BURST_LENGTH)
+        self._burst_messages = (
+            i2c_msg.write(IMU_ADDR, [REG_GYRO_X_LSB]),
+            read_message_into(IMU_ADDR, self._burst_data),
+        )
+
         self._initialize()
 
     def _initialize(self):
         # Set to config mode first
-        self.bus.write_byte_data(IMU_ADDR, REG_MODE, MODE_CONFIG)
-        if self.bus.read_byte_data(IMU_ADDR, REG_MODE) == MODE_CONFIG:            # Switch to NDOF mode (sensor fusion)
-            self.bus.write_byte_data(IMU_ADDR, REG_MODE, MODE_NDOF)
+        self._set_mode(MODE_CONFIG)
+        if self.bus.read_byte_data(IMU_ADDR, REG_MODE) == MODE_CONFIG:
+            # Offsets can only be written in config mode
+            self.calibration_restored = self.load_calibration()
+
+            # Switch to NDOF mode (sensor fusion)
+            self._set_mode(MODE_NDOF)
             if self.bus.read_byte_data(IMU_ADDR, REG_MODE) != MODE_NDOF:
                 raise RuntimeError("IMU failed to initialize NDOF mode")
-            print("IMU initialized")
+            print("IMU initialized" + (" with stored calibration" if self.calibration_restored else ""))
+
+    def _set_mode(self, mode):
+        self.bus.write_byte_data(IMU_ADDR, REG_MODE, mode)
+        time.sleep(ANY_TO_CONFIG_DELAY if mode == MODE_CONFIG else CONFIG_TO_ANY_DELAY)
+
+    # === Calibration ===
+
+    def get_calibration_status(self):
+        """Returns calibration levels (sys, gyro, accel, mag), each 0 (uncalibrated) to 3 (fully calibrated)"""
+        value = self.bus.read_byte_data(IMU_ADDR, REG_CALIB_STAT)
+        return (value >> 6) & 0x03, (value >> 4) & 0x03, (value >> 2) & 0x03, value & 0x03
+
+    def is_calibrated(self, required=None) -> bool:
+        required = required or global_config.imu_required_calibration
+        return all(level >= minimum for level, minimum in zip(self.get_calibration_status(), required))
+
+    def wait_until_calibrated(self, timeout=None, required=None, poll_interval=0.05) -> bool:
+        """Block until every calibration level reaches `required`. Returns False on timeout."""
+        timeout = global_config.imu_calibration_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while not self.is_calibrated(required):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def read_calibration_profile(self) -> list:
+        """Read the 22 offset/radius registers. Briefly leaves fusion mode."""
+        self._set_mode(MODE_CONFIG)
+        profile = self.bus.read_i2c_block_data(IMU_ADDR, REG_ACC_OFFSET_X_LSB, CALIBRATION_PROFILE_LENGTH)
+        self._set_mode(MODE_NDOF)
+        return list(profile)
+
+    def _read_calibration_file(self, path) -> dict:
+        """Contents of the calibration file, {} if it is missing or unreadable"""
+        if not os.path.isfile(path):
+            return {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring invalid IMU calibration file {path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_calibration_file(self, path, data):
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def save_calibration(self, path=None, required=None) -> bool:
+        """
+        Store the sensor calibration once the `required` levels (default:
+        imu_required_calibration) are reached. Briefly leaves fusion mode, so
+        only call it while the robot is not balancing. A mounting offset
+        measured in this run is stored with it, a previously stored one is kept.
+        """
+        path = path or self.calibration_file
+        if not self.is_calibrated(required):
+            return False
+
+        data = self._read_calibration_file(path)
+        data["profile"] = self.read_calibration_profile()
+        if self.mounting_offset_measured:
+            data["imu_mounting_offset"] = global_config.imu_mounting_offset
+        self._write_calibration_file(path, data)
+        return True
+
+    def save_mounting_offset(self, path=None):
+        """Store the mounting offset without touching the stored profile (no mode switch)"""
+        path = path or self.calibration_file
+        data = self._read_calibration_file(path)
+        data["imu_mounting_offset"] = global_config.imu_mounting_offset
+        self._write_calibration_file(path, data)
+
+    def load_calibration(self, path=None) -> bool:
+        """
+        Write a stored calibration profile to the sensor and apply a stored
+        mounting offset. Must be called in config mode. Returns True if a
+        profile was restored.
+        """
+        path = path or self.calibration_file
+        data = self._read_calibration_file(path)
+        if "imu_mounting_offset" in data:
+            global_config.imu_mounting_offset = data["imu_mounting_offset"]
+
+        profile = data.get("profile")
+        if profile is None:
+            return False
+        if len(profile) != CALIBRATION_PROFILE_LENGTH:
+            print(f"Ignoring IMU calibration file {path}: expected {CALIBRATION_PROFILE_LENGTH} bytes")
+            return False
+        self.bus.write_i2c_block_data(IMU_ADDR, REG_ACC_OFFSET_X_LSB, profile)
+        return True
+
+    def measure_mounting_offset(self, samples=100, interval=0.01) -> float:
+        """Average the raw pitch while the robot is held upright and use it as the mounting offset"""
+        total = 0.0
+        for _ in range(samples):
+            total += self.read_pitch_raw()
+            time.sleep(interval)
+        global_config.imu_mounting_offset = total / samples
+        self.mounting_offset_measured = True
+        return global_config.imu_mounting_offset
 
     def read_pitch(self) -> float:
         # Read and decode 16-bit pitch value
@@ -71,4 +230,162 @@ class IMU:
         value = (raw[1] << 8) | raw[0]
         if value > 32767:
             value -= 65536
-        return value / 16  # Convert from LSB to °/s
\ No newline at end of file
+        return value / 16  # Convert from LSB to °/s
+
+    def read_burst(self):
+        """
+        Read pitch, pitch rate and yaw rate in a single I2C transaction.
+
+        Returns (pitch in °, pitch rate in °/s, yaw rate in °/s), with the mounting
+        offset applied to pitch and the gyro signs from the configuration.
+        """
+        return self._decode_burst(self._read_burst_data())
+
+    def _read_burst_data(self) -> bytearray:
+        """Burst registers from gyro X to pitch; the returned buffer is overwritten by the next read"""
+        self.bus.i2c_rdwr(*self._burst_messages)
+        return self._burst_data
+
+    def _read_burst_retrying(self):
+        """Burst read, repeating transient errors within the retry budget. None if the read failed."""
+        attempts = 0
+        deadline = None
+        while True:
+            try:
+                raw = self._read_burst_data()
+                self.consecutive_failures = 0
+                return raw
+            except OSError as e:
+                self.read_errors += 1
+                self.last_error = errno.errorcode.get(e.errno, str(e.errno))
+                if not is_transient_i2c_error(e):
+                    self.fatal_errors += 1
+                    break
+                self.transient_errors += 1
+                if deadline is None:
+                    deadline = time.perf_counter() + self._retry_budget
+                if attempts >= self._read_retries or time.perf_counter() >= deadline:
+                    break
+                attempts += 1
+                self.retries += 1
+
+        self.failed_reads += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures > self.max_consecutive_failures:
+            self.max_consecutive_failures = self.consecutive_failures
+        return None
+
+    def get_error_stats(self) -> dict:
+        return {
+            "read_errors": self.read_errors,
+            "transient_errors": self.transient_errors,
+            "fatal_errors": self.fatal_errors,
+            "retries": self.retries,
+            "failed_reads": self.failed_reads,
+            "consecutive_failures": self.consecutive_failures,
+            "max_consecutive_failures": self.max_consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+    def format_error_stats(self) -> str:
+        return (f"IMU read errors: {self.read_errors} ({self.transient_errors} transient, {self.fatal_errors} fatal), "
+                f"{self.retries} retries, {self.failed_reads} failed reads, "
+                f"longest failure run {self.max_consecutive_failures}, last error {self.last_error}")
+
+    def _decode_burst(self, raw):
+        _gyro_x, gyro_y, gyro_z, _heading, _roll, pitch = BURST_FORMAT.unpack(raw)
+
+        angle_degrees = (pitch / 16 + 90) - global_config.imu_mounting_offset
+        pitch_rate = global_config.imu_pitch_rate_sign * gyro_y / 16
+        yaw_rate = global_config.imu_yaw_rate_sign * gyro_z / 16
+        return angle_degrees, pitch_rate, yaw_rate
+
+    # === Fresh-sample polling ===
+
+    def poll(self, now: float) -> bool:
+        """
+        Burst-read the IMU only if the timing model expects a new fusion sample.
+
+        Returns True when a new sample was read; it is then available in
+        `pitch`, `pitch_rate` and `yaw_rate`. Returns False if no read was due,
+        the sensor still held the previous sample or the read failed, so the
+        caller can predict from the last good sample instead. Bus errors are
+        counted, not raised; `consecutive_failures` tells how long the last
+        good sample is getting.
+        """
+        freshness = self.freshness
+        if self.last_sample_time is None:
+            self.last_sample_time = now
+        if now < freshness.next_due:
+            freshness.skipped_polls += 1
+            return False
+
+        raw = self._read_burst_retrying()
+        if raw is None:
+            return False  # next_due stays in the past, so the next poll tries again
+        if not freshness.observe(raw, now):
+            return False
+
+        self.pitch, self.pitch_rate, self.yaw_rate = self._decode_burst(raw)
+        self.last_sample_time = now
+        return True
+
+    def get_sample_age(self, now: float) -> float:
+        """Seconds since poll() last returned a sample, also with stale-sample skipping off"""
+        return now - self.last_sample_time if self.last_sample_time is not None else 0.0
+
+
+class SampleFreshnessTracker:
+    """
+    Timing model of the BNO055 fusion output, which updates at a fixed rate
+    (100 Hz in NDOF mode). Polling faster than that only re-reads the same
+    registers, so reads are scheduled one period after the last observed change.
+    """
+
+    def __init__(self, period=0.01, retry_interval=0.001, enabled=True):
+        self.period = period                  # Fusion output period (s)
+        self.retry_interval = retry_interval  # Re-poll delay when a sample was expected but unchanged (s)
+        self.enabled = enabled
+
+        self.next_due = 0.0
+        self.last_change_time = None
+        self._last_data = None  # Copy of the last new sample, updated in place
+
+        # Statistics
+        self.fresh_samples = 0
+        self.stale_reads = 0
+        self.skipped_polls = 0
+
+    def observe(self, data: bytes, now: float) -> bool:
+        """Record a completed read. Returns True if it holds a new sample."""
+        if not self.enabled:
+            self.fresh_samples += 1
+            return True
+
+        if data != self._last_data or now - self.last_change_time >= 2 * self.period:
+            # Changed data, or unchanged for so long it must be a new sample with identical values
+            if self._last_data is None:
+                self._last_data = bytearray(data)
+            else:
+                self._last_data[:] = data
+            self.last_change_time = now
+            self.next_due = now + self.period
+            self.fresh_samples += 1
+            return True
+
+        # Read slightly before the sensor updated: try again shortly
+        self.stale_reads += 1
+        self.next_due = now + self.retry_interval
+        return False
+
+    def get_bus_idle_time(self, now: float, guard: float = None) -> float:
+        """
+        Seconds until other devices may use the bus without delaying the next
+        IMU read: 0 if a transaction of `guard` seconds still fits before it.
+        """
+        if not self.enabled:
+            return 0.0
+        guard = global_config.i2c_guard_time if guard is None else guard
+        if now + guard <= self.next_due:
+            return 0.0
+        return self.next_due + guard - now
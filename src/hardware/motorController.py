@@ -1,4 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
 from gpiozero import DigitalOutputDevice
+from src.config.configManager import global_config
 from src.hardware.hardwarePWMLib import HardwarePWM
 
 # GPIO pin mappings for both motors
@@ -10,17 +12,82 @@ PIN_PWM_RIGHT = 12
 PIN_DIR_RIGHT = 24
 PIN_EN_RIGHT = 18
 
+
+def build_duty_lookup(pwm, resolution: int, deadband: float, voltage_scale: float = 1.0):
+    """
+    Precompute the PWM duty for every quantized command magnitude.
+
+    Index i covers |command| = i / resolution. Non-zero commands skip the
+    deadband, are scaled by voltage_scale (nominal / estimated supply voltage,
+    clipped to full duty) and inverted (the driver expects 100% duty for
+    standstill). Returns duties encoded by pwm.encode_duty_ns() for pwm.write_duty().
+    """
+    period_ns = pwm.get_period_ns()
+    table = []
+    for i in range(resolution + 1):
+        magnitude = i / resolution
+        if magnitude > 0.0:
+            magnitude = deadband + (1.0 - deadband) * magnitude * voltage_scale
+        duty = 1.0 - min(magnitude, 1.0)
+        table.append(pwm.encode_duty_ns(int(period_ns * duty)))
+    return table
+
+
+def create_motor_pwm(is_left: bool) -> HardwarePWM:
+    """Hardware PWM channel of one motor; waits (with backoff) until the exported channel is writable"""
+    return HardwarePWM(
+        channel=1 if is_left else 0, frequency_hz=global_config.motor_pwm_frequency, chip=0,
+        ready_timeout=global_config.pwm_ready_timeout,
+        initial_backoff=global_config.pwm_ready_initial_backoff,
+        max_backoff=global_config.pwm_ready_max_backoff
+    )
+
+
+def create_motor_pair():
+    """
+    Left and right MotorController with their PWM channels initialized
+    concurrently, so startup waits for the slower export instead of both in turn.
+    The GPIO outputs are created afterwards on this thread.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pwm_left = executor.submit(create_motor_pwm, True)
+        pwm_right = executor.submit(create_motor_pwm, False)
+        pwm_left, pwm_right = pwm_left.result(), pwm_right.result()
+    return MotorController(is_left=True, pwm=pwm_left), MotorController(is_left=False, pwm=pwm_right)
+
+
 class MotorController:
-    def __init__(self, is_left: bool):
-        # Set correct pins and PWM channel depending on motor side
-        pwm_channel = 1 if is_left else 0
+    def __init__(self, is_left: bool, pwm=None, dir_output=None, enable_output=None):
+        # Set correct pins depending on motor side
         dir_pin = PIN_DIR_LEFT if is_left else PIN_DIR_RIGHT
         en_pin = PIN_EN_LEFT if is_left else PIN_EN_RIGHT
 
         self._reverse = not is_left  # Reverse direction for right motor
-        self._pwm = HardwarePWM(channel=pwm_channel, frequency_hz=50000, chip=0)
-        self._dir = DigitalOutputDevice(pin=dir_pin)
-        self._enable = DigitalOutputDevice(pin=en_pin)
+        # Outputs can be passed in (e.g. simulated ones); otherwise the Pi's PWM and GPIO are used
+        self._pwm = pwm if pwm is not None else create_motor_pwm(is_left)
+        self.time_to_ready = self._pwm.time_to_ready  # s until the PWM channel accepted its settings
+        self._dir = dir_output if dir_output is not None else DigitalOutputDevice(pin=dir_pin)
+        self._enable = enable_output if enable_output is not None else DigitalOutputDevice(pin=en_pin)
+        self._direction = None  # Last value written to the direction pin
+
+        # Torque command -> duty lookup, rebuilt when the supply voltage estimate or the deadband changes
+        self._resolution = global_config.motor_lut_resolution
+        self.supply_voltage = global_config.motor_nominal_voltage
+        self.lookup_rebuilds = 0
+        self._duty_lut = None
+        self.rebuild_lookup()
+
+    def rebuild_lookup(self):
+        voltage_scale = global_config.motor_nominal_voltage / self.supply_voltage
+        # Swap in a complete table so set_speed() never sees a partial one
+        self._duty_lut = build_duty_lookup(self._pwm, self._resolution, global_config.motor_deadband, voltage_scale)
+        self.lookup_rebuilds += 1
+
+    def set_supply_voltage(self, volts: float):
+        """Update the battery voltage estimate; rebuilds the lookup only on a change above the threshold"""
+        if abs(volts - self.supply_voltage) >= global_config.motor_voltage_rebuild_threshold:
+            self.supply_voltage = volts
+            self.rebuild_lookup()
 
     def start(self):
         self._pwm.start(0)
@@ -32,13 +99,26 @@ class MotorController:
         self._pwm.stop()
         self._enable.off()
 
-    def set_speed(self, value: float):
-        # Convert speed to duty cycle (inverted)
-        duty = 1 - min(abs(value), 1.0)
-        self._pwm.set_duty_cycle(100.0 * duty)
+    def force_zero(self):
+        """Failsafe: standstill duty through the fast path and driver disabled, callable from any thread"""
+        self._pwm.write_duty(self._duty_lut[0])
+        self._enable.off()
 
-        # Set direction depending on sign and motor side
-        if (value < 0) ^ self._reverse:
-            self._dir.on()
+    def set_speed(self, value: float):
+        # Convert speed to duty cycle (inverted) via the lookup table
+        if value < 0:
+            index = int(-value * self._resolution + 0.5)
         else:
-            self._dir.off()
+            index = int(value * self._resolution + 0.5)
+        if index > self._resolution:
+            index = self._resolution
+        self._pwm.write_duty(self._duty_lut[index])
+
+        # Set direction depending on sign and motor side; only touch the pin on a change
+        direction = (value < 0) ^ self._reverse
+        if direction != self._direction:
+            self._direction = direction
+            if direction:
+                self._dir.on()
+            else:
+                self._dir.off()
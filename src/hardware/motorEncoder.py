@@ -1,4 +1,7 @@
 from gpiozero import RotaryEncoder
+from src.config.configManager import global_config
+from src.hardware.edgeRingBuffer import EdgeRingBuffer
+from src.hardware.gpioLineEncoder import GpioLineEncoder
 
 # GPIO pin mappings for rotary encoders
 ENCODER_LEFT_A = 19
@@ -14,24 +17,55 @@ class MotorEncoder:
         pin_a = ENCODER_LEFT_A if is_left else ENCODER_RIGHT_A
         pin_b = ENCODER_LEFT_B if is_left else ENCODER_RIGHT_B
 
-        # Initialize rotary encoder with gear ratio and no wrapping
-        self.encoder = RotaryEncoder(
-            pin_a,
-            pin_b,
-            max_steps=(256 * 21) / 2,
-            wrap=False
-        )
-
         self.steps = 0.0
         self.previous_steps = 0.0
         self.steps_traveled = 0.0  # Cumulative distance traveled
 
+        # Timestamp every step for velocity estimation
+        self.edges = EdgeRingBuffer(
+            size=global_config.encoder_edge_buffer_size,
+            window=global_config.encoder_velocity_window,
+            high_speed_period=global_config.encoder_high_speed_period,
+            timeout=global_config.encoder_velocity_timeout
+        )
+
+        if global_config.encoder_backend == "chardev":
+            # Kernel-timestamped line events decoded on a dedicated thread
+            self.encoder = GpioLineEncoder(
+                pin_a,
+                pin_b,
+                chip_path=global_config.encoder_gpio_chip,
+                edge_buffer=self.edges
+            )
+        else:
+            # Initialize rotary encoder without wrapping; a limit of 0 never clamps the position
+            self.encoder = RotaryEncoder(
+                pin_a,
+                pin_b,
+                max_steps=global_config.encoder_max_steps,
+                wrap=False
+            )
+            # Edge timestamps are taken in gpiozero's callback thread
+            self.encoder.when_rotated = self._on_rotated
+
+    def close(self):
+        """Release the GPIO lines; the chardev backend also stops its reader thread and closes the line fd"""
+        self.encoder.close()
+
+    def _on_rotated(self):
+        self.edges.record(self.encoder.steps)
+
     def get_steps(self) -> float:
         """Get absolute position (can be positive or negative)"""
         # Return signed step count based on motor side
         self.steps = -self.encoder.steps if self.invert_direction else self.encoder.steps
         return self.steps
     
+    def get_velocity(self) -> float:
+        """Get signed velocity in steps/s from the edge timestamps"""
+        velocity = self.edges.get_velocity()
+        return -velocity if self.invert_direction else velocity
+
     def update_travel_distance(self) -> float:
         """Update cumulative travel distance (always positive)"""
         current_steps = self.get_steps()
@@ -1,9 +1,11 @@
+import time
 from datetime import datetime
 
 class LogEntry:
     def __init__(self, event_location, event_type, message):
+        self.time = time.time()  # Epoch seconds, for sorting and time range queries
         try:
-            self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.timestamp = datetime.fromtimestamp(self.time).strftime("%Y-%m-%d %H:%M:%S")
         except:
             self.timestamp = "Failed to get date"
 
@@ -0,0 +1,276 @@
+import argparse
+import glob
+import importlib.util
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config.configManager import global_config
+from src.log.logManager import global_log_manager
+
+LOG_COLUMNS = ("time", "level", "location", "message")
+FILE_FORMATS = ("csv", "parquet")
+
+
+def parquet_available() -> bool:
+    """pandas writes Parquet through pyarrow or fastparquet, neither is in requirements.txt"""
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+
+def entries_to_frame(entries) -> pd.DataFrame:
+    """Columnar frame of LogEntry objects; entries without a location get an empty one"""
+    return pd.DataFrame({
+        "time": np.fromiter((entry.time for entry in entries), dtype=np.float64, count=len(entries)),
+        "level": [entry.event_type for entry in entries],
+        "location": [entry.event_location or "" for entry in entries],
+        "message": [str(entry.message) for entry in entries],
+    }, columns=LOG_COLUMNS)
+
+
+class LogExporter:
+    """
+    Streams log entries to rotating CSV or Parquet files in the background.
+
+    The logging thread only puts each entry on a queue; a worker thread
+    drains it every flush interval and appends the batch to the current
+    file, starting a new one after rotate_entries entries. CSV batches are
+    appended as they arrive. Parquet files cannot be appended to, so the
+    batches of the current Parquet file are kept in memory and written when
+    it rotates or the exporter stops.
+    """
+
+    def __init__(self, log_manager=None, directory=None, file_format=None, rotate_entries=None, flush_interval=None):
+        self.log_manager = log_manager if log_manager is not None else global_log_manager
+        self.directory = directory or global_config.log_export_directory
+        self.file_format = file_format or global_config.log_export_format
+        self.rotate_entries = rotate_entries or global_config.log_export_rotate_entries
+        self.flush_interval = flush_interval or global_config.log_export_flush_interval
+
+        if self.file_format not in FILE_FORMATS:
+            raise ValueError(f"Unknown log export format {self.file_format!r}, expected one of {FILE_FORMATS}")
+        if self.file_format == "parquet" and not parquet_available():
+            raise RuntimeError("Parquet log export needs pyarrow (pip install pyarrow); "
+                               "set log_export_format = \"csv\" to export without it")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.files = []             # Paths written so far, oldest first
+        self.entries_written = 0
+        self.write_errors = 0       # Batches dropped because a file could not be written
+
+        self._queue = queue.SimpleQueue()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._path = None
+        self._file_entries = 0
+        self._pending_frames = []   # Parquet batches of the current file
+
+    def submit(self, entry):
+        """LogManager sink: called on the logging thread, never blocks"""
+        self._queue.put(entry)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # Entries logged before the exporter existed are still in memory
+        for entry in list(self.log_manager.log_entries):
+            self.submit(entry)
+        self.log_manager.add_sink(self.submit)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write everything logged so far and close the current file"""
+        self.log_manager.remove_sink(self.submit)
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._flush_lock:
+            self._close_file()
+
+    def flush(self) -> int:
+        """Write the queued entries, returns how many were taken from the queue"""
+        with self._flush_lock:
+            entries = []
+            try:
+                while True:
+                    entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if entries:
+                self._write(entries_to_frame(entries))
+            return len(entries)
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _write(self, frame):
+        start = 0
+        while start < len(frame):
+            if self._path is None:
+                self._open_file()
+            count = min(len(frame) - start, self.rotate_entries - self._file_entries)
+            try:
+                self._append(frame.iloc[start:start + count])
+            except OSError as e:
+                self._report_write_error(e)
+                return
+            self._file_entries += count
+            self.entries_written += count
+            start += count
+            if self._file_entries >= self.rotate_entries:
+                self._close_file()
+
+    def _open_file(self):
+        self._path = os.path.join(self.directory, f"log_{self.session}_{len(self.files):04d}.{self.file_format}")
+        self.files.append(self._path)
+        self._file_entries = 0
+
+    def _append(self, frame):
+        if self.file_format == "csv":
+            frame.to_csv(self._path, mode="a", header=self._file_entries == 0, index=False)
+        else:
+            self._pending_frames.append(frame)
+
+    def _close_file(self):
+        if self._path is None:
+            return
+        if self._pending_frames:
+            try:
+                pd.concat(self._pending_frames, ignore_index=True).to_parquet(self._path, index=False)
+            except OSError as e:
+                self._report_write_error(e)
+            self._pending_frames = []
+        self._path = None
+
+    def _report_write_error(self, error):
+        # Only the first failure is logged: the error entry would be exported, fail and be logged again
+        if self.write_errors == 0:
+            self.log_manager.log_error(f"Log export to {self._path} failed: {error}", location="log")
+        self.write_errors += 1
+
+
+def load_logs(directory=None) -> pd.DataFrame:
+    """Every entry exported to the directory, CSV and Parquet, sorted by time"""
+    directory = directory or global_config.log_export_directory
+    paths = sorted(glob.glob(os.path.join(directory, "log_*.csv")) + glob.glob(os.path.join(directory, "log_*.parquet")))
+    frames = []
+    for path in paths:
+        if path.endswith(".csv"):
+            # keep_default_na: an empty location or a message like "NA" stays a string
+            frames.append(pd.read_csv(path, dtype={"level": str, "location": str, "message": str},
+                                      keep_default_na=False))
+        else:
+            frames.append(pd.read_parquet(path))
+    if not frames:
+        return pd.DataFrame({"time": np.empty(0), "level": [], "location": [], "message": []}, columns=LOG_COLUMNS)
+
+    frame = pd.concat(frames, ignore_index=True)
+    if not frame["time"].is_monotonic_increasing:
+        frame = frame.sort_values("time", kind="stable", ignore_index=True)
+    frame["level"] = frame["level"].astype("category")
+    frame["location"] = frame["location"].astype("category")
+    return frame
+
+
+class LogQuery:
+    """
+    Indexed filters over exported log entries.
+
+    Built once per analysis session: the entries are sorted by time, so a
+    time range is two binary searches, and the row positions of every level
+    and location are grouped up front, so a filter only visits the matching
+    rows instead of scanning the whole log.
+    """
+
+    def __init__(self, frame):
+        if not frame["time"].is_monotonic_increasing:
+            frame = frame.sort_values("time", kind="stable", ignore_index=True)
+        self.frame = frame
+        self._times = frame["time"].to_numpy()
+        # {value: ascending row positions}
+        self._by_level = frame.groupby("level", observed=True, sort=False).indices
+        self._by_location = frame.groupby("location", observed=True, sort=False).indices
+
+    @classmethod
+    def from_directory(cls, directory=None):
+        return cls(load_logs(directory))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def levels(self) -> dict:
+        """{level: number of entries}"""
+        return {level: len(rows) for level, rows in self._by_level.items()}
+
+    def locations(self) -> dict:
+        """{location: number of entries}"""
+        return {location: len(rows) for location, rows in self._by_location.items()}
+
+    def query(self, level=None, location=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Entries with start <= time < end matching the level(s) and location(s).
+
+        level and location take one value or a list of them, start and end
+        epoch seconds or datetimes; None does not filter.
+        """
+        first = 0 if start is None else int(np.searchsorted(self._times, _to_epoch(start), side="left"))
+        last = len(self._times) if end is None else int(np.searchsorted(self._times, _to_epoch(end), side="left"))
+
+        rows = None
+        for index, values in ((self._by_level, level), (self._by_location, location)):
+            if values is None:
+                continue
+            positions = _positions(index, values)
+            positions = positions[np.searchsorted(positions, first):np.searchsorted(positions, last)]
+            rows = positions if rows is None else np.intersect1d(rows, positions, assume_unique=True)
+
+        if rows is None:
+            return self.frame.iloc[first:last]
+        return self.frame.iloc[rows]
+
+
+def _to_epoch(value) -> float:
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+def _positions(index, values) -> np.ndarray:
+    if isinstance(values, str):
+        values = (values,)
+    parts = [index[value] for value in values if value in index]
+    if not parts:
+        return np.empty(0, dtype=np.intp)
+    if len(parts) == 1:
+        return parts[0]
+    return np.sort(np.concatenate(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filter exported robot logs")
+    parser.add_argument("directory", nargs="?", default=global_config.log_export_directory)
+    parser.add_argument("--level", action="append", help="e.g. ERROR, may be repeated")
+    parser.add_argument("--location", action="append", help="e.g. control, may be repeated")
+    parser.add_argument("--last", type=float, help="only the last N seconds of the log")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    logs = LogQuery.from_directory(args.directory)
+    print(f"{len(logs)} entries loaded in {(time.perf_counter() - start_time) * 1000:.0f} ms, levels: {logs.levels()}")
+    start = logs.frame["time"].iloc[-1] - args.last if args.last and len(logs) else None
+    for row in logs.query(args.level, args.location, start).itertuples(index=False):
+        stamp = datetime.fromtimestamp(row.time).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        print(f"[{stamp}] - {row.level} - {row.location} - {row.message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
+from collections import deque
 from src.config.configManager import global_config
 from src.log.logEntry import LogEntry
 import logging
 
 class LogManager:
-    def __init__(self, print_to_console=False, debug_mode=False):
+    def __init__(self, print_to_console=False, debug_mode=False, max_entries=None):
         self.print_to_console = print_to_console
         self.debug_mode = debug_mode
-        self.log_entries = []
+        # Bounded so a long run doesn't grow memory: the oldest entries are dropped first
+        self.log_entries = deque(maxlen=max_entries or global_config.log_max_entries)
+        self._sinks = []  # Callables receiving every new entry, e.g. LogExporter.submit
 
     def log_info(self, message, location=None):
         """ Logs an informational message. """
@@ -38,10 +41,20 @@ class LogManager:
         """ Internal method to log an event. """
         log_entry = LogEntry(location, event_type, message)
         self.log_entries.append(log_entry)
+        for sink in self._sinks:
+            sink(log_entry)
 
         if self.print_to_console:
             print(f"[{log_entry.timestamp}] - {log_entry.event_type} - {log_entry.event_location} - {log_entry.message}")
 
+    def add_sink(self, sink):
+        """ Passes every new entry to sink(entry); it runs on the logging thread and must not block. """
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
     def get_logs(self):
         """ Returns logs as a list of lists for easy processing (e.g., CSV export). """
         return [entry.to_list() for entry in self.log_entries]
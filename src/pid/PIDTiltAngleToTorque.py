@@ -13,13 +13,27 @@ class PIDTiltAngleToTorque:
         self.kd = kd
         self.output_limits = output_limits
 
-    def update(self, current_angle: float) -> float:
+    def update(self, current_angle: float, current_rate: float = None) -> float:
         # Sync attributes with PID object
         self.pid.setpoint = self.target_angle
         self.pid.Kp = self.kp
         self.pid.Ki = self.ki
-        self.pid.Kd = self.kd
-        self.pid.output_limits = self.output_limits
-        output = - self.pid(current_angle)
-        
-        return output
+        if self.output_limits != self.pid.output_limits:
+            self.pid.output_limits = self.output_limits  # The setter re-clamps, only run it on a change
+
+        if current_rate is None:
+            # Let the PID differentiate the angle itself
+            self.pid.Kd = self.kd
+            output = - self.pid(current_angle)
+            return output
+
+        # Measured tilt rate replaces the numerical derivative of the angle
+        self.pid.Kd = 0.0
+        output = self.pid(current_angle) - self.kd * current_rate
+        lower, upper = self.output_limits
+        if output > upper:
+            output = upper
+        elif output < lower:
+            output = lower
+
+        return - output
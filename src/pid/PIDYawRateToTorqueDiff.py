@@ -0,0 +1,31 @@
+from simple_pid import PID
+from src.config.configManager import global_config
+
+class PIDYawRateToTorqueDiff:
+    def __init__(self, kp, ki, kd, setpoint=0.0,
+                 output_limits=(-global_config.torque_differential_limit, global_config.torque_differential_limit)):
+        # The control loop schedules the updates and passes dt, so simple_pid's own sample time is not used
+        self.pid = PID(kp, ki, kd, setpoint=setpoint, sample_time=None)
+        self.pid.output_limits = output_limits
+
+        # Direct access attributes
+        self.target_yaw_rate = setpoint
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_limits = output_limits
+
+    def update(self, current_yaw_rate: float, dt: float) -> float:
+        # Sync attributes with PID object
+        self.pid.setpoint = self.target_yaw_rate
+        self.pid.Kp = self.kp
+        self.pid.Ki = self.ki
+        self.pid.Kd = self.kd
+        if self.output_limits != self.pid.output_limits:
+            self.pid.output_limits = self.output_limits  # The setter re-clamps, only run it on a change
+
+        return self.pid(current_yaw_rate, dt=dt)
+
+    def reset(self):
+        """Clear the integral and derivative history, e.g. before the motors restart"""
+        self.pid.reset()
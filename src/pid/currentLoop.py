@@ -0,0 +1,145 @@
+import threading
+import time
+from src.config.configManager import global_config
+
+
+class PICurrentToDuty:
+    """
+    PI controller from motor current error to normalized motor command.
+
+    The torque setpoint is also fed forward, so with zero gains this reduces to
+    the old open-loop torque -> duty mapping; the PI part removes the error
+    caused by battery voltage and back-EMF.
+    """
+
+    def __init__(self, kp, ki, dt, amps_at_full_torque, output_limit=1.0):
+        self.kp = kp
+        self.ki = ki
+        self.dt = dt
+        self.amps_at_full_torque = amps_at_full_torque
+        self.output_limit = output_limit
+
+        self.integral = 0.0
+
+    def update(self, torque: float, measured_current: float) -> float:
+        error = torque * self.amps_at_full_torque - measured_current
+        output = torque + self.kp * error + self.integral
+
+        limit = self.output_limit
+        if output > limit:
+            output = limit
+        elif output < -limit:
+            output = -limit
+        else:
+            # Anti-windup: only integrate while the output is not saturated
+            self.integral += self.ki * error * self.dt
+        return output
+
+    def reset(self):
+        self.integral = 0.0
+
+
+class CurrentLoop:
+    """
+    Inner torque loop closing on the sensed motor current, on its own thread.
+
+    The tilt controller only sets torque setpoints via set_torque(); this loop
+    samples both current channels, runs one PI per motor and writes the motor
+    commands at global_config.current_loop_rate. Samples are skipped while the
+    sensor's bus_idle callback reports a due IMU read, as in the background
+    sampler; the PIs then work with the previous measurement.
+    """
+
+    def __init__(self, motor_left, motor_right, current_sensor):
+        self.motor_left = motor_left
+        self.motor_right = motor_right
+        self.current_sensor = current_sensor
+
+        dt = 1.0 / global_config.current_loop_rate
+        self.interval = dt
+        self.pi_left = PICurrentToDuty(
+            global_config.current_loop_kp, global_config.current_loop_ki, dt,
+            global_config.current_loop_amps_at_full_torque
+        )
+        self.pi_right = PICurrentToDuty(
+            global_config.current_loop_kp, global_config.current_loop_ki, dt,
+            global_config.current_loop_amps_at_full_torque
+        )
+        self._sign_left = global_config.current_sign_left
+        self._sign_right = global_config.current_sign_right
+
+        self.torque_left = 0.0
+        self.torque_right = 0.0
+        self.output_left = 0.0
+        self.output_right = 0.0
+        self.holding = True  # No output until release()
+        self.overruns = 0
+        self.skipped_samples = 0  # Ticks that left the bus to a due IMU read
+
+        # Held while a tick writes the motors, so no write can follow hold() and the caller's motor stop
+        self._output_lock = threading.Lock()
+
+        self._running = False
+        self._thread = None
+
+    def set_torque(self, torque_left: float, torque_right: float):
+        """Called from the control loop; picked up on the next current loop tick"""
+        self.torque_left = torque_left
+        self.torque_right = torque_right
+
+    def hold(self):
+        """Stop writing motor commands (motors are being stopped by the caller); waits for a tick's write in progress"""
+        with self._output_lock:
+            self.holding = True
+            self.torque_left = 0.0
+            self.torque_right = 0.0
+
+    def release(self):
+        with self._output_lock:
+            self.pi_left.reset()
+            self.pi_right.reset()
+            self.holding = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def tick(self):
+        sensor = self.current_sensor
+        if sensor.bus_idle is not None and sensor.bus_idle(time.perf_counter()) > 0:
+            self.skipped_samples += 1
+        else:
+            try:
+                sensor.sample()
+            except OSError:
+                sensor.read_errors += 1  # Keep the previous measurement for this tick
+
+        with self._output_lock:
+            if self.holding:
+                return
+            self.output_left = self.pi_left.update(self.torque_left, self._sign_left * sensor.raw_current_left)
+            self.output_right = self.pi_right.update(self.torque_right, self._sign_right * sensor.raw_current_right)
+            self.motor_left.set_speed(self.output_left)
+            self.motor_right.set_speed(self.output_right)
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while self._running:
+            self.tick()
+
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.overruns += 1
+                next_tick = time.perf_counter()
@@ -1,10 +1,15 @@
 from src.config.configManager import global_config
 from src.pid.PIDTiltAngleToTorque import PIDTiltAngleToTorque
 from src.pid.PIDPostionToTiltAngle import PIDPositionToTiltAngle
+from src.pid.PIDYawRateToTorqueDiff import PIDYawRateToTorqueDiff
 
 class pidManager:
     def __init__(self):
         self.pid_tilt_angle_to_torque = PIDTiltAngleToTorque(0.03, 0.2, 0.0017, global_config.angle_neutral)
+        self.pid_yaw_rate_to_torque_diff = PIDYawRateToTorqueDiff(
+            global_config.yaw_rate_kp, global_config.yaw_rate_ki, global_config.yaw_rate_kd
+        )
+        self.yaw_rate_control_enabled = global_config.yaw_rate_control_enabled
         
         self.torque_differential = 0.0
         self.base_target_angle = 0.0
@@ -36,5 +41,20 @@ class pidManager:
         self.update_pid_target()
 
     def setTargetTorqueDifferenital(self,value):
-        self.torque_differential = value * 0.03
+        if self.yaw_rate_control_enabled:
+            # Joystick X sets the target yaw rate; update_torque_differential() closes the loop on gyro Z
+            self.pid_yaw_rate_to_torque_diff.target_yaw_rate = value * global_config.max_yaw_rate
+        else:
+            self.torque_differential = value * 0.03
+
+    def reset_torque_differential(self):
+        """Restart the yaw rate loop from zero; it kept integrating gyro Z while the motors were off"""
+        if self.yaw_rate_control_enabled:
+            self.pid_yaw_rate_to_torque_diff.reset()
+            self.torque_differential = 0.0
+
+    def update_torque_differential(self, yaw_rate, dt):
+        """Called by the control loop with each new gyro Z sample (°/s)"""
+        if self.yaw_rate_control_enabled:
+            self.torque_differential = self.pid_yaw_rate_to_torque_diff.update(yaw_rate, dt)
         
\ No newline at end of file
@@ -0,0 +1,138 @@
+import json
+import math
+import os
+
+from src.config.configManager import global_config
+
+
+# Parameters of the Simulink model (documentation/mobrob_init.m) plus the motor torque scale
+DEFAULT_PLANT_PARAMETERS = {
+    "g": 10.0,                 # m/s^2
+    "m": 0.1,                  # kg, robot mass
+    "ell": 0.1,                # m, wheel axle to centre of mass
+    "Rr": 20e-3,               # m, wheel radius
+    "J_B": 0.01,               # kg m^2, body inertia
+    "max_wheel_torque": 0.2,   # N m per motor at a command of 1.0 (not in the Simulink model, estimated)
+    "motor_deadband": 0.0,     # Command magnitude the motor needs before it produces torque
+    "rate_damping": 0.0,       # N m s/rad, friction on the body rotation
+    # Turning, not in the Simulink model (estimated)
+    "track_width": 0.15,       # m, distance between the wheels
+    "J_yaw": 0.002,            # kg m^2, inertia about the vertical axis
+    "yaw_damping": 0.05,       # N m s/rad, wheel scrub when turning
+}
+
+
+def load_plant_parameters(path=None) -> dict:
+    """Defaults overridden by the parameter file, if it exists (e.g. written by system identification)"""
+    path = path or global_config.simulation_plant_file
+    params = dict(DEFAULT_PLANT_PARAMETERS)
+    if os.path.isfile(path):
+        with open(path) as f:
+            params.update(json.load(f))
+    return params
+
+
+def save_plant_parameters(params: dict, path=None):
+    path = path or global_config.simulation_plant_file
+    with open(path, "w") as f:
+        json.dump(params, f, indent=2)
+
+
+def _apply_deadband(command: float, deadband: float) -> float:
+    """Command beyond the deadband; a motor below it does not turn"""
+    if command > deadband:
+        return command - deadband
+    if command < -deadband:
+        return command + deadband
+    return 0.0
+
+
+class InvertedPendulumPlant:
+    """
+    Two-wheeled inverted pendulum driven by the two motor commands.
+
+    Body pitch and wheel travel, wheel inertia neglected; the ground contact
+    spring of the Simulink model is replaced by rolling without slip. Angles
+    are exposed in degrees with positive pitch leaning forward, matching the
+    IMU after the mounting offset; a positive command accelerates forward.
+    Heading turns with the torque difference, positive when the right wheel
+    pushes harder (as a positive torque differential).
+    """
+
+    FALLEN_ANGLE = 90.0  # °, the body rests on the ground beyond this
+
+    def __init__(self, params=None, angle=0.0):
+        self.params = dict(DEFAULT_PLANT_PARAMETERS)
+        self.params.update(params or {})
+        p = self.params
+
+        self._gravity_torque = p["m"] * p["g"] * p["ell"]
+        self._inertia = p["J_B"] + p["m"] * p["ell"] ** 2
+        self._mass_lever = p["m"] * p["ell"]
+        self._mass_radius = p["m"] * p["Rr"]
+        self._yaw_lever = p["track_width"] / (2 * p["Rr"])  # Yaw torque per unit of wheel torque difference
+
+        self.reset(angle)
+
+    def reset(self, angle=0.0):
+        self.theta = math.radians(angle)  # rad
+        self.theta_rate = 0.0             # rad/s
+        self.position = 0.0               # m
+        self.velocity = 0.0               # m/s
+        self.heading = 0.0                # rad
+        self.heading_rate = 0.0           # rad/s
+        self.time = 0.0
+
+    @property
+    def angle(self) -> float:
+        return math.degrees(self.theta)
+
+    @property
+    def rate(self) -> float:
+        return math.degrees(self.theta_rate)
+
+    @property
+    def yaw_rate(self) -> float:
+        return math.degrees(self.heading_rate)
+
+    @property
+    def fallen(self) -> bool:
+        return abs(self.angle) >= self.FALLEN_ANGLE
+
+    def step(self, command_left: float, command_right: float, dt: float, substeps=4):
+        """Advance by dt (s) with constant motor commands in [-1, 1]"""
+        p = self.params
+        deadband = p["motor_deadband"]
+        if deadband:
+            command_left = _apply_deadband(command_left, deadband)
+            command_right = _apply_deadband(command_right, deadband)
+        torque = (command_left + command_right) * p["max_wheel_torque"]
+        yaw_torque = (command_right - command_left) * p["max_wheel_torque"] * self._yaw_lever
+        h = dt / substeps
+
+        for _ in range(substeps):
+            if self.fallen:
+                self.theta_rate = 0.0
+                self.theta = math.copysign(math.radians(self.FALLEN_ANGLE), self.theta)
+                self.velocity = 0.0
+                self.heading_rate = 0.0
+                acceleration = 0.0
+            else:
+                # Wheel torque pushes the base and reacts on the body
+                acceleration = torque / self._mass_radius
+                theta_acceleration = (
+                    self._gravity_torque * math.sin(self.theta)
+                    - self._mass_lever * math.cos(self.theta) * acceleration
+                    - torque
+                    - p["rate_damping"] * self.theta_rate
+                ) / self._inertia
+                # Semi-implicit Euler
+                self.theta_rate += theta_acceleration * h
+                self.theta += self.theta_rate * h
+
+                self.heading_rate += (yaw_torque - p["yaw_damping"] * self.heading_rate) / p["J_yaw"] * h
+
+            self.velocity += acceleration * h
+            self.position += self.velocity * h
+            self.heading += self.heading_rate * h
+        self.time += dt
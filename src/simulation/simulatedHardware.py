@@ -0,0 +1,332 @@
+"""
+Software stand-ins for the robot's I2C devices, PWM channels and GPIO
+outputs, so the real drivers and control loop run without a Raspberry Pi.
+
+The simulated parts implement the subset of the hardware interfaces the
+drivers use (smbus2 / I2CBusManager, HardwarePWM, gpiozero output devices).
+A latency can be injected per I2C transaction, PWM write and encoder read
+to model slow hardware: either a fixed time in seconds or a function that
+draws one, e.g. lambda: random.lognormvariate(math.log(0.0007), 0.3).
+"""
+
+import ctypes
+import errno
+import math
+import os
+import time
+
+from smbus2.smbus2 import I2C_M_RD
+
+from src.config.configManager import global_config
+from src.control.controlLoop import ControlLoop
+from src.control.lqrController import create_state_feedback
+from src.estimation.odometry import Odometry
+from src.estimation.tiltEstimator import create_tilt_estimator
+from src.hardware.imu import IMU, IMU_ADDR, REG_CALIB_STAT, REG_GYRO_X_LSB, BURST_FORMAT
+from src.hardware.currentSensor import ADC_ADDR_LEFT, ADC_ADDR_RIGHT, CurrentSensor
+from src.hardware.motorController import MotorController
+from src.pid.pidManager import pidManager
+from src.simulation.plantModel import InvertedPendulumPlant, load_plant_parameters
+from src.telemetry.telemetryBuffer import TelemetryBuffer
+
+
+def _to_int16(value: float) -> int:
+    return max(-32768, min(32767, int(round(value))))
+
+
+def _draw_latency(latency) -> float:
+    """Fixed latency (s) or a sample of a latency distribution (a function returning s)"""
+    return latency() if callable(latency) else latency
+
+
+def _busy_wait(duration: float):
+    # time.sleep() is far too coarse for sub-millisecond bus latencies
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+class SimulatedI2CBus:
+    """
+    BNO055 register file and two MCP3021 ADCs behind an smbus-compatible interface.
+
+    `latency` is spent in every transaction, `latencies` overrides it per device address
+    (both in s or functions drawing one).
+    """
+
+    def __init__(self, latency=0.0, latencies=None):
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.devices = {}
+        self.transactions = 0
+        self._failures = {}  # addr -> [transactions left to fail (None = until cleared), errno]
+
+        self._imu_registers = bytearray(256)
+        self._imu_registers[REG_CALIB_STAT] = 0xFF  # Fully calibrated
+        # ctypes view for i2c_rdwr() copies; it also keeps the register file from being resized
+        self._imu_register_view = (ctypes.c_char * 256).from_buffer(self._imu_registers)
+        self._imu_registers_address = ctypes.addressof(self._imu_register_view)
+        self._adc_data = {ADC_ADDR_LEFT: [0, 0], ADC_ADDR_RIGHT: [0, 0]}
+
+    def register_device(self, addr, name, priority=None):
+        self.devices[addr] = name
+
+    def _transaction(self, addr):
+        self.transactions += 1
+        latency = _draw_latency(self.latencies.get(addr, self.latency))
+        if latency > 0:
+            _busy_wait(latency)
+        if addr != IMU_ADDR and addr not in self._adc_data:
+            raise OSError(121, f"No device at 0x{addr:02X}")  # Remote I/O error, as smbus2 reports it
+        failure = self._failures.get(addr)
+        if failure is not None:
+            if failure[0] is not None:
+                failure[0] -= 1
+                if failure[0] <= 0:
+                    del self._failures[addr]
+            raise OSError(failure[1], os.strerror(failure[1]))
+
+    def inject_errors(self, addr, count=None, error_number=errno.EREMOTEIO):
+        """Fail the next `count` transactions with `addr` (None: until clear_errors()) with the given errno"""
+        self._failures[addr] = [count, error_number]
+
+    def clear_errors(self, addr=None):
+        if addr is None:
+            self._failures.clear()
+        else:
+            self._failures.pop(addr, None)
+
+    def _read(self, addr, register, length):
+        if addr == IMU_ADDR:
+            return list(self._imu_registers[register:register + length])
+        return self._adc_data[addr][:length]
+
+    # === smbus interface ===
+
+    def read_byte_data(self, addr, register):
+        self._transaction(addr)
+        return self._read(addr, register, 1)[0]
+
+    def write_byte_data(self, addr, register, value):
+        self._transaction(addr)
+        if addr == IMU_ADDR:
+            self._imu_registers[register] = value & 0xFF
+
+    def read_i2c_block_data(self, addr, register, length):
+        self._transaction(addr)
+        return self._read(addr, register, length)
+
+    def write_i2c_block_data(self, addr, register, data):
+        self._transaction(addr)
+        if addr == IMU_ADDR:
+            self._imu_registers[register:register + len(data)] = bytes(data)
+
+    def i2c_rdwr(self, *messages):
+        """smbus2 i2c_msg transfers: a write sets the register pointer, reads fill their buffers in place"""
+        self._transaction(messages[0].addr)
+        register = 0
+        for message in messages:
+            addr = message.addr
+            if not message.flags & I2C_M_RD:
+                register = ord(message.buf[0])
+            elif addr == IMU_ADDR:
+                ctypes.memmove(message.buf, self._imu_registers_address + register, message.len)
+            else:
+                ctypes.memmove(message.buf, bytes(self._adc_data[addr][:message.len]), message.len)
+
+    def read_batch(self, requests):
+        """Combined transaction of several reads, as I2CBusManager.read_batch()"""
+        self._transaction(requests[0][0])
+        return [self._read(addr, register or 0, length) for addr, register, length in requests]
+
+    # === Simulated measurements ===
+
+    def set_imu_sample(self, pitch: float, pitch_rate: float, yaw_rate: float = 0.0):
+        """Store a fusion sample (°, °/s), encoded the way IMU.read_burst() decodes it"""
+        raw_pitch = (pitch + global_config.imu_mounting_offset - 90) * 16
+        raw_gyro_y = pitch_rate * 16 / global_config.imu_pitch_rate_sign
+        BURST_FORMAT.pack_into(
+            self._imu_registers, REG_GYRO_X_LSB,
+            0, _to_int16(raw_gyro_y), _to_int16(yaw_rate * 16 / global_config.imu_yaw_rate_sign), 0, 0, _to_int16(raw_pitch)
+        )
+
+    def set_current(self, is_left: bool, amps: float):
+        """Store an ADC reading for the given motor current (A)"""
+        count = int(round(amps / global_config.current_sensor_amps_per_count)) + global_config.current_sensor_zero_count
+        raw = max(-512, min(511, count)) & 0x3FF  # 10-bit two's complement
+        self._adc_data[ADC_ADDR_LEFT if is_left else ADC_ADDR_RIGHT] = [raw >> 6, (raw & 0x3F) << 2]
+
+
+class SimulatedPWM:
+    """HardwarePWM stand-in that only records the duty cycle"""
+
+    def __init__(self, frequency_hz=None, latency=0.0):
+        self._period_ns = int(1_000_000_000 / (frequency_hz or global_config.motor_pwm_frequency))
+        self.latency = latency  # Per duty write (s or a function drawing one)
+        self.time_to_ready = 0.0
+        self.duty_ns = 0
+        self.enabled = False
+        self.writes = 0
+
+    def get_period_ns(self) -> int:
+        return self._period_ns
+
+    def encode_duty_ns(self, duty_ns: int) -> bytes:
+        return b"%d\n" % duty_ns
+
+    def write_duty(self, encoded_duty_ns: bytes) -> None:
+        if self.latency:
+            _busy_wait(_draw_latency(self.latency))
+        self.duty_ns = int(encoded_duty_ns)
+        self.writes += 1
+
+    def start(self, duty_cycle: float) -> None:
+        self.set_duty_cycle(duty_cycle)
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.set_duty_cycle(0)
+        self.enabled = False
+
+    def set_duty_cycle(self, duty_cycle: float) -> None:
+        self.duty_ns = int(self._period_ns * duty_cycle / 100)
+
+    def get_duty_fraction(self) -> float:
+        return self.duty_ns / self._period_ns
+
+
+class SimulatedOutputDevice:
+    """gpiozero DigitalOutputDevice stand-in"""
+
+    def __init__(self):
+        self.value = 0
+        self.changes = 0
+
+    def on(self):
+        self.changes += self.value != 1
+        self.value = 1
+
+    def off(self):
+        self.changes += self.value != 0
+        self.value = 0
+
+
+class SimulatedEncoder:
+    """MotorEncoder stand-in; `steps` is set from the plant (signed, forward positive)"""
+
+    def __init__(self, latency=0.0):
+        self.steps = 0.0
+        self.previous_steps = 0.0
+        self.steps_traveled = 0.0
+        self.latency = latency  # Per get_steps() (s or a function drawing one)
+
+    def get_steps(self) -> float:
+        if self.latency:
+            _busy_wait(_draw_latency(self.latency))
+        return self.steps
+
+    def get_velocity(self) -> float:
+        return 0.0
+
+    def update_travel_distance(self) -> float:
+        self.steps_traveled += abs(self.steps - self.previous_steps)
+        self.previous_steps = self.steps
+        return self.steps_traveled
+
+    def get_travel_distance(self) -> float:
+        return self.steps_traveled
+
+    def reset_travel_distance(self):
+        self.steps_traveled = 0.0
+        self.previous_steps = self.steps
+
+
+class SimulatedMotorDriver:
+    """PWM, direction and enable outputs of one motor driver"""
+
+    def __init__(self, is_left: bool, pwm_latency=0.0):
+        self.is_left = is_left
+        self.pwm = SimulatedPWM(latency=pwm_latency)
+        self.direction = SimulatedOutputDevice()
+        self.enable = SimulatedOutputDevice()
+
+    def create_controller(self) -> MotorController:
+        return MotorController(self.is_left, pwm=self.pwm, dir_output=self.direction, enable_output=self.enable)
+
+    def get_command(self) -> float:
+        """Motor command in [-1, 1] the outputs currently represent (see MotorController.set_speed)"""
+        if not (self.enable.value and self.pwm.enabled):
+            return 0.0
+        magnitude = 1.0 - self.pwm.get_duty_fraction()  # The driver expects inverted duty
+        reverse = not self.is_left
+        negative = bool(self.direction.value) ^ reverse
+        return -magnitude if negative else magnitude
+
+
+class SimulatedRobot:
+    """
+    Simulated sensors and motor drivers wired to a plant model.
+
+    The create_* methods return the real drivers on top of the simulated
+    hardware; step() advances the plant with the current motor outputs and
+    updates the sensor readings.
+    """
+
+    def __init__(self, plant=None, i2c_latency=0.0, i2c_latencies=None, pwm_latency=0.0, encoder_latency=0.0):
+        self.plant = plant if plant is not None else InvertedPendulumPlant(load_plant_parameters())
+        self.bus = SimulatedI2CBus(latency=i2c_latency, latencies=i2c_latencies)
+        self.driver_left = SimulatedMotorDriver(is_left=True, pwm_latency=pwm_latency)
+        self.driver_right = SimulatedMotorDriver(is_left=False, pwm_latency=pwm_latency)
+        self.encoder_left = SimulatedEncoder(latency=encoder_latency)
+        self.encoder_right = SimulatedEncoder(latency=encoder_latency)
+        # Wheel travel -> whole encoder steps, with the plant's own wheel radius
+        self._steps_per_meter = global_config.encoder_steps_per_revolution / (2 * math.pi * self.plant.params["Rr"])
+        self._amps_at_full_command = global_config.current_loop_amps_at_full_torque
+        self.update_sensors()
+
+    def create_imu(self) -> IMU:
+        return IMU(bus=self.bus, calibration_file=os.devnull)  # Never load or overwrite the robot's calibration
+
+    def create_current_sensor(self) -> CurrentSensor:
+        return CurrentSensor(bus=self.bus)
+
+    def create_motors(self):
+        return self.driver_left.create_controller(), self.driver_right.create_controller()
+
+    def update_sensors(self):
+        plant = self.plant
+        self.bus.set_imu_sample(plant.angle, plant.rate, plant.yaw_rate)
+        turn = plant.heading * plant.params["track_width"] / 2
+        self.encoder_left.steps = float(int((plant.position - turn) * self._steps_per_meter))
+        self.encoder_right.steps = float(int((plant.position + turn) * self._steps_per_meter))
+        self.bus.set_current(True, self.driver_left.get_command() * self._amps_at_full_command)
+        self.bus.set_current(False, self.driver_right.get_command() * self._amps_at_full_command)
+
+    def get_time(self) -> float:
+        return self.plant.time
+
+    def step(self, dt: float):
+        self.plant.step(self.driver_left.get_command(), self.driver_right.get_command(), dt)
+        self.update_sensors()
+
+    def create_control_loop(self, log_manager=None, rate=None, profiler=None, decimation=None, controller=None):
+        """
+        Control loop with its own PID manager, estimator and telemetry on the simulated drivers.
+        `controller` overrides global_config.controller_type; LQR gains come from the simulated plant.
+        """
+        motor_left, motor_right = self.create_motors()
+        pid_manager = pidManager()
+        # simple_pid times itself; follow the simulated time instead of the wall clock
+        pid = pid_manager.pid_tilt_angle_to_torque.pid
+        pid.time_fn = self.get_time
+        pid.reset()
+        interval = 1.0 / rate if rate else global_config.main_loop_interval
+        state_feedback = create_state_feedback(interval, self.plant.params, controller)
+        return ControlLoop(
+            self.create_imu(), create_tilt_estimator(), pid_manager, motor_left, motor_right,
+            TelemetryBuffer(global_config.telemetry_buffer_size),
+            current_sensor=self.create_current_sensor(), log_manager=log_manager, rate=rate, profiler=profiler,
+            encoder_left=self.encoder_left, encoder_right=self.encoder_right,
+            odometry=Odometry(wheel_radius=self.plant.params["Rr"], track_width=self.plant.params["track_width"]),
+            decimation=decimation, state_feedback=state_feedback
+        )
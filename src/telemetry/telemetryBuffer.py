@@ -0,0 +1,84 @@
+from array import array
+
+# Column order of every telemetry record
+TELEMETRY_FIELDS = (
+    "time",
+    "angle",
+    "target_angle",
+    "torque",
+    "left_position",
+    "right_position",
+    "current_left",
+    "current_right",
+    "x",        # Odometry pose: m
+    "y",        # m
+    "heading",  # rad, counter-clockwise positive
+)
+
+
+class TelemetryBuffer:
+    """
+    Fixed-capacity ring buffer of control loop state, one column per field.
+
+    The control thread is the only writer and record() only stores floats into
+    preallocated arrays, so it never blocks or allocates. Readers (GUI,
+    telemetry publisher) take copies with snapshot() / latest() from their own
+    threads without a lock.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.columns = tuple(array("d", bytes(8 * capacity)) for _ in TELEMETRY_FIELDS)
+        self._head = 0  # Total records written
+
+    def record(self, timestamp, angle, target_angle, torque, left_position, right_position,
+               current_left, current_right, x, y, heading):
+        index = self._head % self.capacity
+        columns = self.columns
+        columns[0][index] = timestamp
+        columns[1][index] = angle
+        columns[2][index] = target_angle
+        columns[3][index] = torque
+        columns[4][index] = left_position
+        columns[5][index] = right_position
+        columns[6][index] = current_left
+        columns[7][index] = current_right
+        columns[8][index] = x
+        columns[9][index] = y
+        columns[10][index] = heading
+        self._head += 1  # Publish after the record is complete
+
+    def get_record_count(self) -> int:
+        return self._head
+
+    def latest(self):
+        """Most recent record as a tuple in TELEMETRY_FIELDS order, or None if empty"""
+        head = self._head
+        if head == 0:
+            return None
+        index = (head - 1) % self.capacity
+        return tuple(column[index] for column in self.columns)
+
+    def snapshot(self, count=None):
+        """
+        Copy of the newest `count` records (default: all), oldest first.
+
+        Returns (columns, head) where columns is a list of arrays. Records the
+        writer overwrote while copying are dropped, and so is the slot it may
+        be writing into (index head once the buffer has wrapped).
+        """
+        head = self._head
+        copies = [array("d", column) for column in self.columns]
+        overwritten = self._head - head
+
+        available = min(head, self.capacity - 1 - overwritten)
+        if count is None or count > available:
+            count = available
+        if count <= 0:
+            return [array("d") for _ in copies], head
+
+        end = head % self.capacity
+        start = (head - count) % self.capacity
+        if start < end:
+            return [column[start:end] for column in copies], head
+        return [column[start:] + column[:end] for column in copies], head
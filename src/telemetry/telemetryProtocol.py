@@ -0,0 +1,26 @@
+import struct
+from src.telemetry.telemetryBuffer import TELEMETRY_FIELDS
+
+# Packet layout (little endian, fixed size):
+#   magic "BR", version, field count, sequence number (u32), time (f64), remaining fields (f32 each)
+MAGIC = b"BR"
+VERSION = 2  # 2: odometry pose fields
+HEADER = struct.Struct("<2sBBI")
+PACKET = struct.Struct("<2sBBId" + "f" * (len(TELEMETRY_FIELDS) - 1))
+
+SEQUENCE_MODULO = 1 << 32
+
+
+def encode_packet(sequence: int, record) -> bytes:
+    """record: values in TELEMETRY_FIELDS order, time first"""
+    return PACKET.pack(MAGIC, VERSION, len(TELEMETRY_FIELDS), sequence % SEQUENCE_MODULO, *record)
+
+
+def decode_packet(data: bytes):
+    """Returns (sequence, record tuple) or None for packets of another layout"""
+    if len(data) != PACKET.size:
+        return None
+    magic, version, field_count, sequence = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or field_count != len(TELEMETRY_FIELDS):
+        return None
+    return sequence, PACKET.unpack(data)[4:]
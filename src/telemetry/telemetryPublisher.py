@@ -0,0 +1,75 @@
+import socket
+import threading
+import time
+from src.config.configManager import global_config
+from src.telemetry.telemetryProtocol import encode_packet
+
+
+class TelemetryPublisher:
+    """
+    Streams the newest telemetry record over UDP at a fixed rate.
+
+    Runs on its own thread and reads snapshots from the TelemetryBuffer, so
+    the control thread never waits on the network. The socket is
+    non-blocking: if the send buffer is full the packet is dropped and counted.
+    """
+
+    def __init__(self, telemetry, host=None, port=None, rate=None):
+        self.telemetry = telemetry
+        self.address = (host or global_config.telemetry_host, port or global_config.telemetry_port)
+        self.interval = 1.0 / (rate or global_config.telemetry_rate)
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self._socket.setblocking(False)
+
+        self.sequence = 0
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        self._last_record_count = 0
+
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._socket.close()
+
+    def publish(self) -> bool:
+        """Send the newest record if there is a new one since the last packet"""
+        record_count = self.telemetry.get_record_count()
+        if record_count == 0 or record_count == self._last_record_count:
+            return False
+        self._last_record_count = record_count
+
+        packet = encode_packet(self.sequence, self.telemetry.latest())
+        # The sequence advances even for dropped packets so receivers see the loss
+        self.sequence += 1
+        try:
+            self._socket.sendto(packet, self.address)
+        except (BlockingIOError, OSError):
+            self.packets_dropped += 1
+            return False
+        self.packets_sent += 1
+        return True
+
+    def _run(self):
+        next_send = time.perf_counter()
+        while self._running:
+            self.publish()
+            next_send += self.interval
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_send = time.perf_counter()
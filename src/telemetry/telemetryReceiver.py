@@ -0,0 +1,141 @@
+"""
+Desktop-side receiver for the robot's UDP telemetry.
+
+Reconstructs the stream into a local TelemetryBuffer (so RobotGui can plot
+it off-robot), optionally records every packet to CSV and tracks packet
+loss from the sequence numbers.
+
+Usage:
+    python -m src.telemetry.telemetryReceiver --port 5005 --record session.csv
+"""
+
+import argparse
+import csv
+import socket
+import threading
+import time
+
+from src.config.configManager import global_config
+from src.telemetry.telemetryBuffer import TELEMETRY_FIELDS, TelemetryBuffer
+from src.telemetry.telemetryProtocol import SEQUENCE_MODULO, decode_packet
+
+
+class TelemetryReceiver:
+    def __init__(self, port=None, host="0.0.0.0", capacity=None, record_path=None):
+        self.telemetry = TelemetryBuffer(capacity or global_config.telemetry_buffer_size)
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, global_config.telemetry_port if port is None else port))
+        self._socket.settimeout(0.2)
+        self.port = self._socket.getsockname()[1]  # The one the OS picked for port 0
+
+        self._record_file = None
+        self._writer = None
+        if record_path:
+            self._record_file = open(record_path, "w", newline="")
+            self._writer = csv.writer(self._record_file)
+            self._writer.writerow(("sequence",) + TELEMETRY_FIELDS)
+
+        self.packets_received = 0
+        self.packets_lost = 0
+        self.packets_out_of_order = 0
+        self.invalid_packets = 0
+        self._expected_sequence = None
+
+        self._running = False
+        self._thread = None
+
+    # === Stream reconstruction ===
+
+    def handle_packet(self, data: bytes):
+        decoded = decode_packet(data)
+        if decoded is None:
+            self.invalid_packets += 1
+            return
+        sequence, record = decoded
+
+        if self._expected_sequence is not None:
+            gap = (sequence - self._expected_sequence) % SEQUENCE_MODULO
+            if gap >= SEQUENCE_MODULO // 2:
+                # Older than what we already have: late or duplicated, don't rewind the plot
+                self.packets_out_of_order += 1
+                return
+            self.packets_lost += gap
+        self._expected_sequence = (sequence + 1) % SEQUENCE_MODULO
+        self.packets_received += 1
+
+        self.telemetry.record(*record)
+        if self._writer is not None:
+            self._writer.writerow((sequence,) + record)
+
+    def get_loss_ratio(self) -> float:
+        total = self.packets_received + self.packets_lost
+        return self.packets_lost / total if total else 0.0
+
+    def get_latest_state(self):
+        """Same tuple as ControlLoop.get_latest_state(), for running RobotGui off-robot"""
+        record = self.telemetry.latest()
+        if record is None:
+            return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        fields = dict(zip(TELEMETRY_FIELDS, record))
+        return (fields["angle"], fields["torque"], fields["left_position"],
+                fields["right_position"], 0.0, 0.0, fields["x"], fields["y"], fields["heading"])
+
+    # === Thread ===
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._socket.close()
+        if self._record_file is not None:
+            self._record_file.close()
+
+    def _run(self):
+        while self._running:
+            try:
+                data = self._socket.recv(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.handle_packet(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receive and record balancing robot telemetry")
+    parser.add_argument("--port", type=int, default=global_config.telemetry_port)
+    parser.add_argument("--record", help="CSV file to record all received packets to")
+    args = parser.parse_args()
+
+    receiver = TelemetryReceiver(port=args.port, record_path=args.record)
+    receiver.start()
+    print(f"Listening for telemetry on UDP port {args.port}")
+
+    last_received = 0
+    try:
+        while True:
+            time.sleep(1.0)
+            rate = receiver.packets_received - last_received
+            last_received = receiver.packets_received
+            latest = receiver.telemetry.latest()
+            angle = f"{latest[TELEMETRY_FIELDS.index('angle')]:.2f}" if latest else "N/A"
+            print(f"rate={rate}/s received={receiver.packets_received} lost={receiver.packets_lost} "
+                  f"({receiver.get_loss_ratio() * 100:.2f}%) late={receiver.packets_out_of_order} angle={angle}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
+import math
 import tkinter as tk
 import threading
 import time
 
+from src.config.configManager import global_config
+
 class RobotGui:
-    def __init__(self, root, pid_manager, get_state_callback):
+    def __init__(self, root, pid_manager, get_state_callback, telemetry=None):
         self.root = root
         self.root.title("PID Controller GUI")
 
         self.pid_manager = pid_manager
         self.get_state = get_state_callback
+        self.telemetry = telemetry
+        self.live_plot = None
         
         self.entries = {}
         self.angle_var = tk.StringVar()
@@ -19,6 +24,7 @@ class RobotGui:
         self.right_pos_var = tk.StringVar()
         self.left_travel_var = tk.StringVar()
         self.right_travel_var = tk.StringVar()
+        self.pose_var = tk.StringVar(value="N/A")
         self.offset_entry = None
 
         self.joystick_x = 0.0
@@ -28,7 +34,9 @@ class RobotGui:
         self.build_status_labels()
         self.build_offset_input()
         self.build_analog_joystick()
+        self.build_live_plot()
         self.refresh_values()
+        self.refresh_plot()
 
     def build_pid_controls(self):
         for i, param in enumerate(["kp", "ki", "kd"]):
@@ -71,6 +79,9 @@ class RobotGui:
         self.joystick_canvas = tk.Canvas(self.root, width=150, height=150, bg="lightgray")
         self.joystick_canvas.grid(row=14, column=0, columnspan=2, rowspan=3)
 
+        tk.Label(self.root, text="Pose (x, y, heading)").grid(row=17, column=0)
+        tk.Label(self.root, textvariable=self.pose_var).grid(row=17, column=1)
+
         self.joystick_radius = 60
         self.knob_radius = 10
         self.center = (75, 75)
@@ -83,6 +94,14 @@ class RobotGui:
         self.joystick_canvas.bind("<B1-Motion>", self.on_joystick_drag)
         self.joystick_canvas.bind("<ButtonRelease-1>", self.reset_joystick)
 
+    def build_live_plot(self):
+        if self.telemetry is None:
+            return
+        # Imported here so the GUI still starts without matplotlib when no plot is requested
+        from src.user_input.livePlot import LivePlotPanel
+        self.live_plot = LivePlotPanel(self.root, self.telemetry)
+        self.live_plot.widget.grid(row=0, column=3, rowspan=18, padx=5, pady=5)
+
     def on_joystick_drag(self, event):
         dx = event.x - self.center[0]
         dy = event.y - self.center[1]
@@ -141,6 +160,10 @@ class RobotGui:
 
     def refresh_values(self):
         state_data = self.get_state()
+        if len(state_data) == 9:  # With odometry pose
+            x, y, heading = state_data[6:]
+            self.pose_var.set(f"{x:.2f} m, {y:.2f} m, {math.degrees(heading):.0f}°")
+            state_data = state_data[:6]
         if len(state_data) == 6:  # New format with encoder data
             current_angle, torque, left_pos, right_pos, left_travel, right_travel = state_data
             self.left_pos_var.set(f"{left_pos:.0f}")
@@ -164,6 +187,12 @@ class RobotGui:
 
         self.root.after(100, self.refresh_values)
 
+    def refresh_plot(self):
+        if self.live_plot is None:
+            return
+        self.live_plot.refresh()
+        self.root.after(global_config.gui_plot_interval_ms, self.refresh_plot)
+
 
 # --- MAIN for standalone test ---
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from src.config.configManager import global_config
+from src.telemetry.telemetryBuffer import TELEMETRY_FIELDS
+
+
+def min_max_decimate(x, y, bins):
+    """
+    Reduce a series to at most 2 * bins points, keeping each bin's min and max
+    so spikes stay visible. x is assumed sorted.
+    """
+    if len(y) <= 2 * bins:
+        return x, y
+
+    per_bin = len(y) // bins
+    usable = per_bin * bins
+    offset = len(y) - usable  # Drop the oldest samples so the newest are always shown
+    y_bins = y[offset:].reshape(bins, per_bin)
+    x_bins = x[offset:].reshape(bins, per_bin)
+
+    x_out = np.repeat(x_bins[:, 0], 2)
+    y_out = np.empty(2 * bins)
+    y_out[0::2] = y_bins.min(axis=1)
+    y_out[1::2] = y_bins.max(axis=1)
+    return x_out, y_out
+
+
+def fit_limits(limits, low, high, margin=0.25):
+    """
+    New y limits if [low, high] leaves `limits`, else None: the data range
+    widened by `margin` of its span (at least the old span) on both sides.
+    """
+    if limits[0] <= low and high <= limits[1]:
+        return None
+    span = max(high - low, limits[1] - limits[0])
+    center = 0.5 * (low + high)
+    half = 0.5 * span * (1.0 + 2 * margin)
+    return center - half, center + half
+
+
+class LivePlotPanel:
+    """
+    Scrolling plots of angle/target, torque and encoder positions for RobotGui.
+
+    Time is plotted relative to the newest sample, so the axes rarely move and
+    a refresh usually only blits the lines onto a cached background. Axes
+    without a fixed range (the encoder steps are unbounded) are refitted with
+    one full redraw when the data leaves them. Data is read
+    from the telemetry ring buffer and min/max decimated to the plot width, so
+    the draw cost does not grow with the history length. Runs entirely in the
+    Tk thread; the control loop only writes the buffer.
+    """
+
+    # (axis title, y limits, refit when the data leaves them, [(field, color)])
+    PLOTS = (
+        ("Angle (°)", (-global_config.tilt_angle_soft_limit, global_config.tilt_angle_soft_limit), False,
+         [("angle", "tab:blue"), ("target_angle", "tab:orange")]),
+        ("Torque", (-global_config.torque_limit, global_config.torque_limit), False,
+         [("torque", "tab:red")]),
+        ("Encoder (steps)", (-3000, 3000), True,
+         [("left_position", "tab:green"), ("right_position", "tab:purple")]),
+    )
+
+    def __init__(self, master, telemetry, window_s=None):
+        self.telemetry = telemetry
+        self.window_s = window_s or global_config.gui_plot_window
+
+        self.figure = Figure(figsize=(6, 5), dpi=80)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+
+        self.axes = []
+        self.lines = []
+        self._refit_axes = []
+        for i, (title, limits, refit, series) in enumerate(self.PLOTS):
+            ax = self.figure.add_subplot(len(self.PLOTS), 1, i + 1)
+            ax.set_xlim(-self.window_s, 0)
+            ax.set_ylim(*limits)
+            ax.set_ylabel(title)
+            ax.grid(True)
+            for field, color in series:
+                line, = ax.plot([], [], color=color, lw=1, animated=True)
+                self.lines.append((TELEMETRY_FIELDS.index(field), ax, line))
+            self.axes.append(ax)
+            if refit:
+                self._refit_axes.append(ax)
+        self.axes[-1].set_xlabel("Time (s)")
+        self.figure.tight_layout()
+
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.draw()
+
+    def _on_draw(self, _event):
+        # Cache everything except the animated lines (also after resizes)
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def refresh(self):
+        if self._background is None:
+            return
+
+        columns, _head = self.telemetry.snapshot()
+        times = np.frombuffer(columns[0])
+        bins = max(int(self.axes[0].bbox.width), 1)
+
+        if len(times):
+            visible = times >= times[-1] - self.window_s
+            x = times[visible] - times[-1]
+        else:
+            visible = slice(0, 0)
+            x = times
+
+        decimated = []
+        for field_index, ax, line in self.lines:
+            y = np.frombuffer(columns[field_index])[visible]
+            decimated.append((ax, line, *min_max_decimate(x, y, bins)))
+
+        # Blitting never rescales: refit the unbounded axes and redraw everything once if needed
+        redraw = False
+        for ax in self._refit_axes:
+            ys = [y for line_ax, _line, _x, y in decimated if line_ax is ax and len(y)]
+            if not ys:
+                continue
+            limits = fit_limits(ax.get_ylim(), min(y.min() for y in ys), max(y.max() for y in ys))
+            if limits is not None:
+                ax.set_ylim(*limits)
+                redraw = True
+        if redraw:
+            self.canvas.draw()  # Caches the new background through _on_draw
+
+        self.canvas.restore_region(self._background)
+        for ax, line, x_line, y_line in decimated:
+            line.set_data(x_line, y_line)
+            ax.draw_artist(line)
+        self.canvas.blit(self.figure.bbox)
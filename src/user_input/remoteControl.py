@@ -0,0 +1,249 @@
+"""
+Network-transparent adapter between RobotGui and pidManager.
+
+On the robot, RemoteControlServer exposes the pidManager over TCP
+(newline-delimited JSON). On a laptop, RemotePIDManager implements the
+interface RobotGui already calls, so the unchanged GUI can drive the robot
+remotely. Joystick updates are coalesced and sent at a fixed maximum rate.
+
+Run the GUI on a laptop (telemetry must be enabled on the robot for live values):
+    python -m src.user_input.remoteControl --host <robot address>
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import time
+
+from src.config.configManager import global_config
+
+GAINS = ("kp", "ki", "kd")
+
+
+def get_pid_state(pid_manager) -> dict:
+    pid = pid_manager.pid_tilt_angle_to_torque
+    return {
+        "kp": pid.kp,
+        "ki": pid.ki,
+        "kd": pid.kd,
+        "target_angle": pid.target_angle,
+        "dynamic_target_angle_offset": pid_manager.dynamic_target_angle_offset,
+        "torque_differential": pid_manager.torque_differential,
+        "target_yaw_rate": pid_manager.pid_yaw_rate_to_torque_diff.target_yaw_rate,
+    }
+
+
+# === Robot side ===
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = self.server.execute(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class RemoteControlServer(socketserver.ThreadingTCPServer):
+    """Applies commands from remote GUIs to the robot's pidManager"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    # Remote command -> pidManager method taking one value
+    VALUE_COMMANDS = ("setTargetAngle", "setTargetTorqueDifferenital", "set_dynamic_target_angle_offset")
+    PLAIN_COMMANDS = ("stop", "goForward", "goBackward")
+
+    def __init__(self, pid_manager, host=None, port=None):
+        super().__init__(
+            (host or global_config.remote_control_host, global_config.remote_control_port if port is None else port),
+            _CommandHandler
+        )
+        self.pid_manager = pid_manager
+        self.commands_received = 0
+        self._thread = None
+
+    def execute(self, message: dict) -> dict:
+        command = message["cmd"]
+        self.commands_received += 1
+
+        if command == "joystick":
+            self.pid_manager.setTargetAngle(float(message["y"]))
+            self.pid_manager.setTargetTorqueDifferenital(float(message["x"]))
+        elif command == "set_gain":
+            if message["param"] not in GAINS:
+                raise ValueError(f"Unknown gain: {message['param']}")
+            setattr(self.pid_manager.pid_tilt_angle_to_torque, message["param"], float(message["value"]))
+        elif command in self.VALUE_COMMANDS:
+            getattr(self.pid_manager, command)(float(message["value"]))
+        elif command in self.PLAIN_COMMANDS:
+            getattr(self.pid_manager, command)()
+        elif command != "get":
+            raise ValueError(f"Unknown command: {command}")
+
+        return get_pid_state(self.pid_manager)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# === Laptop side ===
+
+class _RemotePID:
+    """Stands in for pidManager.pid_tilt_angle_to_torque: reads are cached, gain writes are sent"""
+
+    def __init__(self, manager):
+        object.__setattr__(self, "_manager", manager)
+
+    def __getattr__(self, name):
+        try:
+            return self._manager.state[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name not in GAINS:
+            raise AttributeError(f"Cannot set {name} remotely")
+        self._manager.send({"cmd": "set_gain", "param": name, "value": value})
+
+
+class RemotePIDManager:
+    """
+    Client proxy with the pidManager interface used by RobotGui.
+
+    Commands are sent immediately, except joystick updates: the latest
+    setTargetAngle / setTargetTorqueDifferenital values are coalesced and
+    sent as one message at most global_config.remote_joystick_rate times per second.
+    """
+
+    def __init__(self, host, port=None, joystick_rate=None):
+        self._socket = socket.create_connection((host, port or global_config.remote_control_port), timeout=2.0)
+        self._reader = self._socket.makefile("rb")
+        self._lock = threading.Lock()  # One request/reply exchange at a time
+
+        self.state = {}
+        self.pid_tilt_angle_to_torque = _RemotePID(self)
+        self.messages_sent = 0
+
+        self._joystick = [0.0, 0.0]  # x, y
+        self._joystick_pending = False
+        self._joystick_interval = 1.0 / (joystick_rate or global_config.remote_joystick_rate)
+        self._joystick_event = threading.Event()
+
+        self.send({"cmd": "get"})
+
+        self._running = True
+        self._thread = threading.Thread(target=self._joystick_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def dynamic_target_angle_offset(self):
+        return self.state.get("dynamic_target_angle_offset", 0.0)
+
+    @property
+    def torque_differential(self):
+        return self.state.get("torque_differential", 0.0)
+
+    def send(self, message: dict) -> dict:
+        with self._lock:
+            self._socket.sendall(json.dumps(message).encode() + b"\n")
+            reply = json.loads(self._reader.readline())
+            self.messages_sent += 1
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        self.state = reply
+        return reply
+
+    # === pidManager interface ===
+
+    def setTargetAngle(self, value):
+        self._joystick[1] = value
+        self._joystick_pending = True
+        self._joystick_event.set()
+
+    def setTargetTorqueDifferenital(self, value):
+        self._joystick[0] = value
+        self._joystick_pending = True
+        self._joystick_event.set()
+
+    def set_dynamic_target_angle_offset(self, value):
+        self.send({"cmd": "set_dynamic_target_angle_offset", "value": value})
+
+    def stop(self):
+        self.send({"cmd": "stop"})
+
+    def goForward(self):
+        self.send({"cmd": "goForward"})
+
+    def goBackward(self):
+        self.send({"cmd": "goBackward"})
+
+    def refresh(self):
+        """Fetch the current state from the robot"""
+        return self.send({"cmd": "get"})
+
+    # === Joystick coalescing ===
+
+    def flush_joystick(self):
+        """Send the newest joystick position if it changed since the last send"""
+        if not self._joystick_pending:
+            return False
+        self._joystick_pending = False
+        x, y = self._joystick
+        self.send({"cmd": "joystick", "x": x, "y": y})
+        return True
+
+    def _joystick_loop(self):
+        while self._running:
+            self._joystick_event.wait(0.5)
+            self._joystick_event.clear()
+            try:
+                if not self.flush_joystick():
+                    self.refresh()  # Idle: keep the cached state current
+            except OSError:
+                break
+            time.sleep(self._joystick_interval)
+
+    def close(self):
+        self._running = False
+        self._joystick_event.set()
+        self._thread.join()
+        self._socket.close()
+
+
+def main():
+    import tkinter as tk
+    from src.telemetry.telemetryReceiver import TelemetryReceiver
+    from src.user_input.RobotGui import RobotGui
+
+    parser = argparse.ArgumentParser(description="Run RobotGui against a robot over the network")
+    parser.add_argument("--host", required=True, help="Robot address")
+    parser.add_argument("--port", type=int, default=global_config.remote_control_port)
+    parser.add_argument("--telemetry-port", type=int, default=global_config.telemetry_port)
+    args = parser.parse_args()
+
+    pid_manager = RemotePIDManager(args.host, args.port)
+    receiver = TelemetryReceiver(port=args.telemetry_port)
+    receiver.start()
+    try:
+        root = tk.Tk()
+        RobotGui(root, pid_manager, receiver.get_latest_state, receiver.telemetry)
+        root.mainloop()
+    finally:
+        receiver.stop()
+        pid_manager.close()
+
+
+if __name__ == "__main__":
+    main()